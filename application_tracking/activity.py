@@ -0,0 +1,177 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from organization.models import Job
+
+from .models import ActivityLog, JobAdvert
+
+logger = logging.getLogger(__name__)
+
+# Audit logging off the request path. Signal handlers call log(), which
+# queues a plain dict once the surrounding transaction commits; a daemon
+# thread per process drains the queue every ACTIVITY_LOG_FLUSH_SECONDS (or
+# as soon as a batch fills) with bulk_create. Anything needing the database
+# to describe - the job title, the employer, an account looked up by email -
+# is resolved at flush time with one query per batch rather than per event.
+#
+# The queue is bounded (ACTIVITY_LOG_QUEUE_SIZE): when the database can't
+# keep up, new entries are dropped and counted instead of growing memory or
+# blocking requests. Whatever is queued at interpreter exit is flushed.
+
+JOB_TITLE = "{job_title}"
+FIELDS = ('actor_id', 'action_type', 'description', 'target_object', 'ip_address', 'timestamp')
+
+
+def log(action_type, description, actor_id=None, target_object=None, ip_address=None,
+        actor_email=None, job_id=None, job_advert_id=None, actor_is_employer=False):
+    """
+    Queues one ActivityLog row. `description` and `target_object` may contain
+    "{job_title}" for the job/advert given by `job_id`/`job_advert_id`. The
+    actor is `actor_id`, else the account with `actor_email`, else (with
+    `actor_is_employer`) the job's owner; entries with no actor are skipped.
+    """
+    entry = {
+        'actor_id': actor_id,
+        'action_type': action_type,
+        'description': description,
+        'target_object': target_object,
+        'ip_address': ip_address,
+        'timestamp': timezone.now(),
+        'actor_email': actor_email,
+        'job_id': job_id,
+        'job_advert_id': job_advert_id,
+        'actor_is_employer': actor_is_employer,
+    }
+    transaction.on_commit(lambda: buffer.put(entry))
+
+
+def _resolve(entries):
+    """Fills in actors and job titles for a batch: at most three queries."""
+    job_ids = {e['job_id'] for e in entries if e['job_id']}
+    advert_ids = {e['job_advert_id'] for e in entries if e['job_advert_id'] and not e['job_id']}
+    emails = {e['actor_email'] for e in entries if not e['actor_id'] and e['actor_email']}
+
+    jobs = {pk: (title, owner) for pk, title, owner in
+            Job.objects.filter(id__in=job_ids).values_list('id', 'title', 'organization__admin_user_id')} if job_ids else {}
+    adverts = {pk: (title, owner) for pk, title, owner in
+               JobAdvert.objects.filter(id__in=advert_ids).values_list('id', 'title', 'created_by_id')} if advert_ids else {}
+    users = dict(User.objects.filter(email__in=emails).values_list('email', 'id')) if emails else {}
+
+    for entry in entries:
+        if entry['job_id']:
+            title, owner = jobs.get(entry['job_id'], ("Unknown Job", None))
+        elif entry['job_advert_id']:
+            title, owner = adverts.get(entry['job_advert_id'], ("Unknown Job", None))
+        else:
+            title, owner = "Unknown Job", None
+        if not entry['actor_id']:
+            entry['actor_id'] = owner if entry['actor_is_employer'] else users.get(entry['actor_email'])
+        for field in ('description', 'target_object'):
+            if entry[field]:
+                entry[field] = entry[field].replace(JOB_TITLE, title)
+
+
+def write(entries):
+    """Resolves and bulk-inserts `entries`. Returns the number of rows written."""
+    _resolve(entries)
+    rows = [ActivityLog(**{field: entry[field] for field in FIELDS}) for entry in entries if entry['actor_id']]
+    ActivityLog.objects.bulk_create(rows)
+    return len(rows)
+
+
+class ActivityLogBuffer:
+    def __init__(self, max_size, batch_size, flush_interval):
+        self.queue = queue.Queue(maxsize=max_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._stats_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def put(self, entry):
+        if not settings.ACTIVITY_LOG_ASYNC:
+            self._write([entry])
+            return
+        self._ensure_thread()
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+                dropped = self.dropped
+            # Once per thousand, not per entry: a full queue means heavy load
+            if dropped % 1000 == 1:
+                logger.warning("Activity log queue full; %d entries dropped so far", dropped)
+            return
+        if self.queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """Writes everything queued so far, in batches. Returns rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = []
+                try:
+                    while len(batch) < self.batch_size:
+                        batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    pass
+                if not batch:
+                    return written
+                written += self._write(batch)
+
+    def stats(self):
+        return {'queued': self.queue.qsize(), 'written': self.written, 'dropped': self.dropped}
+
+    def _write(self, batch):
+        try:
+            count = write(batch)
+        except Exception:
+            logger.exception("Could not write %d activity log entries", len(batch))
+            with self._stats_lock:
+                self.dropped += len(batch)
+            return 0
+        with self._stats_lock:
+            self.written += count
+        return count
+
+    def _ensure_thread(self):
+        # Forked workers (gunicorn --preload, celery prefork) start their own
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._stats_lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self.queue.empty():
+                continue
+            self.flush()
+            # This thread's own connection; don't hold it between flushes
+            connection.close()
+
+
+buffer = ActivityLogBuffer(
+    max_size=settings.ACTIVITY_LOG_QUEUE_SIZE,
+    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_LOG_FLUSH_SECONDS,
+)
+atexit.register(buffer.flush)
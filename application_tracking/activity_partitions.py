@@ -0,0 +1,141 @@
+import logging
+import re
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import ActivityDailyRollup, ActivityLog
+
+logger = logging.getLogger(__name__)
+
+# Housekeeping for the month-partitioned ActivityLog table (migration 0025).
+# Partition bounds are UTC month starts, matching the database session time
+# zone Django uses. Dropping a whole partition replaces row-by-row deletes;
+# the per-day counts in ActivityDailyRollup are kept for good.
+#
+# Rows for a month with no partition yet (maintenance stopped running) land
+# in the DEFAULT partition (migration 0028) instead of failing the insert;
+# ensure_partitions moves them into their month's partition once it exists.
+
+TABLE = ActivityLog._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_NAME = re.compile(rf"^{TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def add_months(month, count):
+    years, month_index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def partitions():
+    """{first day of month: partition table name} for every attached partition."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = %s::regclass",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    found = {}
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            found[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return found
+
+
+def ensure_partitions(today=None, months_ahead=None):
+    """Creates missing partitions from this month to `months_ahead` months out. Returns their names."""
+    today = today or timezone.now().date()
+    months_ahead = settings.ACTIVITY_LOG_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    current = today.replace(day=1)
+    existing = partitions()
+    # Months that already have rows waiting in the default partition
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('month', \"timestamp\")::date FROM {connection.ops.quote_name(DEFAULT_PARTITION)}"
+        )
+        stranded = {row[0] for row in cursor.fetchall()}
+
+    created = []
+    for month in sorted({add_months(current, offset) for offset in range(months_ahead + 1)} | stranded):
+        if month in existing:
+            continue
+        _create_partition(month, move_rows=month in stranded)
+        created.append(partition_name(month))
+    return created
+
+
+def _create_partition(month, move_rows=False):
+    table, name = connection.ops.quote_name(TABLE), connection.ops.quote_name(partition_name(month))
+    bounds = [month, add_months(month, 1)]
+    with transaction.atomic(), connection.cursor() as cursor:
+        if not move_rows:
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)", bounds)
+            return
+        # Postgres won't add a partition while the default one holds rows for
+        # its range: build it standalone, move the rows over, then attach it
+        logger.warning("Moving %s activity log rows out of the default partition", f"{month:%Y-%m}")
+        cursor.execute(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {connection.ops.quote_name(DEFAULT_PARTITION)} "
+            f"WHERE \"timestamp\" >= %s AND \"timestamp\" < %s RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved",
+            bounds,
+        )
+        cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)", bounds)
+
+
+def drop_expired_partitions(today=None, retention_months=None):
+    """
+    Drops partitions that end before the retention window (whole months
+    older than ACTIVITY_LOG_RETENTION_MONTHS). Returns their names.
+    """
+    today = today or timezone.now().date()
+    retention_months = settings.ACTIVITY_LOG_RETENTION_MONTHS if retention_months is None else retention_months
+    cutoff = add_months(today.replace(day=1), -retention_months)
+    dropped = []
+    with connection.cursor() as cursor:
+        for month, name in sorted(partitions().items()):
+            if add_months(month, 1) <= cutoff:
+                cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+                dropped.append(name)
+        cursor.execute(
+            f"DELETE FROM {connection.ops.quote_name(DEFAULT_PARTITION)} WHERE \"timestamp\" < %s", [cutoff]
+        )
+    return dropped
+
+
+# =================================================
+# DAILY ROLLUPS
+# =================================================
+def rollup_day(day):
+    """
+    Recomputes ActivityDailyRollup for one (UTC) day from the raw log.
+    Idempotent; only the partition holding `day` is read. Returns row count.
+    """
+    start = timezone.make_aware(datetime.combine(day, time.min), dt_timezone.utc)
+    counts = (
+        ActivityLog.objects.filter(timestamp__gte=start, timestamp__lt=start + timedelta(days=1))
+        .order_by()
+        .values('actor_id', 'action_type')
+        .annotate(total=Count('id'))
+    )
+    rows = [
+        ActivityDailyRollup(day=day, actor_id=row['actor_id'], action_type=row['action_type'], count=row['total'])
+        for row in counts
+    ]
+    ActivityDailyRollup.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['day', 'actor', 'action_type'],
+        update_fields=['count'],
+    )
+    return len(rows)
@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 from .models import (
     JobAdvert, 
     JobApplication, 
@@ -6,8 +8,16 @@ from .models import (
     Experience, 
     Education, 
     Skill, 
+    CanonicalSkill,
+    SkillSynonym,
     Notification,
-    ActivityLog
+    NotificationFanout,
+    Broadcast,
+    NotificationPreference,
+    StoredFile,
+    ActivityLog,
+    ActivityDailyRollup,
+    DomainEvent
 )
 
 # 1. Register simple models
@@ -19,11 +29,80 @@ admin.site.register(Education)
 admin.site.register(Skill)
 admin.site.register(Notification)
 
+
+# 3. Skill taxonomy: synonyms are edited inline on their canonical skill
+class SkillSynonymInline(admin.TabularInline):
+    model = SkillSynonym
+    extra = 1
+
+
+@admin.register(CanonicalSkill)
+class CanonicalSkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'key')
+    search_fields = ('name', 'key', 'synonyms__alias')
+    inlines = [SkillSynonymInline]
+
+
+# 4. Job-match notification fan-outs (progress is written by the worker)
+@admin.register(NotificationFanout)
+class NotificationFanoutAdmin(admin.ModelAdmin):
+    list_display = ('id', 'job', 'job_advert', 'status', 'matched_users', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = ('job', 'job_advert', 'status', 'matched_users', 'last_user_id', 'error', 'created_at', 'finished_at')
+
+
+# 5. Email delivery preferences (digest watermark is maintained by the digest task)
+@admin.register(NotificationPreference)
+class NotificationPreferenceAdmin(admin.ModelAdmin):
+    list_display = ('user', 'email_mode', 'digest_window', 'last_digest_at')
+    list_filter = ('email_mode', 'digest_window')
+    search_fields = ('user__email',)
+    readonly_fields = ('last_digest_at',)
+
+
+# 6. Deduplicated upload blobs (written by the chunked upload endpoint)
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    list_display = ('file', 'size', 'sha256', 'created_at')
+    search_fields = ('sha256', 'file')
+    readonly_fields = ('sha256', 'file', 'size', 'created_at')
+
+
+# 7. Recruiter broadcasts (progress is written by the worker)
+@admin.register(Broadcast)
+class BroadcastAdmin(admin.ModelAdmin):
+    list_display = ('id', 'organization', 'job', 'status', 'sent_count', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = ('sender', 'organization', 'job', 'application_status', 'search_query', 'content',
+                       'status', 'sent_count', 'last_user_id', 'error', 'created_at', 'finished_at')
+
+# ActivityLog is partitioned by month: the changelist defaults to this month
+# so an unfiltered page reads one partition instead of the whole history
+class ActivityDateFilter(admin.DateFieldListFilter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_params = dict(self.links[3][1])  # "This month"
+        self.links = ((_("All time"), {self.lookup_kwarg_since: "1970-01-01"}),) + self.links[1:]
+
+    def queryset(self, request, queryset):
+        if not self.used_parameters:
+            return queryset.filter(**self.default_params)
+        return super().queryset(request, queryset)
+
+    def choices(self, changelist):
+        if not self.date_params:
+            self.date_params = {key: str(value) for key, value in self.default_params.items()}
+        return super().choices(changelist)
+
+
 # 2. Register ActivityLog with a nice list view (Read-Only recommended)
 @admin.register(ActivityLog)
 class ActivityLogAdmin(admin.ModelAdmin):
     list_display = ('timestamp', 'actor', 'action_type', 'description', 'ip_address')
-    list_filter = ('action_type', 'timestamp')
+    list_filter = ('action_type', ('timestamp', ActivityDateFilter))
+    list_select_related = ('actor',)
+    # No extra COUNT(*) over every partition for the "N total" link
+    show_full_result_count = False
     search_fields = ('actor__email', 'description')
     readonly_fields = ('timestamp', 'actor', 'action_type', 'description', 'ip_address', 'target_object')
     
@@ -32,4 +111,40 @@ class ActivityLogAdmin(admin.ModelAdmin):
         return False
     
     def has_change_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+
+# 8. Daily activity counts (rebuilt hourly by tasks.rollup_activity)
+@admin.register(ActivityDailyRollup)
+class ActivityDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'actor', 'action_type', 'count')
+    list_filter = ('action_type', 'day')
+    search_fields = ('actor__email',)
+    list_select_related = ('actor',)
+    date_hierarchy = 'day'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+# 9. Domain event outbox (written by events.publish, drained by tasks.dispatch_domain_events)
+@admin.register(DomainEvent)
+class DomainEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'created_at', 'available_at', 'processed_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('name', 'payload', 'status', 'attempts', 'handled', 'available_at', 'error',
+                       'created_at', 'processed_at')
+    show_full_result_count = False
+    actions = ['retry_events']
+
+    @admin.action(description="Retry selected events")
+    def retry_events(self, request, queryset):
+        # Handlers that already succeeded are not re-run (see events.dispatch)
+        count = queryset.exclude(status='DONE').update(status='PENDING', attempts=0, available_at=timezone.now())
+        self.message_user(request, f"{count} event(s) queued for retry.")
+
+    def has_add_permission(self, request):
+        return False
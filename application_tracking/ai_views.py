@@ -1,16 +1,16 @@
 import json
 import google.generativeai as genai
 from django.conf import settings
+from django.db import transaction
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse, Http404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
-from django.urls import reverse
 from django.template.loader import render_to_string
 
-from .models import JobApplication, AIInterviewSession, AIInterviewLog, Notification, CandidateTask
-from organization.models import Message
+from .models import JobApplication, AIInterviewSession, AIInterviewLog, CandidateTask
+from . import events, uploads
 
 # Configure Gemini
 try:
@@ -225,13 +225,15 @@ def user_task_view(request, application_id):
         task.response_text = response_text
         if response_file:
             task.response_file = response_file
+        else:
+            uploads.attach(request, task, 'response_file')
         
         task.status = 'SUBMITTED'
         task.submitted_at = timezone.now()
-        task.save()
-        
-        # Trigger Evaluation
-        evaluate_task_response(task)
+        with transaction.atomic():
+            task.save()
+            # Graded in the background (event_handlers.grade_task)
+            events.publish(events.TaskSubmitted(task_id=task.id))
         
         messages_text = "Task submitted! We are evaluating your response..."
         return render(request, 'user_task_submitted.html', {'application': application})
@@ -284,40 +286,33 @@ def evaluate_task_response(task):
 
 
 def next_stage_or_reject(application, approved, reason=None):
-    """Moves application to next stage or rejects"""
+    """
+    Moves application to next stage or rejects. The candidate's message and
+    the next task follow from the published event (see event_handlers.py).
+    """
     if not approved:
         application.status = 'REJECTED'
-        application.save()
-        # Send Rejection Msg
-        msg_content = f"Thank you for completing the task. Unfortunately, your score ({reason}) did not meet our threshold for this round."
-        send_system_message(application, msg_content)
+        with transaction.atomic():
+            application.save()
+            events.publish(events.DecisionMade(
+                application_id=application.id, status='REJECTED',
+                decided_by=events.DecisionMade.TASK, feedback=reason or '',
+            ))
         return
 
     # APPROVED logic
     current = application.interview_stage
-    
-    if current == 'HR_ROUND':
-        application.interview_stage = 'TECH_ROUND'
-        application.save()
-        assign_ai_task(application, 'TECH') # Auto-create next task
-        send_system_message(application, "Congrats! You passed the HR Round. A Technical Task has been assigned to you.")
-        
-    elif current == 'TECH_ROUND':
-        application.interview_stage = 'FINAL_ROUND'
-        application.save()
-        # Final Round is Chat
-        send_system_message(application, "Excellent work! You've advanced to the Final Interview. Please proceed to the Interview Room.")
-
+    next_stages = {'HR_ROUND': 'TECH_ROUND', 'TECH_ROUND': 'FINAL_ROUND'}  # Final Round is Chat
+    if current not in next_stages:
+        return
 
-def send_system_message(app, content):
-    if app.job and app.job.organization.admin_user:
-        sender = app.job.organization.admin_user
-        Message.objects.create(
-            sender=sender,
-            receiver=app.user,
-            content=content,
-            is_read=False
-        )
+    application.interview_stage = next_stages[current]
+    with transaction.atomic():
+        application.save()
+        # TECH_ROUND: the technical task is generated by event_handlers.assign_stage_task
+        events.publish(events.StageAdvanced(
+            application_id=application.id, from_stage=current, to_stage=application.interview_stage,
+        ))
 
 @csrf_exempt
 @login_required
@@ -410,22 +405,11 @@ def end_ai_interview(request, application_id):
     if session:
         session.status = 'COMPLETED'
         session.end_time = timezone.now()
-        session.save()
-        
-        # Trigger Analysis in background (synchronous for now)
-        analyze_interview(session)
-        
-        messages_text = "Interview completed! Our system is analyzing your responses. You will be notified shortly."
-        
-        # Send System Message
-        if application.job and application.job.organization.admin_user:
-             recruiter = application.job.organization.admin_user
-             Message.objects.create(
-                 sender=recruiter,
-                 receiver=request.user,
-                 content=messages_text,
-                 is_read=False
-             )
+        with transaction.atomic():
+            session.save()
+            # Analysis and the "analyzing your responses" message run in the
+            # background (event_handlers.analyze_completed_interview)
+            events.publish(events.InterviewCompleted(session_id=session.id, application_id=application.id))
     
     return redirect('user_interview_room', application_id=application.id)
 
@@ -483,30 +467,17 @@ def analyze_interview(session):
         if decision == 'HIRE':
             app.status = 'ACCEPTED' # Or NEXT_ROUND
             app.interview_stage = 'HIRED' # Move to next stage (Final Round Done)
-            
-            # Send Notification
-            Notification.objects.create(
-                user=app.user,
-                title="Interview Passed! 🎉",
-                message=f"You successfully passed the AI Interview. Score: {session.final_score}/100.",
-                link=reverse('user_interview_room', kwargs={'application_id': app.id})
-            )
-        
         elif decision == 'REJECT':
             app.status = 'REJECTED'
-            
-            # Send Rejection Message
-            if app.job and app.job.organization:
-                sender = app.job.organization.admin_user
-                if sender:
-                    Message.objects.create(
-                        sender=sender,
-                        receiver=app.user,
-                        content=data.get('feedback_message', "Thank you for your time. unfortunately we are not moving forward."),
-                        is_read=False
-                    )
-        
-        app.save()
+
+        # Notification / rejection message: event_handlers (DecisionMade)
+        with transaction.atomic():
+            app.save()
+            if decision in ('HIRE', 'REJECT'):
+                events.publish(events.DecisionMade(
+                    application_id=app.id, status=app.status, decided_by=events.DecisionMade.INTERVIEW,
+                    score=session.final_score, feedback=data.get('feedback_message', ''),
+                ))
 
     except Exception as e:
         print(f"Analysis Error: {e}, using Mock Fallback...")
@@ -523,10 +494,9 @@ def analyze_interview(session):
         # app.interview_stage remains FINAL_ROUND or moves to OFFER, but status is key.
         
         # Notify
-        Notification.objects.create(
-            user=app.user,
-            title="Interview Passed! 🎉",
-            message=f"You passed the Final Interview (Mock Mode). Score: {session.final_score}/100.",
-            link=reverse('user_interview_room', kwargs={'application_id': app.id})
-        )
-        app.save()
+        with transaction.atomic():
+            app.save()
+            events.publish(events.DecisionMade(
+                application_id=app.id, status='ACCEPTED', decided_by=events.DecisionMade.INTERVIEW,
+                score=session.final_score,
+            ))
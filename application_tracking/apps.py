@@ -5,4 +5,6 @@ class ApplicationTrackingConfig(AppConfig):
     name = 'application_tracking'
 
     def ready(self):
-        import application_tracking.signals
\ No newline at end of file
+        import application_tracking.checks
+        import application_tracking.signals
+        import application_tracking.event_handlers
\ No newline at end of file
@@ -0,0 +1,131 @@
+import heapq
+import threading
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db.models import Count, Min
+from django.db.models.functions import Lower
+
+from organization.models import Job, Organization
+
+from . import job_cache
+from .models import CanonicalSkill
+
+# Typeahead suggestions are answered from an in-memory prefix index instead of
+# running a search per keystroke. The terms (with popularity) are built once
+# per data version and shared through the cache, so only one process hits the
+# database; every process then keeps its own sorted index and rebuilds it
+# only when the version changes.
+
+SCOPES = {
+    "jobs": ("title", "organization"),
+    "skills": ("skill",),
+}
+SKILLS = "skills"
+MAX_SUGGESTIONS = 8
+MAX_PREFIX_LENGTH = 50
+
+
+def normalize(text):
+    return " ".join((text or "").casefold().split())
+
+
+# =================================================
+# 1. PREFIX INDEX
+# =================================================
+class PrefixIndex:
+    """
+    Sorted array of keys -> term ids. Each term is indexed under every word
+    start, so "dev" finds "Python Developer". A lookup is a bisect to the
+    first key >= prefix, then a walk while keys still start with the prefix.
+    """
+
+    def __init__(self, terms):
+        # terms: [(label, kind, popularity)]
+        self.terms = terms
+        pairs = []
+        for term_id, (label, _kind, _popularity) in enumerate(terms):
+            words = normalize(label).split(" ")
+            for start in range(len(words)):
+                pairs.append((" ".join(words[start:]), term_id))
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.ids = [term_id for _, term_id in pairs]
+
+    def __len__(self):
+        return len(self.terms)
+
+    def suggest(self, prefix, kinds=None, limit=MAX_SUGGESTIONS):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        matched = set()
+        position = bisect_left(self.keys, prefix)
+        while position < len(self.keys) and self.keys[position].startswith(prefix):
+            term_id = self.ids[position]
+            if kinds is None or self.terms[term_id][1] in kinds:
+                matched.add(term_id)
+            position += 1
+
+        best = heapq.nsmallest(limit, matched, key=lambda i: (-self.terms[i][2], self.terms[i][0]))
+        return [{"label": self.terms[i][0], "kind": self.terms[i][1]} for i in best]
+
+
+# =================================================
+# 2. TERMS (POPULARITY FROM THE DATABASE)
+# =================================================
+def collect_terms(scope):
+    """[(label, kind, popularity)] for a scope; case variants are merged."""
+    if scope == SKILLS:
+        rows = CanonicalSkill.objects.values('name').annotate(popularity=Count('user_skills__user', distinct=True))
+        return [(row["name"], "skill", row["popularity"]) for row in rows]
+
+    # Titles rank by open positions plus the applications they attracted
+    titles = (Job.objects.active().values(key=Lower('title'))
+              .annotate(label=Min('title'),
+                        jobs=Count('id', distinct=True),
+                        applicants=Count('applications', distinct=True)))
+    terms = [(row["label"], "title", row["jobs"] + row["applicants"]) for row in titles]
+
+    organizations = (Organization.objects.filter(jobs__is_active=True)
+                     .values('name').annotate(popularity=Count('jobs', distinct=True)))
+    terms += [(row["name"], "organization", row["popularity"]) for row in organizations]
+    return terms
+
+
+def index_version(scope):
+    return job_cache.get_version(SKILLS if scope == SKILLS else job_cache.ALL_JOBS)
+
+
+# =================================================
+# 3. PER-PROCESS INDEX REGISTRY
+# =================================================
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_index(scope):
+    version = index_version(scope)
+    current = _indexes.get(scope)
+    if current and current[0] == version:
+        return current[1]
+
+    with _lock:
+        current = _indexes.get(scope)
+        if current and current[0] == version:
+            return current[1]
+        terms = cache.get_or_set(
+            job_cache.versioned_key("autocomplete-terms", [version], scope),
+            lambda: collect_terms(scope),
+            job_cache.RESULT_TIMEOUT,
+        )
+        index = PrefixIndex(terms)
+        _indexes[scope] = (version, index)
+        return index
+
+
+def suggest(scope, prefix, limit=MAX_SUGGESTIONS):
+    if scope not in SCOPES:
+        return []
+    return get_index(scope).suggest(prefix[:MAX_PREFIX_LENGTH], kinds=SCOPES[scope], limit=limit)
@@ -0,0 +1,103 @@
+import re
+
+from django.db import transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils.text import Truncator
+
+from organization.models import Conversation, Message
+
+from . import counters, realtime
+from .candidate_search import search_candidates
+from .models import Broadcast, JobApplication, Notification
+
+# Recruiter -> many applicants messaging. The recruiter writes one message,
+# optionally with {{ placeholders }}; send_broadcast (tasks.py) renders it per
+# recipient and writes each chunk of Message + Notification rows with
+# bulk_create. bulk_create skips the post_save handlers that keep the inbox
+# and unread badges current, so deliver_chunk() does that work in bulk.
+
+CHUNK_SIZE = 500
+VARIABLES = {
+    'first_name': "Applicant's first name",
+    'last_name': "Applicant's last name",
+    'full_name': "Name on the application",
+    'job_title': "Job they applied for",
+    'organization': "Your organization's name",
+}
+PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+def unknown_variables(content):
+    return sorted({name for name in PLACEHOLDER.findall(content or "") if name not in VARIABLES})
+
+
+def render(content, variables):
+    """Fills {{ name }} placeholders; anything unknown is left as written."""
+    return PLACEHOLDER.sub(lambda m: str(variables.get(m.group(1), m.group(0))), content)
+
+
+def recipients(broadcast):
+    """
+    One row per applicant user matching the broadcast's filter (their latest
+    application), in user id order so a retried task can resume.
+    """
+    applications = JobApplication.objects.filter(
+        job__organization_id=broadcast.organization_id, user__isnull=False,
+    ).exclude(user_id=broadcast.sender_id)
+    if broadcast.job_id:
+        applications = applications.filter(job_id=broadcast.job_id)
+    if broadcast.application_status:
+        applications = applications.filter(status=broadcast.application_status)
+    if broadcast.search_query:
+        applications = search_candidates(applications, broadcast.search_query)
+    if broadcast.last_user_id:
+        applications = applications.filter(user_id__gt=broadcast.last_user_id)
+    return (
+        applications
+        .order_by('user_id', '-created_at')
+        .distinct('user_id')
+        .values('id', 'user_id', 'user__first_name', 'user__last_name', 'name', 'job__title')
+    )
+
+
+def deliver_chunk(broadcast, rows):
+    """
+    Sends the broadcast to one chunk of `recipients()` rows: messages,
+    notifications, inbox rows and the resume point commit together, so a
+    retry never messages anyone twice. Returns the number sent.
+    """
+    organization_name = broadcast.organization.name
+    messages, notifications = [], []
+    for row in rows:
+        variables = {
+            'first_name': row['user__first_name'] or row['name'].split(" ")[0],
+            'last_name': row['user__last_name'],
+            'full_name': row['name'],
+            'job_title': row['job__title'],
+            'organization': organization_name,
+        }
+        content = render(broadcast.content, variables)
+        messages.append(Message(sender_id=broadcast.sender_id, receiver_id=row['user_id'], content=content))
+        notifications.append(Notification(
+            user_id=row['user_id'],
+            title=f"New message from {organization_name}",
+            message=Truncator(content).chars(150),
+            link=reverse('user_interview_room', kwargs={'application_id': row['id']}),
+        ))
+
+    with transaction.atomic():
+        messages = Message.objects.bulk_create(messages)
+        notifications = Notification.objects.bulk_create(notifications)
+        Conversation.objects.record_broadcast(broadcast.sender_id, messages)
+        Broadcast.objects.filter(id=broadcast.id).update(
+            sent_count=F('sent_count') + len(messages), last_user_id=rows[-1]['user_id']
+        )
+
+    # One grouped count and one pub/sub round trip per kind for the whole chunk
+    receiver_ids = [message.receiver_id for message in messages]
+    realtime.publish_chat_messages(messages)
+    realtime.publish_notifications(notifications)
+    counters.reconcile(counters.MESSAGES, receiver_ids, publish=True)
+    counters.reconcile(counters.NOTIFICATIONS, receiver_ids, publish=True)
+    return len(messages)
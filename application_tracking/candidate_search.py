@@ -0,0 +1,94 @@
+import re
+from functools import lru_cache
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Q
+
+from .autocomplete import SKILLS, get_index
+from .models import JobApplication, Skill
+from .utils import extract_text_from_file
+
+SEARCH_CONFIG = 'english'
+
+
+# =================================================
+# 1. INDEXING
+# =================================================
+def candidate_document():
+    """Weighted tsvector: identity first, then skills, then the CV body."""
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('email', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('parsed_skills', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('cv_text', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+@lru_cache(maxsize=4)
+def _skill_pattern(vocabulary):
+    # Longest first so "React Native" wins over "React"; the lookarounds keep
+    # "Java" from matching inside "JavaScript" while allowing "C++" / "Node.js"
+    alternatives = "|".join(re.escape(skill) for skill in sorted(vocabulary, key=len, reverse=True))
+    return re.compile(rf"(?<![\w+#.])(?:{alternatives})(?![\w+#])", re.IGNORECASE)
+
+
+def parse_skills(text, vocabulary):
+    """Known skill names mentioned in `text`, in vocabulary spelling."""
+    if not text or not vocabulary:
+        return []
+    labels = {skill.casefold(): skill for skill in vocabulary}
+    pattern = _skill_pattern(tuple(sorted(labels.values())))
+    return sorted({labels[match.group(0).casefold()] for match in pattern.finditer(text)})
+
+
+def index_candidate(application):
+    """
+    Extracts the CV (only when the file changed), parses skills and rebuilds
+    the search vector. Written with update() so no save signals fire again.
+    """
+    cv_text = application.cv_text
+    cv_name = application.cv.name if application.cv else ''
+    if cv_name != application.cv_text_source:
+        cv_text = ''
+        if cv_name:
+            try:
+                with application.cv.open('rb') as cv:
+                    cv_text = extract_text_from_file(cv)
+            except (OSError, ValueError) as e:
+                print(f"Could not read CV for application {application.pk}: {e}")
+        cv_text = cv_text.replace('\x00', '')
+
+    vocabulary = [label for label, _kind, _popularity in get_index(SKILLS).terms]
+    skills = set(parse_skills(cv_text, vocabulary))
+    if application.user_id:
+        skills.update(Skill.objects.filter(user_id=application.user_id).values_list('name', flat=True))
+
+    JobApplication.objects.filter(pk=application.pk).update(
+        cv_text=cv_text,
+        cv_text_source=cv_name,
+        parsed_skills=", ".join(sorted(skills)),
+        search_vector=candidate_document(),
+    )
+
+
+# =================================================
+# 2. SEARCH
+# =================================================
+def search_candidates(candidates, text):
+    """
+    Ranked search for the recruiter candidate list. Supports web-style
+    queries ("django postgres", "django or flask", "-php", "\"machine learning\"");
+    a bare AND between terms is implied. Partial name/email fragments still
+    match through the trigram indexes.
+    """
+    text = " ".join((text or "").split())
+    if not text:
+        return candidates.order_by('-created_at', '-id')
+
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+    return (
+        candidates
+        .annotate(search_rank=SearchRank(F('search_vector'), query))
+        .filter(Q(search_vector=query) | Q(name__icontains=text) | Q(email__icontains=text))
+        .order_by('-search_rank', '-created_at', '-id')
+    )
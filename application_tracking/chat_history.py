@@ -0,0 +1,35 @@
+from common.pagination import KeysetPaginator
+from organization.models import Message
+
+from .realtime import message_payload
+
+# Chat pages (org_chat, the interview room) render only the newest PAGE_SIZE
+# messages; older ones are fetched a page at a time by the history endpoints
+# as the user scrolls up. Pages are newest first for the keyset query and
+# flipped to oldest first for display.
+
+PAGE_SIZE = 30
+ORDERING = ('-timestamp', '-id')
+
+
+class HistoryPage:
+    def __init__(self, page):
+        self.items = list(reversed(page.object_list))  # oldest first
+        self.older_cursor = page.next_cursor or ""
+
+
+def message_page(user, peer, cursor=None, per_page=PAGE_SIZE):
+    queryset = Message.objects.between(user, peer)
+    return HistoryPage(KeysetPaginator(queryset, per_page, ordering=ORDERING).get_page(cursor))
+
+
+def ai_log_page(session, cursor=None, per_page=PAGE_SIZE):
+    return HistoryPage(KeysetPaginator(session.logs.all(), per_page, ordering=ORDERING).get_page(cursor))
+
+
+def ai_log_payload(log):
+    return {"id": log.id, "role": log.role, "content": log.content, "timestamp": log.timestamp.isoformat()}
+
+
+def as_json(page, payload=message_payload):
+    return {"items": [payload(item) for item in page.items], "older_cursor": page.older_cursor}
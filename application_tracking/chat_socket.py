@@ -0,0 +1,200 @@
+import asyncio
+import json
+import re
+import uuid
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db.models import Q
+from django.http import parse_cookie
+from django.http.request import validate_host
+from django.utils.http import is_same_domain
+
+from common import pubsub
+from common.middleware import session_cookie_name
+from organization.models import Conversation, Message
+
+from . import counters, realtime
+from .models import JobApplication
+
+# Real-time chat for org_chat and the candidate interview room, served as a
+# plain ASGI websocket app (routed from talent_base/asgi.py, no extra
+# framework). One socket per open conversation:
+#
+#   client -> server  {"type": "message", "content": "..."}
+#                     {"type": "read"}            (I've seen everything so far)
+#   server -> client  {"type": "message", ...realtime.message_payload}
+#                     {"type": "read", "reader_id": "..."}
+#                     {"type": "error", "message": "..."}
+#
+# Sent messages are saved to Message; the post_save signal publishes them on
+# the conversation's pub/sub channel, which every socket of both
+# participants (on any web process, with PUBSUB_REDIS_URL) listens to.
+# Attachments still go through the regular form POST.
+
+CHAT_PATH = re.compile(r"^/ws/chat/(?P<peer_id>[0-9a-fA-F-]{36})/$")
+MAX_MESSAGE_LENGTH = 5000
+IDLE_POLL_SECONDS = 30
+# Close codes (4000-4999 are application defined)
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+CLOSE_NOT_FOUND = 4404
+
+
+# =================================================
+# 1. AUTH & PERMISSIONS
+# =================================================
+def _headers(scope):
+    return {name.decode("latin1").lower(): value.decode("latin1") for name, value in scope.get("headers", [])}
+
+
+def _origin_allowed(scope):
+    """
+    True if the handshake comes from one of our own pages. Browsers send the
+    session cookie with cross-site websocket handshakes too, so without this
+    any other site (a sibling subdomain included) could chat as the user.
+    The Origin must match ALLOWED_HOSTS or CSRF_TRUSTED_ORIGINS; handshakes
+    without one are refused.
+    """
+    origin = _headers(scope).get("origin")
+    if not origin:
+        return False
+    parsed = urlsplit(origin)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return False
+
+    for trusted in settings.CSRF_TRUSTED_ORIGINS:
+        trusted_scheme, _, trusted_netloc = trusted.partition("://")
+        if trusted_scheme != parsed.scheme:
+            continue
+        if "*" in trusted_netloc:
+            # "https://*.example.com", as in CsrfViewMiddleware
+            if is_same_domain(parsed.netloc, trusted_netloc[trusted_netloc.find("*") + 1:]):
+                return True
+        elif parsed.netloc == trusted_netloc:
+            return True
+
+    allowed_hosts = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed_hosts:
+        allowed_hosts = [".localhost", "127.0.0.1", "[::1]"]
+    return validate_host(parsed.hostname, allowed_hosts)
+
+
+def _user_from_scope(scope):
+    """The logged-in user for the socket's session cookie (same cookie as the HTTP views)."""
+    headers = _headers(scope)
+    cookies = parse_cookie(headers.get("cookie", ""))
+    session_key = cookies.get(session_cookie_name(headers.get("host", "")))
+    store = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+    return get_user(SimpleNamespace(session=store))
+
+
+def can_chat(user_id, peer_id):
+    """Chats exist between a candidate and the recruiter behind one of their applications."""
+    recruiter_of = lambda candidate, recruiter: (
+        Q(user_id=candidate, job__organization__admin_user_id=recruiter)
+        | Q(user_id=candidate, job_advert__created_by_id=recruiter)
+    )
+    return JobApplication.objects.filter(recruiter_of(user_id, peer_id) | recruiter_of(peer_id, user_id)).exists()
+
+
+# =================================================
+# 2. CLIENT EVENTS
+# =================================================
+def save_message(sender_id, receiver_id, content):
+    # Publishing happens in the Message post_save signal, on commit
+    return Message.objects.create(sender_id=sender_id, receiver_id=receiver_id, content=content, is_read=False)
+
+
+def mark_read(reader_id, sender_id):
+    marked = Message.objects.filter(sender_id=sender_id, receiver_id=reader_id, is_read=False).update(is_read=True)
+    Conversation.objects.mark_read(reader_id, sender_id)
+    if marked:
+        counters.adjust(counters.MESSAGES, reader_id, -marked)
+        realtime.publish_read(reader_id, sender_id)
+    return marked
+
+
+async def handle_client_event(user_id, peer_id, text):
+    """Returns an error payload for the sender, or None."""
+    try:
+        event = json.loads(text)
+    except (TypeError, ValueError):
+        return {"type": "error", "message": "Invalid JSON."}
+    if not isinstance(event, dict):
+        return {"type": "error", "message": "Invalid event."}
+
+    if event.get("type") == "message":
+        content = str(event.get("content") or "").strip()
+        if not content:
+            return {"type": "error", "message": "Message is empty."}
+        if len(content) > MAX_MESSAGE_LENGTH:
+            return {"type": "error", "message": "Message is too long."}
+        await sync_to_async(save_message)(user_id, peer_id, content)
+    elif event.get("type") == "read":
+        await sync_to_async(mark_read)(user_id, peer_id)
+    else:
+        return {"type": "error", "message": "Unknown event type."}
+    return None
+
+
+# =================================================
+# 3. ASGI APP
+# =================================================
+async def _send_json(send, payload):
+    await send({"type": "websocket.send", "text": json.dumps(payload, default=str)})
+
+
+async def chat_websocket(scope, receive, send):
+    event = await receive()
+    if event["type"] != "websocket.connect":
+        return
+
+    match = CHAT_PATH.match(scope.get("path", ""))
+    if not match:
+        await send({"type": "websocket.close", "code": CLOSE_NOT_FOUND})
+        return
+    if not _origin_allowed(scope):
+        await send({"type": "websocket.close", "code": CLOSE_FORBIDDEN})
+        return
+
+    user = await sync_to_async(_user_from_scope)(scope)
+    if not user.is_authenticated:
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+    peer_id = uuid.UUID(match["peer_id"])
+    if not await sync_to_async(can_chat)(user.id, peer_id):
+        await send({"type": "websocket.close", "code": CLOSE_FORBIDDEN})
+        return
+
+    # Subscribe before accepting so nothing sent right after connect is missed
+    async with pubsub.subscribe(realtime.chat_channel(user.id, peer_id)) as subscription:
+        await send({"type": "websocket.accept"})
+        from_client = asyncio.ensure_future(receive())
+        from_bus = asyncio.ensure_future(subscription.get(timeout=IDLE_POLL_SECONDS))
+        try:
+            while True:
+                done, _pending = await asyncio.wait({from_client, from_bus}, return_when=asyncio.FIRST_COMPLETED)
+
+                if from_bus in done:
+                    message = from_bus.result()
+                    if message is not None:
+                        await _send_json(send, message)
+                    from_bus = asyncio.ensure_future(subscription.get(timeout=IDLE_POLL_SECONDS))
+
+                if from_client in done:
+                    event = from_client.result()
+                    if event["type"] == "websocket.disconnect":
+                        break
+                    if event["type"] == "websocket.receive":
+                        error = await handle_client_event(user.id, peer_id, event.get("text"))
+                        if error:
+                            await _send_json(send, error)
+                    from_client = asyncio.ensure_future(receive())
+        finally:
+            from_client.cancel()
+            from_bus.cancel()
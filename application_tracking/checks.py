@@ -0,0 +1,24 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Unread counters are adjusted by celery workers and read by every web
+    process, and a job save must bump the cache versions every process reads,
+    so a cache that lives in one process's memory diverges at once.
+    """
+    if not isinstance(caches['default'], LocMemCache):
+        return []
+    return [
+        Error(
+            "The default cache is a per-process LocMemCache.",
+            hint=(
+                "Set CACHE_REDIS_URL (or PUBSUB_REDIS_URL) so unread counters and job cache "
+                "versions are shared by all processes."
+            ),
+            id='application_tracking.E001',
+        )
+    ]
@@ -1,7 +1,11 @@
-from .models import Notification
+from . import counters
 
 def notification_counts(request):
     if request.user.is_authenticated:
-        unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
-        return {'unread_notifications_count': unread_count}
-    return {'unread_notifications_count': 0}
\ No newline at end of file
+        # Cached counters (see counters.py) instead of a COUNT(*) per render
+        unread = counters.get_unread_counts(request.user.id)
+        return {
+            'unread_notifications_count': unread[counters.NOTIFICATIONS],
+            'unread_messages_count': unread[counters.MESSAGES],
+        }
+    return {'unread_notifications_count': 0, 'unread_messages_count': 0}
@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.db.models import Count
+
+from organization.models import Message
+
+from . import realtime
+from .models import Notification
+
+# Unread badges are read on every page render, so the counts live in the
+# cache and are adjusted in place (incr/decr) by the code paths that create
+# or read notifications/messages. A missing key is recomputed from the
+# database on the next read; the TTL and the periodic reconcile task bound
+# any drift from races between a recompute and a concurrent adjustment.
+
+NOTIFICATIONS = "notifications"
+MESSAGES = "messages"
+KINDS = (NOTIFICATIONS, MESSAGES)
+COUNTER_TIMEOUT = 60 * 60
+
+
+def _key(kind, user_id):
+    return f"unread:{kind}:{user_id}"
+
+
+def unread_queryset(kind):
+    if kind == NOTIFICATIONS:
+        return Notification.objects.filter(is_read=False), 'user_id'
+    return Message.objects.filter(is_read=False), 'receiver_id'
+
+
+def _count(kind, user_id):
+    queryset, owner = unread_queryset(kind)
+    return queryset.filter(**{owner: user_id}).count()
+
+
+def get_unread_counts(user_id):
+    """{"notifications": n, "messages": n} - one cache round trip when warm."""
+    keys = {kind: _key(kind, user_id) for kind in KINDS}
+    cached = cache.get_many(keys.values())
+    counts = {}
+    for kind, key in keys.items():
+        value = cached.get(key)
+        if value is None:
+            value = _count(kind, user_id)
+            # add(), not set(): never clobber a counter another request just adjusted
+            cache.add(key, value, COUNTER_TIMEOUT)
+        counts[kind] = value
+    return counts
+
+
+def adjust(kind, user_id, delta):
+    """
+    Atomically moves a cached counter and pushes the new value to the user's
+    open tabs. A cold counter is left for the next read (anyone with a live
+    stream has a warm one) and None is returned.
+    """
+    if not delta:
+        return None
+    key = _key(kind, user_id)
+    try:
+        value = cache.incr(key, delta) if delta > 0 else cache.decr(key, -delta)
+    except ValueError:
+        return None
+    if value < 0:
+        cache.delete(key)
+        return None
+    realtime.publish_unread(user_id, {kind: value})
+    return value
+
+
+def invalidate(kind, user_ids):
+    """For bulk writes that don't report per-user changes."""
+    cache.delete_many([_key(kind, user_id) for user_id in user_ids])
+
+
+def reconcile(kind, user_ids, publish=False):
+    """
+    Overwrites the cached counters of `user_ids` with exact counts (one
+    grouped query). With `publish`, the new values are also pushed to the
+    users' open tabs - the batch version of adjust() for bulk inserts.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    queryset, owner = unread_queryset(kind)
+    counts = dict(
+        queryset.filter(**{f"{owner}__in": user_ids}).order_by()
+        .values_list(owner).annotate(unread=Count('id'))
+    )
+    counts = {user_id: counts.get(user_id, 0) for user_id in user_ids}
+    cache.set_many({_key(kind, user_id): count for user_id, count in counts.items()}, COUNTER_TIMEOUT)
+    if publish:
+        realtime.publish_unread_many(kind, counts)
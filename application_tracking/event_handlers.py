@@ -0,0 +1,246 @@
+from django.urls import reverse
+
+from organization.models import Message
+
+from . import activity
+from .ai_views import analyze_interview, assign_ai_task, evaluate_task_response
+from .events import ApplicationSubmitted, DecisionMade, InterviewCompleted, StageAdvanced, TaskSubmitted, handles
+from .models import AIInterviewSession, CandidateTask, JobApplication
+from .notifications import notify
+
+# What happens after a domain event (see events.py). Each handler gets a
+# batch of (event id, event) pairs of one type and loads the rows it needs
+# for the whole batch at once. Notifications and chat messages carry the
+# event id as their dedupe key and the AI steps check for work already done,
+# so a redelivered event doesn't repeat them.
+
+# Stages the AI pipeline moves candidates to
+STAGE_MESSAGES = {
+    'TECH_ROUND': "Congrats! You passed the HR Round. A Technical Task has been assigned to you.",
+    'FINAL_ROUND': "Excellent work! You've advanced to the Final Interview. Please proceed to the Interview Room.",
+}
+ROUND_NAMES = {'HR_ROUND': 'HR', 'TECH_ROUND': 'TECH', 'FINAL_ROUND': 'FINAL'}
+INTERVIEW_UPDATE_MESSAGE = (
+    "**[INTERVIEW UPDATE - {round_name} ROUND]**\n\n"
+    "Hello {name}, congratulations! You have been moved to the {round_name} Interview Round for {title}.\n\n"
+    "The hiring manager will be sending you the interview questions or tasks shortly via this chat.\n"
+    "Please stay online."
+)
+HIRED_MESSAGE = (
+    "🎉 **CONGRATULATIONS!**\n\nWe are pleased to inform you that you have been selected for the **{title}** position.\n\n"
+    "HR will contact you shortly with the offer letter details."
+)
+REJECTED_MESSAGE = (
+    "Thank you for your time and interest in the **{title}** position.\n\n"
+    "After careful consideration, we have decided to move forward with other candidates at this time. "
+    "We wish you the best in your future endeavors."
+)
+TASK_REJECTED_MESSAGE = (
+    "Thank you for completing the task. Unfortunately, your score ({reason}) did not meet our threshold for this round."
+)
+INTERVIEW_REJECTED_MESSAGE = "Thank you for your time. unfortunately we are not moving forward."
+INTERVIEW_COMPLETED_MESSAGE = (
+    "Interview completed! Our system is analyzing your responses. You will be notified shortly."
+)
+
+
+def _applications(batch):
+    """{application id (str): JobApplication} for the events in `batch`."""
+    ids = {event.application_id for _, event in batch}
+    applications = JobApplication.objects.select_related(
+        'user', 'job__organization__admin_user', 'job_advert'
+    ).filter(id__in=ids)
+    return {str(application.id): application for application in applications}
+
+
+def _job_title(application, default="Unknown Job"):
+    job = application.job or application.job_advert
+    return job.title if job else default
+
+
+def _system_message(application, content, dedupe_key, sender_id=None, receiver=None):
+    """
+    Chat message to the candidate, from the organization admin unless
+    `sender_id` is given; sent once per `dedupe_key`.
+    """
+    if sender_id is None and application.job:
+        sender_id = application.job.organization.admin_user_id
+    receiver = receiver or application.user
+    if sender_id and receiver:
+        Message.objects.get_or_create(
+            receiver=receiver, dedupe_key=dedupe_key,
+            defaults={'sender_id': sender_id, 'content': content, 'is_read': False},
+        )
+
+
+def _dedupe_key(event_id, handler):
+    return f"event:{event_id}:{handler}"
+
+
+# =================================================
+# 1. APPLICATION SUBMITTED
+# =================================================
+@handles(ApplicationSubmitted)
+def log_application(batch):
+    applications = _applications(batch)
+    for _, event in batch:
+        application = applications.get(str(event.application_id))
+        if application is None:
+            continue
+        # If the user is logged in (linked), use that. Otherwise try email match.
+        activity.log(
+            'JOB_APPLIED',
+            f"{application.name} applied for {activity.JOB_TITLE}",
+            actor_id=application.user_id,
+            actor_email=None if application.user_id else application.email,
+            target_object=f"App ID: {application.id}",
+            job_id=application.job_id,
+            job_advert_id=application.job_advert_id,
+        )
+
+
+@handles(ApplicationSubmitted)
+def confirm_application(batch):
+    applications = _applications(batch)
+    for event_id, event in batch:
+        application = applications.get(str(event.application_id))
+        if application is None or application.user is None:
+            continue
+        if application.job:
+            company = application.job.organization.name
+        else:
+            company = application.job_advert.company_name
+        notify(
+            application.user,
+            f"Applied: {_job_title(application)}",
+            f"Success! You applied to {company}.",
+            link=reverse('my_applications'),
+            dedupe_key=_dedupe_key(event_id, 'applied'),
+        )
+
+
+# =================================================
+# 2. TASK SUBMITTED -> AI GRADING
+# =================================================
+@handles(TaskSubmitted, batch_size=1)
+def grade_task(batch):
+    tasks = CandidateTask.objects.select_related('application__job', 'application__job_advert').filter(
+        id__in=[event.task_id for _, event in batch], status='SUBMITTED'
+    )
+    for task in tasks:
+        evaluate_task_response(task)
+
+
+# =================================================
+# 3. STAGE ADVANCED
+# =================================================
+@handles(StageAdvanced, batch_size=1)
+def assign_stage_task(batch):
+    applications = _applications(batch)
+    for _, event in batch:
+        application = applications.get(str(event.application_id))
+        # Recruiters moving candidates by hand set their own tasks
+        if event.to_stage != 'TECH_ROUND' or event.actor_id or application is None:
+            continue
+        if not application.tasks.filter(stage='TECH').exists():
+            assign_ai_task(application, 'TECH')
+
+
+@handles(StageAdvanced)
+def message_stage_advanced(batch):
+    applications = _applications(batch)
+    for event_id, event in batch:
+        application = applications.get(str(event.application_id))
+        if application is None:
+            continue
+        if not event.actor_id:
+            if event.to_stage in STAGE_MESSAGES:
+                _system_message(application, STAGE_MESSAGES[event.to_stage], _dedupe_key(event_id, 'stage'))
+            continue
+
+        candidate = application.get_user_account()
+        if candidate is None:
+            continue
+        round_name = ROUND_NAMES.get(event.to_stage, event.to_stage)
+        content = INTERVIEW_UPDATE_MESSAGE.format(
+            round_name=round_name, name=application.name, title=_job_title(application, "the position"),
+        )
+        _system_message(application, content, _dedupe_key(event_id, 'stage'), sender_id=event.actor_id,
+                        receiver=candidate)
+        notify(
+            candidate,
+            f"Interview Update: {round_name}",
+            f"You have moved to the {round_name} round. Check your messages.",
+            link=reverse('user_interview_room', kwargs={'application_id': application.id}),
+            dedupe_key=_dedupe_key(event_id, 'stage'),
+        )
+
+
+# =================================================
+# 4. DECISION MADE
+# =================================================
+@handles(DecisionMade)
+def message_decision(batch):
+    applications = _applications(batch)
+    for event_id, event in batch:
+        application = applications.get(str(event.application_id))
+        if application is None:
+            continue
+        title = _job_title(application)
+        dedupe_key = _dedupe_key(event_id, 'decision')
+
+        if event.decided_by == DecisionMade.RECRUITER:
+            template = {'ACCEPTED': HIRED_MESSAGE, 'REJECTED': REJECTED_MESSAGE}.get(event.status)
+            if template:
+                _system_message(application, template.format(title=title), dedupe_key, sender_id=event.actor_id,
+                                receiver=application.get_user_account())
+        elif event.status == 'REJECTED' and event.decided_by == DecisionMade.TASK:
+            _system_message(application, TASK_REJECTED_MESSAGE.format(reason=event.feedback), dedupe_key)
+        elif event.status == 'REJECTED' and event.decided_by == DecisionMade.INTERVIEW:
+            _system_message(application, event.feedback or INTERVIEW_REJECTED_MESSAGE, dedupe_key)
+
+
+@handles(DecisionMade)
+def notify_decision(batch):
+    applications = _applications(batch)
+    for event_id, event in batch:
+        application = applications.get(str(event.application_id))
+        if application is None:
+            continue
+        link = reverse('user_interview_room', kwargs={'application_id': application.id})
+
+        if event.decided_by == DecisionMade.RECRUITER:
+            user = application.get_user_account()
+            title = "You're Hired! 🎉" if event.status == 'ACCEPTED' else "Application Update"
+            message = f"Status update for {_job_title(application)}: {event.status}"
+        elif event.decided_by == DecisionMade.INTERVIEW and event.status == 'ACCEPTED':
+            user = application.user
+            title = "Interview Passed! 🎉"
+            message = f"You successfully passed the AI Interview. Score: {event.score}/100."
+        else:
+            continue
+
+        if user:
+            notify(user, title, message, link=link, dedupe_key=_dedupe_key(event_id, 'decision'))
+
+
+# =================================================
+# 5. INTERVIEW COMPLETED -> AI ANALYSIS
+# =================================================
+@handles(InterviewCompleted)
+def message_interview_completed(batch):
+    applications = _applications(batch)
+    for event_id, event in batch:
+        application = applications.get(str(event.application_id))
+        if application:
+            _system_message(application, INTERVIEW_COMPLETED_MESSAGE, _dedupe_key(event_id, 'interview'))
+
+
+@handles(InterviewCompleted, batch_size=1)
+def analyze_completed_interview(batch):
+    # Sessions already scored are skipped, so a redelivery doesn't re-run the LLM
+    sessions = AIInterviewSession.objects.select_related('application__job').filter(
+        id__in=[event.session_id for _, event in batch], status='COMPLETED', ai_decision='PENDING'
+    )
+    for session in sessions:
+        analyze_interview(session)
@@ -0,0 +1,236 @@
+import logging
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DomainEvent
+
+logger = logging.getLogger(__name__)
+
+# Internal domain events. Views and the AI pipeline publish() what happened -
+# an application came in, a candidate moved stage, a decision was made -
+# instead of sending messages, notifications, emails and LLM calls inline.
+# publish() writes a DomainEvent outbox row in the caller's transaction, so an
+# event exists exactly when the change it describes committed. After commit,
+# tasks.dispatch_domain_events hands due events to the @handles functions in
+# event_handlers.py, one batch of the same event type at a time.
+#
+# Delivery is at least once. A handler's database writes commit together with
+# the note that it ran, so a retry only re-runs the handlers that failed; a
+# dispatcher that dies mid-batch loses its lease and the events are picked up
+# again. The lease is renewed before each handler call and every write checks
+# that it is still held, so a slow batch is never run or overwritten by a
+# second dispatcher. Handlers must still tolerate seeing an event twice.
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+# How long a dispatcher owns the events it claimed
+LEASE = timedelta(minutes=5)
+# Backoff after a failed attempt, doubled each time
+RETRY_DELAY = timedelta(seconds=30)
+
+
+@dataclass(frozen=True)
+class ApplicationSubmitted:
+    application_id: str
+
+
+@dataclass(frozen=True)
+class TaskSubmitted:
+    task_id: int
+
+
+@dataclass(frozen=True)
+class StageAdvanced:
+    application_id: str
+    from_stage: str
+    to_stage: str
+    # The recruiter who moved the candidate; None when the AI pipeline did
+    actor_id: str | None = None
+
+
+@dataclass(frozen=True)
+class DecisionMade:
+    # decided_by
+    RECRUITER = 'RECRUITER'
+    TASK = 'TASK'
+    INTERVIEW = 'INTERVIEW'
+
+    application_id: str
+    status: str
+    decided_by: str
+    actor_id: str | None = None
+    score: int | None = None
+    feedback: str = ''
+
+
+@dataclass(frozen=True)
+class InterviewCompleted:
+    session_id: int
+    application_id: str
+
+
+EVENT_TYPES = {
+    event_type.__name__: event_type
+    for event_type in (ApplicationSubmitted, TaskSubmitted, StageAdvanced, DecisionMade, InterviewCompleted)
+}
+
+# event type -> [(handler, batch size)]
+_handlers = defaultdict(list)
+
+
+def handles(event_type, batch_size=None):
+    """
+    Registers the decorated function for `event_type`. It is called with a
+    list of (event id, event) pairs, at most `batch_size` at a time (default:
+    the whole claimed batch); use batch_size=1 for slow calls such as the
+    LLM, so each runs in its own short transaction.
+    """
+    def register(func):
+        _handlers[event_type].append((func, batch_size))
+        return func
+    return register
+
+
+def handler_name(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def publish(event):
+    """Records `event` in the outbox with the current transaction; it is dispatched once that commits."""
+    row = DomainEvent.objects.create(name=type(event).__name__, payload=asdict(event))
+    transaction.on_commit(_dispatch_soon)
+    return row
+
+
+def _dispatch_soon():
+    from .tasks import dispatch_domain_events
+    dispatch_domain_events.delay()
+
+
+def load(row):
+    return EVENT_TYPES[row.name](**row.payload)
+
+
+def claim(batch_size=BATCH_SIZE):
+    """Leases up to `batch_size` due events to this worker; concurrent dispatchers skip each other's rows."""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            DomainEvent.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', available_at__lte=now)
+            .order_by('available_at', 'id')[:batch_size]
+        )
+        if rows:
+            DomainEvent.objects.filter(id__in=[row.id for row in rows]).update(
+                available_at=now + LEASE, attempts=F('attempts') + 1
+            )
+    for row in rows:
+        row.attempts += 1
+        row.available_at = now + LEASE
+    return rows
+
+
+def _held(rows, lease):
+    """
+    Locks the rows of `rows` whose lease is still `lease` (until the current
+    transaction ends) and returns them; rows another dispatcher has since
+    claimed, or is working on, are left out.
+    """
+    held = set(
+        DomainEvent.objects.select_for_update(skip_locked=True)
+        .filter(id__in=[row.id for row in rows], status='PENDING', available_at=lease)
+        .values_list('id', flat=True)
+    )
+    return [row for row in rows if row.id in held]
+
+
+def _renew(rows, held, lease):
+    """
+    Extends the lease on those of `rows` whose ids are in `held` and that are
+    still held. Returns (their ids, the new lease).
+    """
+    new_lease = timezone.now() + LEASE
+    with transaction.atomic():
+        rows = _held([row for row in rows if row.id in held], lease)
+        DomainEvent.objects.filter(id__in=[row.id for row in rows]).update(available_at=new_lease)
+    for row in rows:
+        row.available_at = new_lease
+    return {row.id for row in rows}, new_lease
+
+
+def _run(handler, rows, lease):
+    """
+    Calls `handler` for `rows` and records it in their `handled` list, in one
+    transaction that holds the rows' locks. If the batch fails each row is
+    retried alone, so one bad event doesn't hold back the rest. Returns
+    {row id: error}.
+    """
+    name = handler_name(handler)
+    try:
+        with transaction.atomic():
+            held = _held(rows, lease)
+            if held:
+                handler([(row.id, load(row)) for row in held])
+                for row in held:
+                    row.handled = row.handled + [name]
+                DomainEvent.objects.bulk_update(held, ['handled'])
+        return {}
+    except Exception as e:
+        for row in rows:
+            row.handled = [h for h in row.handled if h != name]
+        if len(rows) == 1:
+            logger.exception("Event handler %s failed for event %s", name, rows[0].id)
+            return {rows[0].id: f"{name}: {e}"}
+
+    errors = {}
+    for row in rows:
+        errors.update(_run(handler, [row], lease))
+    return errors
+
+
+def dispatch(batch_size=BATCH_SIZE):
+    """Claims and handles one batch of due events. Returns how many were claimed."""
+    rows = claim(batch_size)
+    lease = rows[0].available_at if rows else None
+    errors = {}
+    by_type = defaultdict(list)
+    for row in rows:
+        if row.name in EVENT_TYPES:
+            by_type[EVENT_TYPES[row.name]].append(row)
+        else:
+            errors[row.id] = f"Unknown event type {row.name}"
+
+    held = {row.id for row in rows}
+    for event_type, group in by_type.items():
+        for handler, size in _handlers[event_type]:
+            name = handler_name(handler)
+            pending = [row for row in group if name not in row.handled]
+            step = size or len(pending) or 1
+            for start in range(0, len(pending), step):
+                # A slow handler (the LLM ones run one event at a time) must
+                # not let the rest of the batch expire behind it
+                held, lease = _renew(rows, held, lease)
+                chunk = [row for row in pending[start:start + step] if row.id in held]
+                for row_id, error in _run(handler, chunk, lease).items():
+                    errors.setdefault(row_id, error)
+
+    if not rows:
+        return 0
+    now = timezone.now()
+    with transaction.atomic():
+        finished = _held(rows, lease)
+        for row in finished:
+            if row.id not in errors:
+                row.status, row.error, row.processed_at = 'DONE', '', now
+            elif row.attempts >= MAX_ATTEMPTS or row.name not in EVENT_TYPES:
+                row.status, row.error, row.processed_at = 'FAILED', errors[row.id], now
+            else:
+                row.error = errors[row.id]
+                row.available_at = now + RETRY_DELAY * 2 ** (row.attempts - 1)
+        DomainEvent.objects.bulk_update(finished, ['status', 'error', 'processed_at', 'available_at'])
+    return len(rows)
@@ -1,6 +1,8 @@
 from django import forms
 from django.forms import ModelForm
-from .models import JobAdvert, JobApplication, UserProfile, Experience, Education, Skill
+from django.urls import reverse_lazy
+from django.utils.text import format_lazy
+from .models import JobAdvert, JobApplication, UserProfile, Experience, Education, Skill, NotificationPreference
 # ✅ Import Message from Organization app for the chat form
 from organization.models import Message
 
@@ -85,7 +87,19 @@ class SkillForm(forms.ModelForm):
         model = Skill
         fields = ['name']
         widgets = {
-            'name': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Python, Django, etc.'}),
+            'name': forms.TextInput(attrs={
+                'class': 'form-control', 'placeholder': 'Python, Django, etc.',
+                'data-autocomplete-url': format_lazy('{}?scope=skills', reverse_lazy('autocomplete')),
+            }),
+        }
+
+class NotificationPreferenceForm(forms.ModelForm):
+    class Meta:
+        model = NotificationPreference
+        fields = ['email_mode', 'digest_window']
+        widgets = {
+            'email_mode': forms.Select(attrs={'class': 'form-control'}),
+            'digest_window': forms.Select(attrs={'class': 'form-control'}),
         }
 
 # ===========================
@@ -97,7 +111,8 @@ class TaskSubmissionForm(forms.ModelForm):
         fields = ['task_submission']
         widgets = {
             'task_submission': forms.FileInput(attrs={
-                'class': 'block w-full text-sm text-gray-500 file:mr-4 file:py-2 file:px-4 file:rounded-full file:border-0 file:text-sm file:font-semibold file:bg-blue-50 file:text-blue-700 hover:file:bg-blue-100'
+                'class': 'block w-full text-sm text-gray-500 file:mr-4 file:py-2 file:px-4 file:rounded-full file:border-0 file:text-sm file:font-semibold file:bg-blue-50 file:text-blue-700 hover:file:bg-blue-100',
+                'data-chunked-upload': reverse_lazy('upload_start'),
             })
         }
 
@@ -112,6 +127,7 @@ class CandidateMessageForm(forms.ModelForm):
                 'rows': '3'
             }),
             'attachment': forms.FileInput(attrs={  # ✅ Added widget
-                'class': 'mt-2 block w-full text-sm text-gray-500 file:mr-4 file:py-2 file:px-4 file:rounded-full file:border-0 file:text-sm file:font-semibold file:bg-blue-50 file:text-blue-700 hover:file:bg-blue-100'
+                'class': 'mt-2 block w-full text-sm text-gray-500 file:mr-4 file:py-2 file:px-4 file:rounded-full file:border-0 file:text-sm file:font-semibold file:bg-blue-50 file:text-blue-700 hover:file:bg-blue-100',
+                'data-chunked-upload': reverse_lazy('upload_start'),
             })
         }
\ No newline at end of file
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+
+# Public job data (search results, job pages, the home page list) is cached
+# under keys that embed a version number. Saving or deleting a Job bumps the
+# relevant versions, so old entries simply stop being addressed and expire on
+# their own - nothing stale is ever served and nothing has to be deleted.
+# That only holds when every process reads the same versions, so this needs
+# the shared cache from settings.CACHES (see checks.py); the hit-rate counters
+# below are likewise only meaningful there.
+
+RESULT_TIMEOUT = 15 * 60
+METRICS_TIMEOUT = 7 * 24 * 60 * 60
+METRIC_NAMESPACES = ("job-search", "job-facets", "job-detail", "home-jobs")
+
+ALL_JOBS = "jobs"
+
+
+def _version_key(scope, pk=None):
+    return f"cache-version:{scope}" if pk is None else f"cache-version:{scope}:{pk}"
+
+
+def get_version(scope, pk=None):
+    """
+    Current version for a scope ("jobs", or "org"/"job" with a pk).
+    Versions start from the clock so a version key that was evicted can never
+    restart at a number that older cached entries still use.
+    """
+    key = _version_key(scope, pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(scope, pk=None):
+    key = _version_key(scope, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_job(job_id, organization_id):
+    """Called after a Job is saved or deleted."""
+    bump_version(ALL_JOBS)
+    bump_version("job", job_id)
+    bump_version("org", organization_id)
+
+
+def invalidate_organization(organization_id, job_ids=()):
+    """
+    Called after an Organization changes; its name is searchable and shown on
+    every job page, so each of its cached job pages is invalidated too.
+    """
+    bump_version(ALL_JOBS)
+    bump_version("org", organization_id)
+    for job_id in job_ids:
+        bump_version("job", job_id)
+
+
+# =================================================
+# READ-THROUGH CACHE
+# =================================================
+def versioned_key(namespace, versions, params=None):
+    digest = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{namespace}:{'.'.join(str(v) for v in versions)}:{digest}"
+
+
+def get_or_compute(namespace, versions, params, compute, timeout=RESULT_TIMEOUT):
+    key = versioned_key(namespace, versions, params)
+    sentinel = object()
+    value = cache.get(key, sentinel)
+    if value is not sentinel:
+        _record(namespace, "hits")
+        return value
+
+    _record(namespace, "misses")
+    value = compute()
+    cache.set(key, value, timeout)
+    return value
+
+
+# =================================================
+# HIT-RATE METRICS
+# =================================================
+def _record(namespace, outcome):
+    key = f"cache-metrics:{namespace}:{outcome}"
+    if not cache.add(key, 1, timeout=METRICS_TIMEOUT):
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def hit_rates():
+    """{namespace: {"hits": n, "misses": n, "hit_rate": 0-1}} since the counters were last reset."""
+    keys = [f"cache-metrics:{ns}:{outcome}" for ns in METRIC_NAMESPACES for outcome in ("hits", "misses")]
+    counters = cache.get_many(keys)
+    stats = {}
+    for ns in METRIC_NAMESPACES:
+        hits = counters.get(f"cache-metrics:{ns}:hits", 0)
+        misses = counters.get(f"cache-metrics:{ns}:misses", 0)
+        total = hits + misses
+        stats[ns] = {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 4) if total else None}
+    return stats
+
+
+def reset_metrics():
+    cache.delete_many([f"cache-metrics:{ns}:{outcome}" for ns in METRIC_NAMESPACES for outcome in ("hits", "misses")])
@@ -0,0 +1,50 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from organization.models import Message
+
+from .candidate_search import SEARCH_CONFIG
+
+# Full-text search over a user's own messages, backed by the trigger-maintained
+# Message.search_vector (GIN msg_search_vector_idx). Snippets come from
+# ts_headline with private-use marker characters, so the message text can be
+# HTML-escaped before the markers become <mark> tags.
+
+RESULTS_PER_PAGE = 20
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_STOP = "\ue001"
+
+
+def search_messages(user, text, peer_id=None, date_from=None, date_to=None):
+    """
+    Messages `user` sent or received that match `text` (web-style syntax as in
+    candidate search), best match first, with `search_rank` and a `headline`
+    snippet annotated.
+    """
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+    messages = Message.objects.involving(user).filter(search_vector=query)
+    if peer_id:
+        messages = messages.filter(Q(sender_id=peer_id) | Q(receiver_id=peer_id))
+    if date_from:
+        messages = messages.filter(timestamp__date__gte=date_from)
+    if date_to:
+        messages = messages.filter(timestamp__date__lte=date_to)
+    return messages.select_related('sender', 'receiver').annotate(
+        # ts_rank is float4; as double precision the keyset cursor value
+        # survives the JSON round trip and compares equal to its own row
+        search_rank=Cast(SearchRank(F('search_vector'), query), FloatField()),
+        headline=SearchHeadline(
+            'content', query, config=SEARCH_CONFIG,
+            start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+            max_words=30, min_words=12, max_fragments=2, fragment_delimiter=" … ",
+        ),
+    ).order_by('-search_rank', '-id')
+
+
+def highlight(headline):
+    """Escaped snippet with the matched words wrapped in <mark>."""
+    html = escape(headline or "").replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+    return mark_safe(html)
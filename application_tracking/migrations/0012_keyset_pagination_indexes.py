@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-19 10:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0011_jobapplication_ai_score'),
+        ('organization', '0007_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='jobapp_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', '-created_at', '-id'], name='jobapp_job_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job_advert', '-created_at', '-id'], name='jobapp_advert_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notif_user_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2 on 2026-10-19 10:29
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+def index_existing_candidates(apps, schema_editor):
+    # Name/email only; CV text is picked up by tasks.reindex_candidates
+    JobApplication = apps.get_model('application_tracking', 'JobApplication')
+    JobApplication.objects.update(
+        search_vector=SearchVector('name', weight='A', config='english')
+        + SearchVector('email', weight='A', config='english')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0012_keyset_pagination_indexes'),
+        ('organization', '0007_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='cv_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='cv_text_source',
+            field=models.CharField(blank=True, default='', editable=False, help_text='CV file name cv_text was extracted from', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='parsed_skills',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='jobapp_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='jobapp_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='jobapp_email_trgm_idx'),
+        ),
+        migrations.RunPython(index_existing_candidates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-19 10:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0013_candidate_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('key', models.CharField(help_text='normalize_skill(name)', max_length=50, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SkillSynonym',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(help_text="Normalized alias, e.g. 'js'", max_length=50, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='canonical',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='user_skills', to='application_tracking.canonicalskill'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['canonical', 'user'], name='skill_canonical_user_idx'),
+        ),
+        migrations.AddField(
+            model_name='skillsynonym',
+            name='canonical',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='synonyms', to='application_tracking.canonicalskill'),
+        ),
+    ]
@@ -0,0 +1,96 @@
+from collections import Counter, defaultdict
+
+from django.db import migrations
+
+# Canonical name -> aliases users commonly type instead
+SEED_SKILLS = {
+    "JavaScript": ["js", "ecmascript", "es6", "vanilla js"],
+    "TypeScript": ["ts"],
+    "Python": ["py", "python3", "python 3"],
+    "Java": ["core java", "java se"],
+    "C++": ["cpp", "c plus plus"],
+    "C#": ["csharp", "c sharp"],
+    "Go": ["golang"],
+    "Ruby on Rails": ["rails", "ror"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "React": ["reactjs", "react.js", "react js"],
+    "Vue.js": ["vue", "vuejs", "vue js"],
+    "Angular": ["angularjs", "angular.js"],
+    "Django": ["django rest framework", "drf"],
+    "Flask": [],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "SQL": [],
+    "PostgreSQL": ["postgres", "psql", "postgre"],
+    "MySQL": [],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Amazon Web Services": ["aws"],
+    "Google Cloud Platform": ["gcp", "google cloud"],
+    "Microsoft Azure": ["azure"],
+    "Git": ["github", "gitlab"],
+    "CI/CD": ["cicd", "ci cd", "continuous integration"],
+    "REST APIs": ["rest", "rest api", "restful", "restful apis"],
+    "GraphQL": [],
+    "Machine Learning": ["ml"],
+    "Artificial Intelligence": ["ai"],
+    "Natural Language Processing": ["nlp"],
+    "Data Analysis": ["data analytics"],
+}
+
+
+def normalize(name):
+    # Frozen copy of models.normalize_skill
+    return " ".join((name or "").casefold().split()).strip(" ,;")
+
+
+def seed_and_link(apps, schema_editor):
+    CanonicalSkill = apps.get_model('application_tracking', 'CanonicalSkill')
+    SkillSynonym = apps.get_model('application_tracking', 'SkillSynonym')
+    Skill = apps.get_model('application_tracking', 'Skill')
+
+    by_key = {}
+    for name, aliases in SEED_SKILLS.items():
+        canonical = CanonicalSkill.objects.create(name=name, key=normalize(name))
+        by_key[canonical.key] = canonical
+        for alias in aliases:
+            SkillSynonym.objects.create(alias=normalize(alias), canonical=canonical)
+    for synonym in SkillSynonym.objects.select_related('canonical'):
+        by_key[synonym.alias] = synonym.canonical
+
+    # Existing free-text skills: group spellings by key, name new canonicals
+    # after the most common spelling
+    spellings = defaultdict(Counter)
+    skill_ids = defaultdict(list)
+    for skill_id, name in Skill.objects.values_list('id', 'name').iterator():
+        key = normalize(name)
+        if key:
+            spellings[key][" ".join(name.split())] += 1
+            skill_ids[key].append(skill_id)
+
+    taken = set(CanonicalSkill.objects.values_list('name', flat=True))
+    for key, names in spellings.items():
+        if key in by_key:
+            continue
+        name = names.most_common(1)[0][0]
+        if name in taken:
+            name = key
+        taken.add(name)
+        by_key[key] = CanonicalSkill.objects.create(name=name, key=key)
+
+    for key, ids in skill_ids.items():
+        for start in range(0, len(ids), 1000):
+            Skill.objects.filter(id__in=ids[start:start + 1000]).update(canonical=by_key[key])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0014_canonical_skills'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_and_link, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-19 10:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0018_notification_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationPreference',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email_mode', models.CharField(choices=[('IMMEDIATE', 'Email me right away'), ('DIGEST', 'One summary email per period'), ('OFF', 'No emails')], default='IMMEDIATE', max_length=10)),
+                ('digest_window', models.CharField(choices=[('HOURLY', 'Hourly'), ('DAILY', 'Daily')], default='DAILY', max_length=10)),
+                ('last_digest_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notification_preference', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-19 10:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0019_notification_preference'),
+        ('organization', '0008_unread_message_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('computed_at', models.DateTimeField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='organization.job')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_recommendations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['rank'],
+                'indexes': [models.Index(fields=['user', 'rank'], name='jobrec_user_rank_idx'), models.Index(fields=['computed_at'], name='jobrec_computed_idx')],
+            },
+        ),
+    ]
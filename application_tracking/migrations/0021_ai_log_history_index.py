@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0020_job_recommendations'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aiinterviewlog',
+            index=models.Index(fields=['session', '-timestamp', '-id'], name='ailog_session_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 11:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0022_chunked_uploads'),
+        ('organization', '0011_message_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Broadcast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application_status', models.CharField(blank=True, choices=[('APPLIED', 'APPLIED'), ('REJECTED', 'REJECTED'), ('INTERVIEW', 'INTERVIEW')], max_length=20)),
+                ('search_query', models.CharField(blank=True, max_length=200)),
+                ('content', models.TextField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('sent_count', models.PositiveIntegerField(default=0)),
+                ('last_user_id', models.UUIDField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='broadcasts', to='organization.job')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts', to='organization.organization')),
+                ('sender', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2 on 2026-10-19 11:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Rebuilds ActivityLog as a table range-partitioned by month on "timestamp".
+# Postgres requires the partition key in the primary key, so it becomes
+# (id, timestamp); ids still come from one sequence and stay unique. Monthly
+# partitions cover the existing rows up to PARTITIONS_AHEAD months from now;
+# later ones are created (and expired ones dropped) by
+# tasks.maintain_activity_partitions.
+PARTITIONS_AHEAD = 3
+
+PARTITION_TABLE = f"""
+ALTER TABLE application_tracking_activitylog RENAME TO application_tracking_activitylog_old;
+
+CREATE TABLE application_tracking_activitylog (
+    LIKE application_tracking_activitylog_old INCLUDING DEFAULTS
+) PARTITION BY RANGE ("timestamp");
+
+CREATE SEQUENCE application_tracking_activitylog_part_id_seq OWNED BY application_tracking_activitylog.id;
+SELECT setval('application_tracking_activitylog_part_id_seq',
+              COALESCE((SELECT max(id) FROM application_tracking_activitylog_old), 0) + 1, false);
+ALTER TABLE application_tracking_activitylog
+    ALTER COLUMN id SET DEFAULT nextval('application_tracking_activitylog_part_id_seq'),
+    ADD PRIMARY KEY (id, "timestamp"),
+    ADD CONSTRAINT application_tracking_activitylog_actor_id_fk
+        FOREIGN KEY (actor_id) REFERENCES accounts_user (id) DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX activitylog_time_idx ON application_tracking_activitylog ("timestamp" DESC);
+CREATE INDEX activitylog_actor_time_idx ON application_tracking_activitylog (actor_id, "timestamp" DESC);
+CREATE INDEX activitylog_action_time_idx ON application_tracking_activitylog (action_type, "timestamp" DESC);
+
+DO $$
+DECLARE
+    month date := date_trunc('month', COALESCE((SELECT min("timestamp") FROM application_tracking_activitylog_old), now()));
+BEGIN
+    WHILE month <= date_trunc('month', now()) + interval '{PARTITIONS_AHEAD} months' LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF application_tracking_activitylog FOR VALUES FROM (%L) TO (%L)',
+            'application_tracking_activitylog_p' || to_char(month, 'YYYYMM'), month, (month + interval '1 month')::date
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END
+$$;
+
+INSERT INTO application_tracking_activitylog SELECT * FROM application_tracking_activitylog_old;
+DROP TABLE application_tracking_activitylog_old;
+"""
+
+UNPARTITION_TABLE = """
+ALTER TABLE application_tracking_activitylog RENAME TO application_tracking_activitylog_partitioned;
+ALTER SEQUENCE application_tracking_activitylog_part_id_seq OWNED BY NONE;
+
+CREATE TABLE application_tracking_activitylog (
+    LIKE application_tracking_activitylog_partitioned INCLUDING DEFAULTS,
+    PRIMARY KEY (id),
+    CONSTRAINT application_tracking_activitylog_actor_id_fk
+        FOREIGN KEY (actor_id) REFERENCES accounts_user (id) DEFERRABLE INITIALLY DEFERRED
+);
+ALTER SEQUENCE application_tracking_activitylog_part_id_seq OWNED BY application_tracking_activitylog.id;
+CREATE INDEX application_tracking_activitylog_actor_id_idx ON application_tracking_activitylog (actor_id);
+
+INSERT INTO application_tracking_activitylog SELECT * FROM application_tracking_activitylog_partitioned;
+DROP TABLE application_tracking_activitylog_partitioned;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0024_activity_log_event_time'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('action_type', models.CharField(max_length=50)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('actor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['-day', 'action_type'], name='activity_rollup_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'actor', 'action_type'), name='activity_rollup_uniq')],
+            },
+        ),
+        migrations.RunSQL(PARTITION_TABLE, UNPARTITION_TABLE),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0026_domainevent'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='broadcast',
+            name='application_status',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+    ]
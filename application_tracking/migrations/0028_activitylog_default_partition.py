@@ -0,0 +1,25 @@
+from django.db import migrations
+
+# Catch-all partition for ActivityLog rows whose month has no partition yet,
+# so audit inserts never fail if tasks.maintain_activity_partitions stops
+# running. ensure_partitions() moves such rows into their month's partition.
+
+ADD_DEFAULT = """
+CREATE TABLE IF NOT EXISTS application_tracking_activitylog_default
+    PARTITION OF application_tracking_activitylog DEFAULT;
+"""
+
+DROP_DEFAULT = """
+DROP TABLE IF EXISTS application_tracking_activitylog_default;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0027_broadcast_status_no_choices'),
+    ]
+
+    operations = [
+        migrations.RunSQL(ADD_DEFAULT, DROP_DEFAULT),
+    ]
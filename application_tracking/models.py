@@ -1,13 +1,17 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.utils import timezone
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import Q
 from django.conf import settings
 
 from accounts.models import User
 from common.models import BaseModel
 # ✅ Import Job from Organization app (Crucial for linking)
-from organization.models import Job
+from organization.models import Job, Organization
 
 from .enums import (ApplicationStatus, EmploymentType, ExperienceLevel,
                     LocationTypeChoice)
@@ -97,6 +101,25 @@ class JobApplication(BaseModel):
     # ✅ 5. AI Score (For Dashboard)
     ai_score = models.IntegerField(default=0, help_text="Overall AI Score")
 
+    # ✅ 6. Candidate Search (filled in by tasks.index_candidate)
+    cv_text = models.TextField(blank=True, default='', editable=False)
+    cv_text_source = models.CharField(max_length=255, blank=True, default='', editable=False,
+                                      help_text="CV file name cv_text was extracted from")
+    parsed_skills = models.TextField(blank=True, default='', editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination: (created_at, id) per owner
+            models.Index(fields=['user', '-created_at', '-id'], name='jobapp_user_recent_idx'),
+            models.Index(fields=['job', '-created_at', '-id'], name='jobapp_job_recent_idx'),
+            models.Index(fields=['job_advert', '-created_at', '-id'], name='jobapp_advert_recent_idx'),
+            # Candidate search: full-text over name/email/skills/CV, trigram for partial name/email
+            GinIndex(fields=['search_vector'], name='jobapp_search_vector_idx'),
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='jobapp_name_trgm_idx'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='jobapp_email_trgm_idx'),
+        ]
+
     def get_user_account(self):
         """Helper to get the User object for chat"""
         if self.user:
@@ -145,13 +168,69 @@ class Education(BaseModel):
         return f"{self.degree} at {self.institution}"
 
 
+def normalize_skill(name):
+    """Lookup key for a skill: case-folded, whitespace collapsed, e.g. " Node  JS " -> "node js"."""
+    return " ".join((name or "").casefold().split()).strip(" ,;")
+
+
+class CanonicalSkillQuerySet(models.QuerySet):
+    def lookup(self, names):
+        """{normalized name: canonical id} for every name that is a known skill or synonym."""
+        keys = {normalize_skill(name) for name in names} - {""}
+        if not keys:
+            return {}
+        found = dict(self.filter(key__in=keys).values_list('key', 'id'))
+        found.update(SkillSynonym.objects.filter(alias__in=keys - found.keys()).values_list('alias', 'canonical_id'))
+        return found
+
+    def resolve(self, name):
+        """Canonical skill for a free-text name, creating one for skills we haven't seen yet."""
+        key = normalize_skill(name)
+        canonical_id = self.lookup([key]).get(key)
+        if canonical_id:
+            return self.get(id=canonical_id)
+        canonical, _ = self.get_or_create(key=key, defaults={'name': " ".join(name.split())})
+        return canonical
+
+
+class CanonicalSkill(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    key = models.CharField(max_length=50, unique=True, help_text="normalize_skill(name)")
+
+    objects = CanonicalSkillQuerySet.as_manager()
+
+    def __str__(self):
+        return self.name
+
+
+class SkillSynonym(models.Model):
+    alias = models.CharField(max_length=50, unique=True, help_text="Normalized alias, e.g. 'js'")
+    canonical = models.ForeignKey(CanonicalSkill, on_delete=models.CASCADE, related_name='synonyms')
+
+    def __str__(self):
+        return f"{self.alias} -> {self.canonical}"
+
+
 class Skill(BaseModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='user_skills')
     name = models.CharField(max_length=50)
+    canonical = models.ForeignKey(CanonicalSkill, on_delete=models.SET_NULL, null=True, blank=True,
+                                  related_name='user_skills')
+
+    class Meta:
+        indexes = [
+            # Inverted index skill -> users; matching a job is an index-only scan
+            models.Index(fields=['canonical', 'user'], name='skill_canonical_user_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if normalize_skill(self.name):
+            self.canonical = CanonicalSkill.objects.resolve(self.name)
+        super().save(*args, **kwargs)
+
 
 class Notification(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
@@ -160,14 +239,188 @@ class Notification(models.Model):
     link = models.CharField(max_length=255, blank=True, null=True)
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set for system fan-outs so a retried batch can't notify anyone twice
+    dedupe_key = models.CharField(max_length=100, null=True, blank=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='notif_user_recent_idx'),
+            # Unread counts / unread listings per user
+            models.Index(fields=['user', 'is_read', '-created_at'], name='notif_user_read_recent_idx'),
+            # Retention sweep: oldest read notifications first
+            models.Index(fields=['created_at'], condition=Q(is_read=True), name='notif_read_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'dedupe_key'], condition=Q(dedupe_key__isnull=False),
+                                    name='notif_user_dedupe_uniq'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.user.email}"
 
 
+class NotificationPreference(models.Model):
+    """How a user wants notification emails delivered. No row = settings default."""
+    IMMEDIATE = 'IMMEDIATE'
+    DIGEST = 'DIGEST'
+    OFF = 'OFF'
+    EMAIL_MODES = [
+        (IMMEDIATE, 'Email me right away'),
+        (DIGEST, 'One summary email per period'),
+        (OFF, 'No emails'),
+    ]
+    DIGEST_WINDOWS = [
+        ('HOURLY', 'Hourly'),
+        ('DAILY', 'Daily'),
+    ]
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notification_preference')
+    email_mode = models.CharField(max_length=10, choices=EMAIL_MODES, default=IMMEDIATE)
+    digest_window = models.CharField(max_length=10, choices=DIGEST_WINDOWS, default='DAILY')
+    # Digest watermark: notifications created after this go into the next digest
+    last_digest_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user} - {self.email_mode}"
+
+
+class NotificationArchive(models.Model):
+    """
+    Cold storage for read notifications past the retention window (see
+    tasks.archive_read_notifications). Rows keep their original id.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_notifications')
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    link = models.CharField(max_length=255, blank=True, null=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='notif_archive_user_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (archived)"
+
+    # Only read notifications are archived; lets templates treat both alike
+    is_read = True
+
+
+class NotificationFanout(models.Model):
+    """Progress of one "new job matches your skills" fan-out (see tasks.fan_out_job_match)."""
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    job_advert = models.ForeignKey(JobAdvert, on_delete=models.CASCADE, null=True, blank=True, related_name='fanouts')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, null=True, blank=True, related_name='fanouts')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    matched_users = models.PositiveIntegerField(default=0)
+    # Resume point: users are processed in id order, so a retry continues after this one
+    last_user_id = models.UUIDField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Fan-out {self.id} ({self.status}, {self.matched_users} users)"
+
+    @property
+    def posting(self):
+        return self.job or self.job_advert
+
+
+class Broadcast(models.Model):
+    """
+    One recruiter message sent to every applicant matching a candidate-list
+    filter (see tasks.send_broadcast). `content` may use the placeholders in
+    broadcasts.VARIABLES, filled in per recipient.
+    """
+    STATUS_CHOICES = NotificationFanout.STATUS_CHOICES
+
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='broadcasts')
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='broadcasts')
+    # Recipient filter, as on the candidates page; blank means "any"
+    job = models.ForeignKey(Job, on_delete=models.SET_NULL, null=True, blank=True, related_name='broadcasts')
+    # Free text like the candidates filter: the app also uses PENDING, ACCEPTED, INTERVIEWING
+    application_status = models.CharField(max_length=20, blank=True)
+    search_query = models.CharField(max_length=200, blank=True)
+    content = models.TextField()
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    sent_count = models.PositiveIntegerField(default=0)
+    # Resume point: recipients are processed in user id order
+    last_user_id = models.UUIDField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Broadcast {self.id} ({self.status}, {self.sent_count} sent)"
+
+
+class DomainEvent(models.Model):
+    """
+    Outbox row for one events.py event. It is written in the same transaction
+    as the change it describes and handled after commit by
+    tasks.dispatch_domain_events; rows stay PENDING until every handler has
+    succeeded, so each event is delivered at least once.
+    """
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    name = models.CharField(max_length=50)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Handlers that already succeeded; a retry only runs the rest
+    handled = models.JSONField(default=list, blank=True)
+    # Not picked up before this: retry backoff, or the lease of a running dispatcher
+    available_at = models.DateTimeField(default=timezone.now)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['available_at', 'id'], condition=Q(status='PENDING'), name='domainevent_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} {self.id} ({self.status})"
+
+
+class JobRecommendation(models.Model):
+    """Precomputed top-K jobs per candidate, rebuilt by tasks.recompute_recommendations."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='job_recommendations')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='recommendations')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['rank']
+        indexes = [
+            models.Index(fields=['user', 'rank'], name='jobrec_user_rank_idx'),
+            models.Index(fields=['computed_at'], name='jobrec_computed_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} -> {self.job} ({self.score:.2f})"
+
+
 class ActivityLog(models.Model):
     ACTION_TYPES = (
         ('LOGIN', 'Login'),
@@ -183,16 +436,42 @@ class ActivityLog(models.Model):
     action_type = models.CharField(max_length=50, choices=ACTION_TYPES)
     description = models.TextField()
     target_object = models.CharField(max_length=255, blank=True, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # When it happened, not when the batch was written (see activity.py)
+    timestamp = models.DateTimeField(default=timezone.now)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
 
     class Meta:
         ordering = ['-timestamp']
+        # The table is range-partitioned by month on timestamp (migration
+        # 0025, activity_partitions.py); its primary key is (id, timestamp)
 
     def __str__(self):
         return f"{self.actor} - {self.action_type} - {self.timestamp}"
 
 
+class ActivityDailyRollup(models.Model):
+    """
+    ActivityLog counts per actor, action and day for dashboards; rebuilt by
+    tasks.rollup_activity and kept after the raw partitions are dropped.
+    """
+    day = models.DateField()
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='activity_rollups')
+    action_type = models.CharField(max_length=50)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'actor', 'action_type'], name='activity_rollup_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['-day', 'action_type'], name='activity_rollup_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.actor} {self.action_type}: {self.count}"
+
+
 # ==========================================================
 #  ✅ AI INTERVIEW SYSTEM MODELS
 # ==========================================================
@@ -242,6 +521,10 @@ class AIInterviewLog(models.Model):
 
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            # Transcript pages, newest first, keyset on (timestamp, id)
+            models.Index(fields=['session', '-timestamp', '-id'], name='ailog_session_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.role}: {self.content[:50]}..."
@@ -281,4 +564,48 @@ class CandidateTask(models.Model):
         ordering = ['created_at']
 
     def __str__(self):
-        return f"{self.stage} Task for {self.application.name}"
\ No newline at end of file
+        return f"{self.stage} Task for {self.application.name}"
+
+
+# ==========================================================
+#  FILE UPLOADS (chunked, content-addressed)
+# ==========================================================
+def stored_file_path(instance, filename):
+    return f"blobs/{instance.sha256[:2]}/{instance.sha256}/{filename}"
+
+
+class StoredFile(BaseModel):
+    """
+    One stored copy per distinct content. Attachment fields
+    (Message.attachment, JobApplication.task_submission,
+    CandidateTask.response_file) point at `file.name`, so any number of rows
+    can share it.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to=stored_file_path, max_length=255)
+    size = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.file.name} ({self.size} bytes)"
+
+
+class UploadSession(BaseModel):
+    """A resumable upload: chunks are appended at `received` until `size` is reached."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    stored_file = models.ForeignKey(StoredFile, on_delete=models.SET_NULL, null=True, blank=True, related_name='uploads')
+
+    class Meta:
+        indexes = [
+            # Stale session sweep
+            models.Index(fields=['created_at'], name='upload_created_idx'),
+        ]
+
+    @property
+    def is_complete(self):
+        return self.stored_file_id is not None
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
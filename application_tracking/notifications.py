@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+from django.urls import reverse
+
+from common.tasks import EMAIL_FROM, send_email
+
+from .models import Notification, NotificationPreference
+
+# Every user-facing status change goes through notify(): the in-app
+# notification is always created, the email depends on the user's
+# NotificationPreference. DIGEST users get nothing here; the periodic
+# send_notification_digests task mails them one summary per window.
+
+DIGEST_WINDOWS = {
+    'HOURLY': timedelta(hours=1),
+    'DAILY': timedelta(days=1),
+}
+DIGEST_TEMPLATE = "emails/notification_digest.html"
+
+
+def email_mode(user):
+    preference = NotificationPreference.objects.filter(user=user).values_list('email_mode', flat=True).first()
+    return preference or settings.NOTIFICATION_DEFAULT_EMAIL_MODE
+
+
+def notify(user, title, message, link=None, email=None, dedupe_key=None):
+    """
+    Creates an in-app notification for `user` and, in IMMEDIATE mode, sends
+    `email` right away. `email` is (subject, html_template, context) and goes
+    to the user's address. With `dedupe_key`, a second call for the same user
+    and key returns the existing notification and sends nothing. Returns the
+    Notification.
+    """
+    if dedupe_key:
+        notification, created = Notification.objects.get_or_create(
+            user=user, dedupe_key=dedupe_key, defaults={'title': title, 'message': message, 'link': link},
+        )
+        if not created:
+            return notification
+    else:
+        notification = Notification.objects.create(user=user, title=title, message=message, link=link)
+    if email and user.email and email_mode(user) == NotificationPreference.IMMEDIATE:
+        subject, html_template, context = email
+        send_email.delay(subject, [user.email], html_template, context)
+    return notification
+
+
+# =================================================
+# DIGESTS
+# =================================================
+def digest_since(preference, now):
+    """Start of the window a digest covers: the last digest, or one window back."""
+    return preference.last_digest_at or now - DIGEST_WINDOWS[preference.digest_window]
+
+
+def is_digest_due(preference, now):
+    if preference.last_digest_at is None:
+        return True
+    return now - preference.last_digest_at >= DIGEST_WINDOWS[preference.digest_window]
+
+
+def absolute_link(link):
+    if not link or link.startswith(('http://', 'https://')):
+        return link
+    return settings.SITE_URL.rstrip('/') + link
+
+
+def build_digest(user, notifications):
+    """One EmailMultiAlternatives summarising `notifications` for `user`."""
+    items = [
+        {"title": n.title, "message": n.message, "link": absolute_link(n.link), "created_at": n.created_at}
+        for n in notifications
+    ]
+    context = {
+        "email": user.email,
+        "notifications": items,
+        "notifications_url": absolute_link(reverse('notifications')),
+    }
+    count = len(items)
+    subject = f"You have {count} new notification{'' if count == 1 else 's'}"
+    text = "\n\n".join(
+        f"{item['title']}\n{item['message']}" + (f"\n{item['link']}" if item['link'] else "")
+        for item in items
+    )
+    msg = EmailMultiAlternatives(subject=subject, body=text, from_email=EMAIL_FROM, to=[user.email])
+    msg.attach_alternative(get_template(DIGEST_TEMPLATE).render(context), "text/html")
+    return msg
+
+
+def send_batch(messages):
+    """Sends `messages` over a single SMTP connection. Returns how many were accepted."""
+    connection = get_connection(fail_silently=False)
+    connection.open()
+    try:
+        return connection.send_messages(messages) or 0
+    finally:
+        connection.close()
@@ -0,0 +1,73 @@
+from common import pubsub
+
+# Events pushed to a user's browser tabs over the notification stream
+# (stream_views.notification_stream). Every payload carries a "type"; those
+# with an "id" are Notification rows and double as the Last-Event-ID cursor.
+
+
+def user_channel(user_id):
+    return f"user:{user_id}"
+
+
+def notification_payload(notification):
+    return {
+        "type": "notification",
+        "id": notification.id,
+        "title": notification.title,
+        "message": notification.message,
+        "link": notification.link or "",
+        "created_at": notification.created_at.isoformat() if notification.created_at else None,
+    }
+
+
+def publish_notification(notification):
+    pubsub.publish(user_channel(notification.user_id), notification_payload(notification))
+
+
+def publish_notifications(notifications):
+    """publish_notification() for a batch (fan-outs), in one pub/sub round trip."""
+    pubsub.publish_many([(user_channel(n.user_id), notification_payload(n)) for n in notifications])
+
+
+def publish_unread(user_id, counts):
+    """`counts` is a partial {"notifications": n} / {"messages": n} update."""
+    pubsub.publish(user_channel(user_id), {"type": "unread", **counts})
+
+
+def publish_unread_many(kind, counts):
+    """{user id: n} for one counter kind, in one pub/sub round trip."""
+    pubsub.publish_many([(user_channel(user_id), {"type": "unread", kind: n}) for user_id, n in counts.items()])
+
+
+# Chat: both participants of a conversation subscribe to one channel
+# (see chat_socket).
+def chat_channel(user_a, user_b):
+    first, second = sorted([str(user_a), str(user_b)])
+    return f"chat:{first}:{second}"
+
+
+def message_payload(message):
+    return {
+        "type": "message",
+        "id": message.id,
+        "sender_id": str(message.sender_id),
+        "receiver_id": str(message.receiver_id),
+        "content": message.content or "",
+        "attachment_url": message.attachment.url if message.attachment else "",
+        "timestamp": message.timestamp.isoformat() if message.timestamp else None,
+        "is_read": message.is_read,
+    }
+
+
+def publish_chat_message(message):
+    pubsub.publish(chat_channel(message.sender_id, message.receiver_id), message_payload(message))
+
+
+def publish_chat_messages(messages):
+    """publish_chat_message() for a batch (broadcasts), in one pub/sub round trip."""
+    pubsub.publish_many([(chat_channel(m.sender_id, m.receiver_id), message_payload(m)) for m in messages])
+
+
+def publish_read(reader_id, sender_id):
+    """Read receipt: `reader_id` has read everything `sender_id` sent them."""
+    pubsub.publish(chat_channel(reader_id, sender_id), {"type": "read", "reader_id": str(reader_id)})
@@ -0,0 +1,234 @@
+import math
+import re
+import zlib
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+from scipy import sparse
+
+from organization.models import Job
+
+from .candidate_search import parse_skills
+from .models import (CanonicalSkill, Experience, JobApplication, JobRecommendation, Skill, SkillSynonym,
+                     UserProfile, normalize_skill)
+
+# Candidate -> job recommendations. Profiles and active jobs become hashed,
+# TF-IDF weighted sparse vectors; a candidate's scores against every job are
+# one sparse matrix product, done a chunk of candidates at a time so memory
+# stays at chunk_size x jobs. The nightly task stores the top K per
+# candidate and the home page only reads JobRecommendation rows.
+
+N_FEATURES = 2 ** 18
+TOP_K = 20
+MIN_SCORE = 0.05
+CHUNK_SIZE = 2000
+
+# Skills are the strongest signal, then titles, then free text
+SKILL_WEIGHT = 3.0
+TITLE_WEIGHT = 2.0
+TEXT_WEIGHT = 1.0
+
+WORD_RE = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the this to we will with you your".split()
+)
+
+
+# =================================================
+# 1. FEATURES
+# =================================================
+def tokenize(text):
+    return [word for word in WORD_RE.findall((text or "").casefold()) if word not in STOP_WORDS]
+
+
+@lru_cache(maxsize=2 ** 20)
+def feature_index(token, n_features=N_FEATURES):
+    # crc32, not hash(): indexes must agree between processes and runs
+    return zlib.crc32(token.encode()) % n_features
+
+
+def add_text(features, text, weight=TEXT_WEIGHT):
+    for word in tokenize(text):
+        features[word] += weight
+
+
+def add_skills(features, canonical_ids, weight=SKILL_WEIGHT):
+    for canonical_id in canonical_ids:
+        features[f"skill:{canonical_id}"] += weight
+
+
+def vectorize(documents, n_features=N_FEATURES):
+    """CSR matrix (one row per Counter) of sublinear term frequencies."""
+    indptr, indices, data = [0], [], []
+    for features in documents:
+        for token, weight in features.items():
+            indices.append(feature_index(token, n_features))
+            data.append(1.0 + math.log(weight))
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(documents), n_features),
+    )
+    matrix.sum_duplicates()  # hash collisions
+    return matrix
+
+
+def inverse_document_frequency(documents):
+    df = np.bincount(documents.indices, minlength=documents.shape[1])
+    return (np.log((1 + documents.shape[0]) / (1 + df)) + 1).astype(np.float32)
+
+
+def tfidf(matrix, idf):
+    """Scales columns by idf and L2-normalizes rows, so a dot product is a cosine."""
+    weighted = sparse.csr_matrix(matrix.multiply(idf))
+    norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms).astype(np.float32) @ weighted
+
+
+# =================================================
+# 2. DOCUMENTS
+# =================================================
+def skill_taxonomy():
+    """{normalized name or alias: canonical id}, loaded once per run."""
+    taxonomy = dict(CanonicalSkill.objects.values_list('key', 'id'))
+    taxonomy.update(SkillSynonym.objects.values_list('alias', 'canonical_id'))
+    return taxonomy
+
+
+def job_documents(taxonomy):
+    """([job ids], [Counter]) for every active job."""
+    vocabulary = list(CanonicalSkill.objects.values_list('name', flat=True))
+    job_ids, documents = [], []
+    for job_id, title, requirements, description in (Job.objects.active().order_by('id')
+                                                     .values_list('id', 'title', 'requirements', 'description')
+                                                     .iterator()):
+        features = Counter()
+        add_text(features, title, TITLE_WEIGHT)
+        add_text(features, requirements)
+        add_text(features, description)
+        names = re.split(r"[,;\n]", requirements or "") + parse_skills(requirements, vocabulary)
+        add_skills(features, {taxonomy[key] for key in map(normalize_skill, names) if key in taxonomy})
+        job_ids.append(job_id)
+        documents.append(features)
+    return job_ids, documents
+
+
+def candidate_documents(taxonomy):
+    """
+    ([user ids], [Counter]) for every user with something to match on:
+    skills, experience, a profile headline/bio or a CV on an application.
+    """
+    documents = defaultdict(Counter)
+
+    for user_id, canonical_id in Skill.objects.filter(canonical__isnull=False).values_list('user_id', 'canonical_id').iterator():
+        add_skills(documents[user_id], [canonical_id])
+
+    for user_id, job_title, description in Experience.objects.values_list('user_id', 'job_title', 'description').iterator():
+        add_text(documents[user_id], job_title, TITLE_WEIGHT)
+        add_text(documents[user_id], description)
+
+    for user_id, headline, bio in UserProfile.objects.values_list('user_id', 'headline', 'bio').iterator():
+        add_text(documents[user_id], headline, TITLE_WEIGHT)
+        add_text(documents[user_id], bio)
+
+    # Latest CV per user; parsed_skills was extracted when the CV was indexed
+    latest_cvs = (JobApplication.objects.filter(user__isnull=False).exclude(cv_text='')
+                  .order_by('user_id', '-created_at').distinct('user_id')
+                  .values_list('user_id', 'cv_text', 'parsed_skills'))
+    for user_id, cv_text, parsed_skills in latest_cvs.iterator():
+        add_text(documents[user_id], cv_text)
+        names = map(normalize_skill, parsed_skills.split(","))
+        add_skills(documents[user_id], {taxonomy[key] for key in names if key in taxonomy})
+
+    user_ids = [user_id for user_id, features in documents.items() if features]
+    return user_ids, [documents[user_id] for user_id in user_ids]
+
+
+# =================================================
+# 3. TOP-K SCORING
+# =================================================
+def top_k(candidates, jobs, k=TOP_K, exclude=None, chunk_size=CHUNK_SIZE):
+    """
+    Yields (first row, job columns, scores) per chunk of candidate rows; each
+    row of the arrays holds that candidate's best k jobs, best first.
+    `exclude` maps a candidate row to job columns it must not be offered.
+    """
+    exclude = exclude or {}
+    n_jobs = jobs.shape[0]
+    k = min(k, n_jobs)
+    if k == 0:
+        return
+    jobs_t = jobs.T.tocsr()
+
+    for start in range(0, candidates.shape[0], chunk_size):
+        scores = (candidates[start:start + chunk_size] @ jobs_t).toarray()
+        for row in range(scores.shape[0]):
+            columns = exclude.get(start + row)
+            if columns:
+                scores[row, columns] = 0
+
+        if k < n_jobs:
+            best = np.argpartition(scores, n_jobs - k, axis=1)[:, n_jobs - k:]
+        else:
+            best = np.tile(np.arange(n_jobs), (scores.shape[0], 1))
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        yield start, np.take_along_axis(best, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+# =================================================
+# 4. BATCH RECOMPUTE
+# =================================================
+def recompute(k=TOP_K, chunk_size=CHUNK_SIZE):
+    """Rebuilds every candidate's recommendations. Returns (candidates, jobs, rows written)."""
+    computed_at = timezone.now()
+    taxonomy = skill_taxonomy()
+    job_ids, job_docs = job_documents(taxonomy)
+    user_ids, candidate_docs = candidate_documents(taxonomy)
+
+    written = 0
+    if job_ids and user_ids:
+        jobs = vectorize(job_docs)
+        idf = inverse_document_frequency(jobs)
+        jobs = tfidf(jobs, idf)
+        candidates = tfidf(vectorize(candidate_docs), idf)
+        del job_docs, candidate_docs
+
+        # Jobs a candidate already applied to are not recommended back
+        job_column = {job_id: column for column, job_id in enumerate(job_ids)}
+        user_row = {user_id: row for row, user_id in enumerate(user_ids)}
+        exclude = defaultdict(list)
+        for user_id, job_id in (JobApplication.objects.filter(user__isnull=False, job__isnull=False)
+                                .values_list('user_id', 'job_id').iterator()):
+            if user_id in user_row and job_id in job_column:
+                exclude[user_row[user_id]].append(job_column[job_id])
+
+        for start, columns, scores in top_k(candidates, jobs, k, exclude, chunk_size):
+            chunk_users = user_ids[start:start + len(columns)]
+            rows = [
+                JobRecommendation(user_id=user_id, job_id=job_ids[column], score=float(score),
+                                  rank=rank, computed_at=computed_at)
+                for user_id, user_columns, user_scores in zip(chunk_users, columns, scores)
+                for rank, (column, score) in enumerate(zip(user_columns, user_scores), start=1)
+                if score >= MIN_SCORE
+            ]
+            with transaction.atomic():
+                JobRecommendation.objects.filter(user_id__in=chunk_users).delete()
+                JobRecommendation.objects.bulk_create(rows, batch_size=5000)
+            written += len(rows)
+
+    # Candidates who no longer match anything (or no longer exist in the run)
+    JobRecommendation.objects.filter(computed_at__lt=computed_at).delete()
+    return len(user_ids), len(job_ids), written
+
+
+def recommended_jobs(user, limit=6):
+    return [
+        recommendation.job
+        for recommendation in JobRecommendation.objects.filter(user=user, job__is_active=True)
+                                                      .select_related('job__organization')[:limit]
+    ]
@@ -0,0 +1,132 @@
+import hashlib
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from organization.models import Job
+
+from . import job_cache
+from .candidate_search import parse_skills
+from .models import CanonicalSkill, normalize_skill
+from .recommendations import (add_skills, add_text, inverse_document_frequency, job_documents, skill_taxonomy,
+                              tfidf, vectorize)
+from .utils import get_match_score
+
+# "Score my resume against every open job": the resume is vectorized once and
+# ranked against all active jobs with one sparse matrix-vector product; only
+# the best AI_TOP_K go to the LLM (in parallel), instead of one LLM call per
+# job the candidate clicks through.
+
+AI_TOP_K = 5
+MAX_RESULTS = 20
+RESULT_TIMEOUT = 60 * 60
+
+
+# =================================================
+# 1. JOB MATRIX (PER PROCESS, PER JOB VERSION)
+# =================================================
+class JobMatrix:
+    def __init__(self):
+        taxonomy = skill_taxonomy()
+        job_ids, documents = job_documents(taxonomy)
+        self.taxonomy = taxonomy
+        self.vocabulary = list(CanonicalSkill.objects.values_list('name', flat=True))
+        self.skill_names = dict(CanonicalSkill.objects.values_list('id', 'name'))
+        self.job_ids = job_ids
+        self.job_skills = [
+            {int(token.split(":", 1)[1]) for token in features if token.startswith("skill:")}
+            for features in documents
+        ]
+        counts = vectorize(documents)
+        self.idf = inverse_document_frequency(counts)
+        self.matrix = tfidf(counts, self.idf)
+
+    def resume_vector(self, resume_text):
+        names = parse_skills(resume_text, self.vocabulary)
+        skill_ids = {self.taxonomy[key] for key in map(normalize_skill, names) if key in self.taxonomy}
+        features = Counter()
+        add_text(features, resume_text)
+        add_skills(features, skill_ids)
+        return tfidf(vectorize([features]), self.idf), skill_ids
+
+    def rank(self, resume_text, limit=MAX_RESULTS):
+        """[(job id, cosine score, missing skill names)] best first."""
+        if not self.job_ids:
+            return []
+        vector, skill_ids = self.resume_vector(resume_text)
+        scores = (self.matrix @ vector.T).toarray().ravel()
+        limit = min(limit, len(scores))
+        best = np.argpartition(scores, len(scores) - limit)[len(scores) - limit:]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [
+            (self.job_ids[i], float(scores[i]),
+             sorted(self.skill_names[s] for s in self.job_skills[i] - skill_ids if s in self.skill_names))
+            for i in best if scores[i] > 0
+        ]
+
+
+_matrix = None
+_lock = threading.Lock()
+
+
+def get_job_matrix():
+    global _matrix
+    version = job_cache.get_version(job_cache.ALL_JOBS)
+    if _matrix and _matrix[0] == version:
+        return _matrix[1]
+    with _lock:
+        if not (_matrix and _matrix[0] == version):
+            _matrix = (version, JobMatrix())
+        return _matrix[1]
+
+
+# =================================================
+# 2. SCORING
+# =================================================
+def job_prompt_text(job):
+    return f"Job Title: {job.title}\n\nDescription: {job.description}\n\nRequired Skills: {job.requirements}"
+
+
+def _score(resume_text, limit, ai_top_k):
+    ranked = get_job_matrix().rank(resume_text, limit)
+    jobs = Job.objects.select_related('organization').in_bulk([job_id for job_id, _score, _missing in ranked])
+    ranked = [row for row in ranked if row[0] in jobs]
+
+    # The LLM only sees the shortlist; calls are independent, so run them together
+    shortlist = [jobs[job_id] for job_id, _score, _missing in ranked[:ai_top_k]]
+    with ThreadPoolExecutor(max_workers=max(1, len(shortlist))) as pool:
+        ai_results = list(pool.map(lambda job: get_match_score(resume_text, job_prompt_text(job)), shortlist))
+
+    results = []
+    for position, (job_id, score, missing) in enumerate(ranked):
+        job = jobs[job_id]
+        ai = ai_results[position] if position < len(ai_results) else None
+        results.append({
+            "job_id": job.id,
+            "title": job.title,
+            "organization": job.organization.name,
+            "location": job.location,
+            "match_score": round(score * 100),
+            "ai_score": ai["score"] if ai else None,
+            "reason": ai["reason"] if ai else "",
+            "missing_skills": (ai["missing_skills"] if ai and ai["missing_skills"] else missing),
+        })
+
+    # AI-reviewed jobs first by their AI score; the rest keep the local order
+    results[:len(ai_results)] = sorted(results[:len(ai_results)], key=lambda r: -(r["ai_score"] or 0))
+    return results
+
+
+def score_resume(resume_text, limit=MAX_RESULTS, ai_top_k=AI_TOP_K):
+    """
+    Ranks all active jobs for a resume. Cached by resume content until jobs
+    change, so re-submitting the same file costs no LLM calls.
+    """
+    digest = hashlib.sha256(resume_text.encode()).hexdigest()
+    return job_cache.get_or_compute(
+        "resume-match", [job_cache.get_version(job_cache.ALL_JOBS)],
+        {"resume": digest, "limit": limit, "ai_top_k": ai_top_k},
+        lambda: _score(resume_text, limit, ai_top_k), timeout=RESULT_TIMEOUT,
+    )
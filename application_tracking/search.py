@@ -0,0 +1,203 @@
+import uuid
+
+from django.db import connection
+from django.db.models import BooleanField, ExpressionWrapper, F, Q, Value
+
+from common.pagination import KeysetPage, KeysetPaginator
+from organization.models import Job
+
+from . import job_cache
+
+FACET_LIMIT = 10
+RESULTS_PER_PAGE = 9
+
+
+# =================================================
+# 1. QUERY NORMALIZATION
+# =================================================
+def _clean(value):
+    """Trims and collapses whitespace so "  python   dev " == "python dev"."""
+    return " ".join((value or "").split())
+
+
+def normalize_search_params(params):
+    """
+    Reduces the jobs_apply querystring to the fields that affect results.
+    Used both to run the search and to key its caches, so equivalent
+    searches share one cache entry.
+    """
+    org = _clean(params.get("org"))
+    try:
+        org = str(uuid.UUID(org)) if org else ""
+    except ValueError:
+        org = ""
+
+    job_type = _clean(params.get("job_type"))
+    if job_type not in dict(Job.JOB_TYPES):
+        job_type = ""
+
+    return {
+        "keyword": _clean(params.get("keyword")).lower(),
+        "location": _clean(params.get("location")).lower(),
+        "fuzzy": params.get("match") == "fuzzy",
+        "job_type": job_type,
+        "org": org,
+        "loc": _clean(params.get("loc")),
+    }
+
+
+# =================================================
+# 2. SEARCH
+# =================================================
+def search_jobs(search, facets=True):
+    """
+    Returns (queryset, ordering) for a normalized search; with facets=False
+    the job type / organization / location filters are left off.
+    """
+    keyword, location = search["keyword"], search["location"]
+
+    if search["fuzzy"] and (keyword or location):
+        jobs = Job.objects.fuzzy_search(keyword, location)
+        ordering = ('-search_rank', '-posted_at', '-id')
+    else:
+        jobs = Job.objects.search(keyword, location)
+        ordering = ('-posted_at', '-id')
+
+    if facets:
+        jobs = apply_facet_filters(jobs, search)
+    return jobs, ordering
+
+
+def get_job_page(search, cursor, per_page=RESULTS_PER_PAGE):
+    """
+    One page of search results, served from the versioned result cache.
+    Job data is public, so entries are shared by every visitor.
+    """
+    jobs, ordering = search_jobs(search)
+    version = job_cache.get_version(job_cache.ALL_JOBS)
+    paginator = KeysetPaginator(
+        jobs.select_related('organization'), per_page, ordering=ordering,
+        with_count=True, count_version=version
+    )
+
+    def compute():
+        page = paginator.get_page(cursor)
+        return list(page.object_list), page.has_next(), page.has_previous()
+
+    rows, has_next, has_previous = job_cache.get_or_compute(
+        "job-search", [version], {**search, "cursor": cursor or "", "per_page": per_page}, compute
+    )
+    return KeysetPage(rows, paginator, has_next=has_next, has_previous=has_previous)
+
+
+def facet_filters(search):
+    """{facet name: Q} for the facet values selected in a normalized search."""
+    filters = {}
+    if search["job_type"]:
+        filters["job_type"] = Q(job_type=search["job_type"])
+    if search["org"]:
+        filters["organization"] = Q(organization_id=search["org"])
+    if search["loc"]:
+        filters["location"] = Q(location__iexact=search["loc"])
+    return filters
+
+
+def apply_facet_filters(jobs, search):
+    for condition in facet_filters(search).values():
+        jobs = jobs.filter(condition)
+    return jobs
+
+
+# =================================================
+# 3. FACETS
+# =================================================
+def job_facet_counts(jobs, filters=None, limit=FACET_LIMIT):
+    """
+    Counts `jobs` by job type, location and organization in ONE query using
+    GROUPING SETS, instead of one GROUP BY per facet.
+
+    Facets are disjunctive: `filters` ({facet name: Q}, see facet_filters)
+    are the selected facet values, and each facet is counted with every
+    filter except its own, so picking one job type still shows how many
+    jobs the other types would give. `jobs` must not be facet-filtered.
+    """
+    filters = filters or {}
+
+    def matches_filter(name):
+        if name not in filters:
+            return Value(True)
+        return ExpressionWrapper(filters[name], output_field=BooleanField())
+
+    matches = jobs.order_by().values(
+        facet_type=F('job_type'),
+        facet_location=F('location'),
+        facet_org_id=F('organization_id'),
+        facet_org_name=F('organization__name'),
+        in_type=matches_filter("job_type"),
+        in_location=matches_filter("location"),
+        in_org=matches_filter("organization"),
+    )
+    inner_sql, params = matches.query.sql_with_params()
+    # One count per facet, each ignoring that facet's own filter
+    sql = f"""
+        SELECT facet_type, facet_location, facet_org_id, facet_org_name,
+               GROUPING(facet_type), GROUPING(facet_location),
+               COUNT(*) FILTER (WHERE in_location AND in_org),
+               COUNT(*) FILTER (WHERE in_type AND in_org),
+               COUNT(*) FILTER (WHERE in_type AND in_location)
+        FROM ({inner_sql}) AS matches
+        GROUP BY GROUPING SETS ((facet_type), (facet_location), (facet_org_id, facet_org_name))
+    """
+
+    labels = dict(Job.JOB_TYPES)
+    facets = {"job_type": [], "location": [], "organization": []}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for row in cursor.fetchall():
+            job_type, location, org_id, org_name, no_type, no_location, type_count, location_count, org_count = row
+            if not no_type:
+                if type_count:
+                    facets["job_type"].append(
+                        {"value": job_type, "label": labels.get(job_type, job_type), "count": type_count}
+                    )
+            elif not no_location:
+                if location_count:
+                    facets["location"].append({"value": location, "label": location, "count": location_count})
+            elif org_count:
+                facets["organization"].append({"value": str(org_id), "label": org_name, "count": org_count})
+
+    for name in facets:
+        facets[name] = sorted(facets[name], key=lambda f: (-f["count"], f["label"] or ""))[:limit]
+    return facets
+
+
+def get_job_facets(search):
+    """Facet counts for a normalized search, cached per query until jobs change."""
+    version = job_cache.get_version(job_cache.ALL_JOBS)
+    return job_cache.get_or_compute(
+        "job-facets", [version], search,
+        lambda: job_facet_counts(search_jobs(search, facets=False)[0], facet_filters(search)),
+    )
+
+
+def facet_links(request, facets):
+    """
+    Decorates cached facet counts with per-request toggle links: selecting a
+    value filters by it, selecting it again clears the filter.
+    """
+    params_by_facet = {"job_type": "job_type", "location": "loc", "organization": "org"}
+    linked = {}
+    for name, options in facets.items():
+        param = params_by_facet[name]
+        current = request.GET.get(param)
+        linked[name] = []
+        for option in options:
+            query = request.GET.copy()
+            query.pop("cursor", None)
+            selected = current == option["value"]
+            if selected:
+                query.pop(param, None)
+            else:
+                query[param] = option["value"]
+            linked[name].append({**option, "selected": selected, "query": query.urlencode()})
+    return linked
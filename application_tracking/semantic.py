@@ -0,0 +1,337 @@
+import fcntl
+import os
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+from scipy.sparse.linalg import svds
+
+from organization.models import Job
+
+from .models import JobApplication
+from .recommendations import TITLE_WEIGHT, add_text, inverse_document_frequency, tfidf, vectorize
+
+# Semantic ("more like this") matching for jobs and candidates. Text is
+# embedded locally - hashed TF-IDF reduced to DIM dimensions with a truncated
+# SVD (LSA) - so no model is downloaded. Embeddings live in two faiss indexes
+# (jobs, candidates) persisted under SEMANTIC_INDEX_DIR:
+#
+#   rebuild()            refits the SVD and rebuilds both indexes (nightly)
+#   add_job / add_application
+#                        queue a posting or CV that changed (an append to
+#                        a small pending file; cheap enough for a request)
+#   merge_pending()      applies the queued changes, rewriting each index
+#                        once per run rather than once per save (every few
+#                        minutes)
+#   similar_jobs / similar_candidates
+#                        millisecond lookups for the views
+#
+# faiss is imported where it is used, so the app still loads (and the
+# incremental hooks stay no-ops) before the first rebuild.
+
+DIM = 128
+N_FEATURES = 2 ** 16
+FIT_SAMPLE = 20000
+NPROBE = 16
+# IVF needs ~39 training points per list; smaller collections use a flat index
+POINTS_PER_LIST = 39
+RELOAD_SECONDS = 60
+
+JOBS = "jobs"
+CANDIDATES = "candidates"
+
+
+def index_dir():
+    return settings.SEMANTIC_INDEX_DIR
+
+
+# =================================================
+# 1. EMBEDDINGS
+# =================================================
+def job_features(title, requirements, description):
+    features = Counter()
+    add_text(features, title, TITLE_WEIGHT)
+    add_text(features, requirements)
+    add_text(features, description)
+    return features
+
+
+def application_features(cv_text, parsed_skills):
+    features = Counter()
+    add_text(features, parsed_skills, TITLE_WEIGHT)
+    add_text(features, cv_text)
+    return features
+
+
+class Embedder:
+    """Hashed TF-IDF -> SVD projection; fitted once per rebuild and saved with the indexes."""
+
+    def __init__(self, idf, components):
+        self.idf = idf
+        self.components = components  # (dim, N_FEATURES)
+
+    @property
+    def dim(self):
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, documents, dim=DIM):
+        matrix = vectorize(documents, N_FEATURES)
+        idf = inverse_document_frequency(matrix)
+        weighted = tfidf(matrix, idf).astype(np.float64)
+        _u, _s, vt = svds(weighted, k=min(dim, min(weighted.shape) - 1))
+        return cls(idf, vt.astype(np.float32))
+
+    def embed(self, documents):
+        vectors = np.asarray(tfidf(vectorize(documents, N_FEATURES), self.idf) @ self.components.T, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def save(self, path):
+        with open(f"{path}.tmp", "wb") as f:
+            np.savez(f, idf=self.idf, components=self.components)
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["idf"], data["components"])
+
+
+# =================================================
+# 2. IDS
+# =================================================
+# faiss ids are int64: jobs use their integer pk, applications the top 63
+# bits of their UUID. Candidate queries always pass the allowed UUIDs, which
+# also gives the way back from a faiss id to a pk.
+def application_label(application_id):
+    return uuid.UUID(str(application_id)).int >> 65
+
+
+# =================================================
+# 3. STORAGE
+# =================================================
+def _path(name):
+    return os.path.join(index_dir(), name)
+
+
+@contextmanager
+def _write_lock():
+    """Serializes writers across processes (celery workers) on one host."""
+    os.makedirs(index_dir(), exist_ok=True)
+    with open(_path(".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _write_index(index, kind):
+    import faiss
+    tmp = _path(f"{kind}.faiss.tmp")
+    faiss.write_index(index, tmp)
+    os.replace(tmp, _path(f"{kind}.faiss"))  # readers never see a partial file
+
+
+def _read_index(kind):
+    import faiss
+    path = _path(f"{kind}.faiss")
+    if not os.path.exists(path):
+        return None
+    index = faiss.read_index(path)
+    if hasattr(index, "nprobe"):
+        index.nprobe = NPROBE
+    return index
+
+
+def load_embedder():
+    path = _path("embedder.npz")
+    return Embedder.load(path) if os.path.exists(path) else None
+
+
+# Per-process read cache; files are re-checked at most every RELOAD_SECONDS
+_loaded = {}
+
+
+def get_index(kind):
+    now = time.monotonic()
+    cached = _loaded.get(kind)
+    if cached and now - cached["checked"] < RELOAD_SECONDS:
+        return cached["embedder"], cached["index"]
+
+    try:
+        mtime = os.path.getmtime(_path(f"{kind}.faiss"))
+    except OSError:
+        return None, None
+    if not cached or cached["mtime"] != mtime:
+        cached = {"mtime": mtime, "embedder": load_embedder(), "index": _read_index(kind)}
+    cached["checked"] = now
+    _loaded[kind] = cached
+    return cached["embedder"], cached["index"]
+
+
+# =================================================
+# 4. BUILD & INCREMENTAL UPDATES
+# =================================================
+def _job_rows():
+    return Job.objects.active().order_by('id').values_list('id', 'title', 'requirements', 'description')
+
+
+def _application_rows():
+    return JobApplication.objects.exclude(cv_text='').order_by('-created_at').values_list('id', 'cv_text', 'parsed_skills')
+
+
+def new_index(dim, count):
+    import faiss
+    if count >= POINTS_PER_LIST * 2:
+        nlist = min(4096, count // POINTS_PER_LIST)
+        index = faiss.IndexIVFFlat(faiss.IndexFlatIP(dim), dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.nprobe = NPROBE
+        return index
+    return faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+
+def _build(embedder, vectors, labels):
+    index = new_index(embedder.dim, len(labels))
+    if len(labels):
+        if not index.is_trained:
+            index.train(vectors)
+        index.add_with_ids(vectors, np.asarray(labels, dtype=np.int64))
+    return index
+
+
+def rebuild():
+    """Refits the embedding on current jobs and CVs and rebuilds both indexes."""
+    jobs = list(_job_rows().iterator())
+    applications = list(_application_rows().iterator())
+
+    sample = [job_features(*row[1:]) for row in jobs[:FIT_SAMPLE // 2]]
+    sample += [application_features(*row[1:]) for row in applications[:FIT_SAMPLE - len(sample)]]
+    if len(sample) < 3:
+        return 0, 0
+    embedder = Embedder.fit(sample)
+
+    job_vectors = embedder.embed([job_features(*row[1:]) for row in jobs])
+    application_vectors = embedder.embed([application_features(*row[1:]) for row in applications])
+
+    with _write_lock():
+        embedder.save(_path("embedder.npz"))
+        _write_index(_build(embedder, job_vectors, [row[0] for row in jobs]), JOBS)
+        _write_index(_build(embedder, application_vectors, [application_label(row[0]) for row in applications]),
+                     CANDIDATES)
+    return len(jobs), len(applications)
+
+
+def is_built():
+    return os.path.exists(_path("embedder.npz"))
+
+
+def _queue(kind, pk):
+    # One short line in append mode: concurrent writers don't interleave
+    with open(_path(f"{kind}.pending"), "a") as f:
+        f.write(f"{pk}\n")
+    return True
+
+
+def add_job(job_id):
+    if not is_built():
+        return False  # nothing built yet; the next rebuild picks it up
+    return _queue(JOBS, job_id)
+
+
+def add_application(application_id):
+    if not is_built():
+        return False
+    return _queue(CANDIDATES, application_id)
+
+
+def _take_pending(kind):
+    """
+    Moves `kind`'s pending file aside, so new changes start a fresh one, and
+    returns the queued pks (deduplicated). A file left by a merge that
+    crashed is taken first; the fresh file then waits for the next run.
+    """
+    pending, taken = _path(f"{kind}.pending"), _path(f"{kind}.pending.merging")
+    if not os.path.exists(taken):
+        if not os.path.exists(pending):
+            return []
+        os.replace(pending, taken)
+    with open(taken) as f:
+        return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+
+
+def _merge(kind, embedder):
+    pks = _take_pending(kind)
+    if not pks:
+        return 0
+    index = _read_index(kind)
+    if embedder is not None and index is not None:
+        if kind == JOBS:
+            pks = [int(pk) for pk in pks]
+            rows = {row[0]: row for row in _job_rows().filter(id__in=pks)}
+            features = {pk: job_features(*row[1:]) for pk, row in rows.items()}
+            label = int
+        else:
+            rows = _application_rows().filter(id__in=pks)
+            features = {str(row[0]): application_features(*row[1:]) for row in rows}
+            label = application_label
+
+        # Changed rows are re-added; inactive/deleted ones just disappear
+        index.remove_ids(np.asarray([label(pk) for pk in pks], dtype=np.int64))
+        if features:
+            index.add_with_ids(embedder.embed(list(features.values())),
+                               np.asarray([label(pk) for pk in features], dtype=np.int64))
+        _write_index(index, kind)
+    # Nothing built yet: the next rebuild reads everything from the database
+    os.remove(_path(f"{kind}.pending.merging"))
+    return len(pks)
+
+
+def merge_pending():
+    """Applies the changes queued by add_job/add_application. Returns {kind: rows merged}."""
+    with _write_lock():
+        embedder = load_embedder()
+        return {kind: _merge(kind, embedder) for kind in (JOBS, CANDIDATES)}
+
+
+# =================================================
+# 5. QUERIES
+# =================================================
+def _search(index, query, k, labels=None):
+    import faiss
+    params = None
+    if labels is not None:
+        selector = faiss.IDSelectorBatch(np.asarray(labels, dtype=np.int64))
+        params = (faiss.SearchParametersIVF(sel=selector, nprobe=NPROBE) if hasattr(index, "nprobe")
+                  else faiss.SearchParameters(sel=selector))
+    scores, ids = index.search(query, k, params=params)
+    return [(int(i), float(score)) for i, score in zip(ids[0], scores[0]) if i != -1]
+
+
+def similar_jobs(job, k=4):
+    """Ids of the active jobs closest to `job`, most similar first."""
+    embedder, index = get_index(JOBS)
+    if index is None or index.ntotal == 0:
+        return []
+    query = embedder.embed([job_features(job.title, job.requirements, job.description)])
+    return [job_id for job_id, _score in _search(index, query, k + 1) if job_id != job.id][:k]
+
+
+def similar_candidates(application, candidate_ids, k=20):
+    """
+    The applications in `candidate_ids` whose CVs read most like
+    `application`'s, most similar first (the application itself excluded).
+    """
+    embedder, index = get_index(CANDIDATES)
+    if index is None or index.ntotal == 0 or not application.cv_text:
+        return []
+    by_label = {application_label(pk): pk for pk in candidate_ids if pk != application.id}
+    if not by_label:
+        return []
+    query = embedder.embed([application_features(application.cv_text, application.parsed_skills)])
+    return [by_label[label] for label, _score in _search(index, query, k, list(by_label)) if label in by_label]
@@ -1,12 +1,15 @@
 import logging
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.dispatch import receiver
-from django.utils import timezone
 
 # Import your models
 from accounts.models import User
-from .models import ActivityLog, JobAdvert, JobApplication, UserProfile
+from organization.models import Conversation, Job, Message, Organization
+from . import activity, counters, events, job_cache, realtime
+from .models import CanonicalSkill, JobAdvert, JobApplication, Notification, Skill, SkillSynonym, UserProfile
+from .tasks import index_candidate, index_semantic_application, index_semantic_job
 
 # --- Helper Function: Get IP Address ---
 def get_client_ip(request):
@@ -25,15 +28,11 @@ def get_client_ip(request):
 # ==========================================
 # 1. LOG USER LOGIN
 # ==========================================
+# Audit entries are queued and written in batches off the request path
+# (see activity.py)
 @receiver(user_logged_in)
 def log_user_login(sender, request, user, **kwargs):
-    ActivityLog.objects.create(
-        actor=user,
-        action_type='LOGIN',
-        description="User logged in successfully.",
-        ip_address=get_client_ip(request),
-        timestamp=timezone.now()
-    )
+    activity.log('LOGIN', "User logged in successfully.", actor_id=user.pk, ip_address=get_client_ip(request))
 
 # ==========================================
 # 2. LOG USER LOGOUT
@@ -41,13 +40,7 @@ def log_user_login(sender, request, user, **kwargs):
 @receiver(user_logged_out)
 def log_user_logout(sender, request, user, **kwargs):
     if user:
-        ActivityLog.objects.create(
-            actor=user,
-            action_type='LOGOUT',
-            description="User logged out.",
-            ip_address=get_client_ip(request),
-            timestamp=timezone.now()
-        )
+        activity.log('LOGOUT', "User logged out.", actor_id=user.pk, ip_address=get_client_ip(request))
 
 # ==========================================
 # 3. LOG USER REGISTRATION
@@ -55,12 +48,7 @@ def log_user_logout(sender, request, user, **kwargs):
 @receiver(post_save, sender=User)
 def log_user_registration(sender, instance, created, **kwargs):
     if created:
-        ActivityLog.objects.create(
-            actor=instance,
-            action_type='USER_REGISTER',
-            description=f"New account created: {instance.email}",
-            timestamp=timezone.now()
-        )
+        activity.log('USER_REGISTER', f"New account created: {instance.email}", actor_id=instance.pk)
 
 # ==========================================
 # 4. LOG JOB CREATION & UPDATES
@@ -73,71 +61,46 @@ def log_job_advert(sender, instance, created, **kwargs):
     else:
         action = 'JOB_UPDATE'
         desc = f"Job '{instance.title}' was updated."
-    
+
     # Use the job creator as the actor
-    actor = instance.created_by
-    
-    ActivityLog.objects.create(
-        actor=actor,
-        action_type=action,
-        description=desc,
-        target_object=f"Job ID: {instance.id}",
-        timestamp=timezone.now()
-    )
+    activity.log(action, desc, actor_id=instance.created_by_id, target_object=f"Job ID: {instance.id}")
 
 # ==========================================
 # 5. LOG APPLICATIONS & STATUS CHANGES (✅ FIXED)
 # ==========================================
+# Job title, employer and email lookups happen once per batch when the
+# entries are written, not here
 @receiver(post_save, sender=JobApplication)
 def log_application(sender, instance, created, **kwargs):
-    # ✅ FIX: Handle New 'Job' (via Organization) vs Old 'JobAdvert'
-    if instance.job:
-        job_title = instance.job.title
-        
-        # 1. Try to get the Organization Admin (New System)
-        if hasattr(instance.job, 'organization') and instance.job.organization:
-            employer = instance.job.organization.admin_user
-        # 2. Fallback: Try 'created_by' directly (in case model differs)
-        elif hasattr(instance.job, 'created_by'):
-            employer = instance.job.created_by
-        else:
-            employer = None
-            
-    elif instance.job_advert:
-        # Legacy System
-        job_title = instance.job_advert.title
-        employer = instance.job_advert.created_by
-    else:
-        job_title = "Unknown Job"
-        employer = None
+    job = {'job_id': instance.job_id, 'job_advert_id': instance.job_advert_id}
 
     if created:
-        # 1. New Application Log
-        # If the user is logged in (linked), use that. Otherwise try email match.
-        applicant_user = instance.user 
-        if not applicant_user:
-            applicant_user = User.objects.filter(email=instance.email).first()
-        
-        # Only log if we found a user to act as the 'actor'
-        if applicant_user:
-            ActivityLog.objects.create(
-                actor=applicant_user, 
-                action_type='JOB_APPLIED',
-                description=f"{instance.name} applied for {job_title}",
-                target_object=f"App ID: {instance.id}",
-                timestamp=timezone.now()
-            )
-    else:
+        # 1. New Application: logged and confirmed by the ApplicationSubmitted
+        # handlers (event_handlers.py), after commit
+        events.publish(events.ApplicationSubmitted(application_id=instance.id))
+    elif instance.has_changed('status'):
         # 2. Status Change Log (e.g., Pending -> Accepted)
         # We assume the employer is the one changing the status
-        if employer:
-            ActivityLog.objects.create(
-                actor=employer,
-                action_type='APP_STATUS',
-                description=f"Updated application for {instance.name} to '{instance.status}'",
-                target_object=f"Job: {job_title}",
-                timestamp=timezone.now()
-            )
+        activity.log(
+            'APP_STATUS',
+            f"Updated application for {instance.name} to '{instance.status}'",
+            actor_is_employer=True,
+            target_object=f"Job: {activity.JOB_TITLE}",
+            **job
+        )
+
+# ==========================================
+# 5b. KEEP THE CANDIDATE SEARCH INDEX FRESH
+# ==========================================
+SEARCHABLE_FIELDS = {'name', 'email', 'cv'}
+
+
+@receiver(post_save, sender=JobApplication)
+def queue_candidate_indexing(sender, instance, created, **kwargs):
+    if not created and not any(instance.has_changed(field) for field in SEARCHABLE_FIELDS):
+        return
+    application_id = instance.pk
+    transaction.on_commit(lambda: index_candidate.delay(application_id))
 
 # ==========================================
 # 6. LOG PROFILE UPDATES
@@ -145,9 +108,89 @@ def log_application(sender, instance, created, **kwargs):
 @receiver(post_save, sender=UserProfile)
 def log_profile_update(sender, instance, created, **kwargs):
     if not created: # Only log updates, creation happens automatically on register
-        ActivityLog.objects.create(
-            actor=instance.user,
-            action_type='PROFILE_UPDATE',
-            description="User updated their profile details.",
-            timestamp=timezone.now()
-        )
\ No newline at end of file
+        activity.log('PROFILE_UPDATE', "User updated their profile details.", actor_id=instance.user_id)
+
+# ==========================================
+# 7. INVALIDATE CACHED JOB SEARCH / PAGES
+# ==========================================
+# Versions are bumped on commit so a rolled-back save never evicts anything,
+# and a reader can't re-cache the old row between the bump and the commit.
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_cache(sender, instance, created=None, **kwargs):
+    if created is False and not instance.changed_fields():
+        return  # saved without changes
+    job_id, organization_id = instance.id, instance.organization_id
+    transaction.on_commit(lambda: job_cache.invalidate_job(job_id, organization_id))
+
+
+@receiver(post_save, sender=Organization)
+def invalidate_organization_cache(sender, instance, created, **kwargs):
+    if created or not instance.changed_fields():
+        return
+    organization_id = instance.id
+    job_ids = list(instance.jobs.values_list('id', flat=True))
+    transaction.on_commit(lambda: job_cache.invalidate_organization(organization_id, job_ids))
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=CanonicalSkill)
+@receiver(post_delete, sender=CanonicalSkill)
+@receiver(post_save, sender=SkillSynonym)
+@receiver(post_delete, sender=SkillSynonym)
+def invalidate_skill_suggestions(sender, instance, **kwargs):
+    transaction.on_commit(lambda: job_cache.bump_version("skills"))
+
+# ==========================================
+# 8. UNREAD COUNTERS & LIVE PUSH (NOTIFICATIONS & CHAT)
+# ==========================================
+@receiver(post_save, sender=Notification)
+def count_new_notification(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        def publish():
+            counters.adjust(counters.NOTIFICATIONS, instance.user_id, 1)
+            realtime.publish_notification(instance)
+        transaction.on_commit(publish)
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        user_id = instance.user_id
+        transaction.on_commit(lambda: counters.adjust(counters.NOTIFICATIONS, user_id, -1))
+
+
+@receiver(post_save, sender=Message)
+def count_new_message(sender, instance, created, **kwargs):
+    if not created:
+        return
+    # Inbox row: same transaction as the message
+    Conversation.objects.record_message(instance)
+
+    def publish():
+        if not instance.is_read:
+            counters.adjust(counters.MESSAGES, instance.receiver_id, 1)
+        realtime.publish_chat_message(instance)
+    transaction.on_commit(publish)
+
+# ==========================================
+# 9. SEMANTIC (ANN) INDEX
+# ==========================================
+# Applications are embedded by index_candidate once their CV text is extracted
+SEMANTIC_JOB_FIELDS = {'title', 'requirements', 'description', 'is_active'}
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def queue_semantic_job(sender, instance, created=None, **kwargs):
+    if created is False and not instance.changed_fields() & SEMANTIC_JOB_FIELDS:
+        return
+    job_id = instance.id
+    transaction.on_commit(lambda: index_semantic_job.delay(job_id))
+
+
+@receiver(post_delete, sender=JobApplication)
+def queue_semantic_application_removal(sender, instance, **kwargs):
+    application_id = instance.pk
+    transaction.on_commit(lambda: index_semantic_application.delay(application_id))
@@ -0,0 +1,86 @@
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
+
+from common import pubsub
+
+from . import counters, realtime
+from .models import Notification
+
+# Server-sent events: one long-lived GET per open tab, served by the ASGI
+# application (talent_base/asgi.py). Under WSGI each stream would pin a
+# worker thread, so run this behind uvicorn/daphne.
+
+KEEPALIVE_SECONDS = 20
+# Streams are closed periodically; the browser reconnects with Last-Event-ID
+# and the unread snapshot re-warms the cached counters.
+MAX_STREAM_SECONDS = 10 * 60
+REPLAY_LIMIT = 50
+RETRY_MS = 3000
+
+
+def format_event(payload, event=None, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(payload, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _parse_cursor(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _missed_notifications(user_id, cursor):
+    return [
+        realtime.notification_payload(notification)
+        for notification in Notification.objects.filter(user_id=user_id, id__gt=cursor).order_by('id')[:REPLAY_LIMIT]
+    ]
+
+
+async def _event_stream(user_id, cursor):
+    yield f"retry: {RETRY_MS}\n\n"
+    started = time.monotonic()
+
+    # Subscribe before replaying so nothing published in between is lost;
+    # anything seen twice is dropped by the cursor check below
+    async with pubsub.subscribe(realtime.user_channel(user_id)) as subscription:
+        if cursor is not None:
+            for payload in await sync_to_async(_missed_notifications)(user_id, cursor):
+                cursor = payload["id"]
+                yield format_event(payload, "notification", payload["id"])
+
+        snapshot = await sync_to_async(counters.get_unread_counts)(user_id)
+        yield format_event({"type": "unread", **snapshot}, "unread")
+
+        while time.monotonic() - started < MAX_STREAM_SECONDS:
+            message = await subscription.get(timeout=KEEPALIVE_SECONDS)
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+
+            event_id = message.get("id")
+            if event_id is not None:
+                if cursor is not None and event_id <= cursor:
+                    continue
+                cursor = event_id
+            yield format_event(message, message.get("type"), event_id)
+
+
+async def notification_stream(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+
+    cursor = _parse_cursor(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id'))
+    response = StreamingHttpResponse(_event_stream(user.id, cursor), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # let nginx flush events immediately
+    return response
@@ -0,0 +1,378 @@
+import logging
+import re
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from celery import shared_task
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from organization.models import Message
+
+from . import activity_partitions, broadcasts, events, candidate_search, counters, notifications, realtime, recommendations, semantic, uploads
+from .autocomplete import SKILLS, get_index
+from .models import (Broadcast, CanonicalSkill, JobAdvert, JobApplication, Notification, NotificationArchive,
+                     NotificationFanout, NotificationPreference, Skill)
+
+logger = logging.getLogger(__name__)
+
+FANOUT_CHUNK_SIZE = 1000
+
+
+# =================================================
+# 1. CANDIDATE SEARCH INDEX
+# =================================================
+@shared_task
+def index_candidate(application_id):
+    application = JobApplication.objects.filter(pk=application_id).first()
+    if application is None:
+        return
+    candidate_search.index_candidate(application)
+    # The CV text is extracted above; refresh its semantic embedding too
+    semantic.add_application(application.id)
+
+
+@shared_task
+def reindex_candidates(chunk_size=500):
+    """Backfill / rebuild every candidate's search data (e.g. after adding skills)."""
+    for application in JobApplication.objects.order_by().iterator(chunk_size=chunk_size):
+        candidate_search.index_candidate(application)
+
+
+# =================================================
+# 2. NEW JOB -> MATCHING CANDIDATES FAN-OUT
+# =================================================
+def notify_relevant_users(job_instance):
+    """
+    Queues a "new job matches your skills" fan-out for a JobAdvert or an org
+    Job. Nothing is matched here; the worker does it after the posting commits.
+    """
+    if isinstance(job_instance, JobAdvert):
+        fanout = NotificationFanout.objects.create(job_advert=job_instance)
+    else:
+        fanout = NotificationFanout.objects.create(job=job_instance)
+    transaction.on_commit(lambda: fan_out_job_match.delay(fanout.id))
+    return fanout
+
+
+def posting_skill_ids(text):
+    """
+    Canonical skill ids for a posting. Comma/line separated entries resolve
+    through synonyms; known skill names inside free-text requirements count too.
+    """
+    names = [part for part in re.split(r"[,;\n]", text or "") if part.strip()]
+    vocabulary = [label for label, _kind, _popularity in get_index(SKILLS).terms]
+    names += candidate_search.parse_skills(text, vocabulary)
+    return set(CanonicalSkill.objects.lookup(names).values())
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def fan_out_job_match(self, fanout_id, chunk_size=FANOUT_CHUNK_SIZE):
+    fanout = NotificationFanout.objects.select_related('job__organization', 'job_advert').filter(id=fanout_id).first()
+    if fanout is None or fanout.status == 'DONE':
+        return
+
+    posting = fanout.posting
+    if fanout.job_id:
+        skills_text = posting.requirements
+        creator_id = posting.organization.admin_user_id
+        link = f"/job/{posting.id}/"
+        dedupe_key = f"job-match:job:{posting.id}"
+    else:
+        skills_text = posting.skills
+        creator_id = posting.created_by_id
+        link = posting.get_absolute_url()
+        dedupe_key = f"job-match:advert:{posting.id}"
+
+    NotificationFanout.objects.filter(id=fanout.id).update(status='RUNNING')
+    try:
+        skill_ids = posting_skill_ids(skills_text)
+        user_ids = (Skill.objects.filter(canonical_id__in=skill_ids)
+                    .exclude(user_id=creator_id)
+                    .values_list('user_id', flat=True).distinct().order_by('user_id'))
+        if fanout.last_user_id:
+            user_ids = user_ids.filter(user_id__gt=fanout.last_user_id)
+
+        # Users stream from a server-side cursor; memory stays at one chunk
+        for chunk in _chunks(user_ids.iterator(chunk_size=chunk_size) if skill_ids else [], chunk_size):
+            # Skip users a previous (retried) run already reached. A concurrent
+            # run can still get there first: the unique (user, dedupe_key)
+            # constraint absorbs that (ignore_conflicts) instead of failing the chunk
+            notified = set(Notification.objects.filter(dedupe_key=dedupe_key, user_id__in=chunk)
+                           .values_list('user_id', flat=True))
+            new_user_ids = [user_id for user_id in chunk if user_id not in notified]
+            Notification.objects.bulk_create([
+                Notification(
+                    user_id=user_id,
+                    title=f"New Job Match: {posting.title}",
+                    message="A new opening matches your skill set.",
+                    link=link,
+                    dedupe_key=dedupe_key,
+                )
+                for user_id in new_user_ids
+            ], ignore_conflicts=True)
+            if new_user_ids:
+                # ignore_conflicts returns no ids: read the rows back for the push,
+                # and refresh the badges with one grouped count
+                created = Notification.objects.filter(dedupe_key=dedupe_key, user_id__in=new_user_ids)
+                realtime.publish_notifications(created)
+                counters.reconcile(counters.NOTIFICATIONS, new_user_ids, publish=True)
+            NotificationFanout.objects.filter(id=fanout.id).update(
+                matched_users=F('matched_users') + len(chunk), last_user_id=chunk[-1]
+            )
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            NotificationFanout.objects.filter(id=fanout.id).update(
+                status='FAILED', error=str(e), finished_at=timezone.now()
+            )
+            raise
+        raise self.retry(exc=e)
+
+    NotificationFanout.objects.filter(id=fanout.id).update(status='DONE', finished_at=timezone.now())
+
+
+# =================================================
+# 3. UNREAD COUNTER RECONCILIATION
+# =================================================
+@shared_task
+def reconcile_unread_counters(window_minutes=15):
+    """
+    Periodic safety net for the cached unread counters: recomputes them for
+    every user who received a notification or message recently.
+    """
+    since = timezone.now() - timedelta(minutes=window_minutes)
+    recent = {
+        counters.NOTIFICATIONS: Notification.objects.filter(created_at__gte=since).values_list('user_id', flat=True),
+        counters.MESSAGES: Message.objects.filter(timestamp__gte=since).values_list('receiver_id', flat=True),
+    }
+    for kind, user_ids in recent.items():
+        counters.reconcile(kind, set(user_ids.order_by().distinct()))
+
+
+# =================================================
+# 4. NOTIFICATION RETENTION
+# =================================================
+def archive_notification_batch(cutoff, batch_size):
+    """
+    Moves up to `batch_size` read notifications created before `cutoff` into
+    the archive table in one statement (DELETE ... RETURNING feeding INSERT),
+    so a row is never in both tables or lost in between. Returns rows moved.
+    """
+    notifications = Notification._meta.db_table
+    archive = NotificationArchive._meta.db_table
+    sql = f"""
+        WITH moved AS (
+            DELETE FROM {notifications}
+            WHERE id IN (
+                SELECT id FROM {notifications}
+                WHERE is_read AND created_at < %s
+                ORDER BY created_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, user_id, title, message, link, created_at
+        ), archived AS (
+            INSERT INTO {archive} (id, user_id, title, message, link, created_at, archived_at)
+            SELECT id, user_id, title, message, link, created_at, now() FROM moved
+            ON CONFLICT (id) DO NOTHING
+        )
+        SELECT count(*) FROM moved
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [cutoff, batch_size])
+        return cursor.fetchone()[0]
+
+
+@shared_task
+def archive_read_notifications(batch_size=1000, max_batches=200):
+    """Daily retention sweep; short batches keep locks and WAL bursts small."""
+    cutoff = timezone.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    total = 0
+    for _ in range(max_batches):
+        moved = archive_notification_batch(cutoff, batch_size)
+        total += moved
+        if moved < batch_size:
+            break
+    return total
+
+
+# =================================================
+# 5. NOTIFICATION DIGEST EMAILS
+# =================================================
+def _digest_preferences(now):
+    """DIGEST-mode preferences whose window has elapsed."""
+    if settings.NOTIFICATION_DEFAULT_EMAIL_MODE == NotificationPreference.DIGEST:
+        # Users without a stored preference inherit DIGEST; give anyone with
+        # recent notifications a row so their watermark can be tracked
+        since = now - max(notifications.DIGEST_WINDOWS.values())
+        user_ids = (Notification.objects.filter(created_at__gte=since, user__notification_preference__isnull=True)
+                    .values_list('user_id', flat=True).order_by().distinct())
+        NotificationPreference.objects.bulk_create(
+            [NotificationPreference(user_id=user_id, email_mode=NotificationPreference.DIGEST) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+
+    preferences = (NotificationPreference.objects.filter(email_mode=NotificationPreference.DIGEST)
+                   .select_related('user').order_by('id'))
+    return (p for p in preferences.iterator() if notifications.is_digest_due(p, now))
+
+
+@shared_task
+def send_notification_digests(batch_size=None):
+    """
+    Mails each DIGEST user one summary of the unread notifications they got
+    since their last digest. Messages are rendered up front and sent in
+    batches, one SMTP connection per batch, instead of one per notification.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_DIGEST_BATCH_SIZE
+    now = timezone.now()
+    sent = 0
+
+    for chunk in _chunks(_digest_preferences(now), batch_size):
+        since = {p.user_id: notifications.digest_since(p, now) for p in chunk}
+        pending = defaultdict(list)
+        # One query per batch; each user's own window is applied in Python
+        for notification in Notification.objects.filter(
+            user_id__in=since, is_read=False, created_at__gt=min(since.values()), created_at__lte=now,
+        ).order_by('created_at'):
+            if notification.created_at > since[notification.user_id]:
+                pending[notification.user_id].append(notification)
+
+        messages = [
+            notifications.build_digest(p.user, pending[p.user_id])
+            for p in chunk if pending[p.user_id] and p.user.email
+        ]
+        preference_ids = [p.id for p in chunk]
+
+        try:
+            sent += notifications.send_batch(messages) if messages else 0
+        except Exception:
+            # Leave the watermarks alone so these users are retried next run
+            logger.exception("Digest batch failed")
+            continue
+        # Windows with nothing new still advance, so a digest goes out at
+        # most once per window
+        NotificationPreference.objects.filter(id__in=preference_ids).update(last_digest_at=now)
+
+    return sent
+
+
+# =================================================
+# 6. JOB RECOMMENDATIONS
+# =================================================
+@shared_task
+def recompute_recommendations(k=recommendations.TOP_K):
+    """Nightly rebuild of every candidate's top-K job recommendations."""
+    candidates, jobs, written = recommendations.recompute(k=k)
+    logger.info("Recommendations: %s candidates x %s jobs, %s rows", candidates, jobs, written)
+    return written
+
+
+# =================================================
+# 7. SEMANTIC (ANN) INDEX
+# =================================================
+@shared_task
+def index_semantic_job(job_id):
+    """Queues one job's embedding for the next merge; inactive or deleted jobs are removed."""
+    semantic.add_job(job_id)
+
+
+@shared_task
+def index_semantic_application(application_id):
+    semantic.add_application(application_id)
+
+
+@shared_task
+def merge_semantic_updates():
+    """Every few minutes: folds queued job/CV changes into the ANN indexes."""
+    return semantic.merge_pending()
+
+
+@shared_task
+def rebuild_semantic_index():
+    """Nightly refit of the embedding plus a full rebuild of both ANN indexes."""
+    jobs, applications = semantic.rebuild()
+    logger.info("Semantic index: %s jobs, %s candidates", jobs, applications)
+
+
+# =================================================
+# 8. CHUNKED UPLOADS
+# =================================================
+@shared_task
+def purge_stale_uploads():
+    """Hourly: drops expired upload sessions and abandoned partial files."""
+    return uploads.purge_stale()
+
+
+# =================================================
+# 9. RECRUITER BROADCASTS
+# =================================================
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def send_broadcast(self, broadcast_id, chunk_size=broadcasts.CHUNK_SIZE):
+    broadcast = Broadcast.objects.select_related('organization').filter(id=broadcast_id).first()
+    if broadcast is None or broadcast.status == 'DONE':
+        return
+
+    Broadcast.objects.filter(id=broadcast.id).update(status='RUNNING')
+    try:
+        # Each chunk commits with its resume point (broadcasts.deliver_chunk)
+        rows = broadcasts.recipients(broadcast).iterator(chunk_size=chunk_size)
+        for chunk in _chunks(rows, chunk_size):
+            broadcasts.deliver_chunk(broadcast, chunk)
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            Broadcast.objects.filter(id=broadcast.id).update(
+                status='FAILED', error=str(e), finished_at=timezone.now()
+            )
+            raise
+        raise self.retry(exc=e)
+
+    Broadcast.objects.filter(id=broadcast.id).update(status='DONE', finished_at=timezone.now())
+
+
+# =================================================
+# 10. ACTIVITY LOG PARTITIONS & ROLLUPS
+# =================================================
+@shared_task
+def maintain_activity_partitions():
+    """Daily: adds upcoming monthly ActivityLog partitions and drops expired ones."""
+    created = activity_partitions.ensure_partitions()
+    dropped = activity_partitions.drop_expired_partitions()
+    logger.info("Activity log partitions: %s created, %s dropped", len(created), len(dropped))
+    return {"created": created, "dropped": dropped}
+
+
+@shared_task
+def rollup_activity(days=2):
+    """Hourly: refreshes the per-day counts for today and the previous `days - 1` days."""
+    today = timezone.now().date()
+    return sum(activity_partitions.rollup_day(today - timedelta(days=offset)) for offset in range(days))
+
+
+
+# =================================================
+# 11. DOMAIN EVENTS
+# =================================================
+@shared_task
+def dispatch_domain_events(batch_size=events.BATCH_SIZE, max_batches=20):
+    """
+    Handles due outbox events (events.dispatch). Queued after every commit
+    that published one; the per-minute beat run picks up retries and events
+    left behind by a worker that died.
+    """
+    handled = 0
+    for _ in range(max_batches):
+        claimed = events.dispatch(batch_size)
+        handled += claimed
+        if claimed < batch_size:
+            break
+    return handled
@@ -1,6 +1,7 @@
 import factory
 from faker import Faker
 from application_tracking.models import JobAdvert, JobApplication
+from organization.models import Job, Organization
 
 
 fake = Faker()
@@ -26,3 +27,25 @@ class JobApplicationFactory(factory.django.DjangoModelFactory):
     name = fake.name()
     portfolio_url = fake.url()
     cv = fake.file_path()
+
+
+class OrganizationFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Organization
+
+    name = factory.Sequence(lambda n: f"Company {n}")
+    registration_number = factory.Sequence(lambda n: f"REG-{n}")
+    contact_email = factory.Sequence(lambda n: f"hr{n}@example.com")
+    phone_number = "+977 9800000000"
+    status = "ACTIVE"
+
+
+class JobFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Job
+
+    organization = factory.SubFactory(OrganizationFactory)
+    title = "Python Developer"
+    location = "Remote"
+    description = fake.sentence()
+    requirements = "Python, Django"
@@ -0,0 +1,32 @@
+import pytest
+
+from accounts.models import User
+from application_tracking import activity
+from application_tracking.models import ActivityLog
+from application_tracking.tests.factories import JobApplicationFactory, JobFactory
+
+
+@pytest.mark.django_db(transaction=True)
+def test_buffered_entries_are_resolved_and_written_in_one_batch(settings, monkeypatch):
+    recruiter = User.objects.create(email="recruiter@example.com")
+    applicant = User.objects.create(email="applicant@example.com")
+    job = JobFactory(organization__admin_user=recruiter, title="Data Engineer")
+    ActivityLog.objects.all().delete()
+
+    buffer = activity.ActivityLogBuffer(max_size=2, batch_size=10, flush_interval=60)
+    monkeypatch.setattr(buffer, "_ensure_thread", lambda: None)  # flushed by hand below
+    monkeypatch.setattr(activity, "buffer", buffer)
+    settings.ACTIVITY_LOG_ASYNC = True
+
+    JobApplicationFactory(job=job, email=applicant.email, name="Asha")  # actor found by email
+    app = JobApplicationFactory(job=job, user=applicant, name="Ravi")
+    app.status = "ACCEPTED"
+    app.save()  # third entry: the queue is full
+
+    assert ActivityLog.objects.count() == 0
+    assert buffer.flush() == 2
+    assert buffer.stats() == {'queued': 0, 'written': 2, 'dropped': 1}
+    assert sorted(ActivityLog.objects.values_list('actor__email', 'description')) == [
+        ("applicant@example.com", "Asha applied for Data Engineer"),
+        ("applicant@example.com", "Ravi applied for Data Engineer"),
+    ]
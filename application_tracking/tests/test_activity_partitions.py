@@ -0,0 +1,58 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from django.contrib.admin.sites import site
+from django.db import connection
+from django.test import RequestFactory
+
+from application_tracking import activity_partitions
+from application_tracking.admin import ActivityDateFilter
+from application_tracking.models import ActivityDailyRollup, ActivityLog
+
+
+def test_add_months_crosses_year_boundaries():
+    assert activity_partitions.add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert activity_partitions.add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+
+
+def test_admin_changelist_defaults_to_this_month():
+    request = RequestFactory().get("/admin/application_tracking/activitylog/")
+    field = ActivityLog._meta.get_field("timestamp")
+    date_filter = ActivityDateFilter(field, request, {}, ActivityLog, site._registry[ActivityLog], "timestamp")
+
+    where = str(date_filter.queryset(request, ActivityLog.objects.all()).query)
+
+    assert '"timestamp" >=' in where and '"timestamp" <' in where
+
+
+@pytest.mark.django_db
+def test_partitions_are_maintained_and_days_rolled_up(user_instance):
+    created = activity_partitions.ensure_partitions(today=date(2020, 1, 15), months_ahead=1)
+    assert created == ["application_tracking_activitylog_p202001", "application_tracking_activitylog_p202002"]
+
+    day = date(2020, 1, 15)
+    for hour in (9, 10):
+        ActivityLog.objects.create(actor=user_instance, action_type="LOGIN", description="In",
+                                   timestamp=datetime(2020, 1, 15, hour, tzinfo=timezone.utc))
+    assert activity_partitions.rollup_day(day) == 1
+    assert activity_partitions.rollup_day(day) == 1  # idempotent
+    assert ActivityDailyRollup.objects.get(day=day, action_type="LOGIN").count == 2
+
+    dropped = activity_partitions.drop_expired_partitions(today=date(2021, 2, 1), retention_months=12)
+    assert dropped == ["application_tracking_activitylog_p202001"]
+    assert not ActivityLog.objects.filter(timestamp__year=2020).exists()
+    assert ActivityDailyRollup.objects.filter(day=day).exists()
+
+
+@pytest.mark.django_db
+def test_rows_without_a_partition_wait_in_the_default_one(user_instance):
+    ActivityLog.objects.create(actor=user_instance, action_type="LOGIN", description="In",
+                               timestamp=datetime(2019, 6, 3, 8, tzinfo=timezone.utc))
+
+    created = activity_partitions.ensure_partitions(today=date(2019, 6, 10), months_ahead=0)
+
+    assert created == ["application_tracking_activitylog_p201906"]
+    assert ActivityLog.objects.filter(timestamp__year=2019).count() == 1
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {activity_partitions.DEFAULT_PARTITION}")
+        assert cursor.fetchone()[0] == 0
@@ -0,0 +1,33 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from application_tracking.autocomplete import PrefixIndex
+from application_tracking.tests.factories import JobFactory
+
+
+def test_prefix_index_matches_word_starts_ranked_by_popularity():
+    index = PrefixIndex([
+        ("Python Developer", "title", 3),
+        ("Senior Python Developer", "title", 9),
+        ("PyData Labs", "organization", 1),
+        ("Go Developer", "title", 5),
+    ])
+
+    assert [s["label"] for s in index.suggest("py")] == ["Senior Python Developer", "Python Developer", "PyData Labs"]
+    assert [s["label"] for s in index.suggest("DEV", limit=2)] == ["Senior Python Developer", "Go Developer"]
+    assert index.suggest("py", kinds=("organization",)) == [{"label": "PyData Labs", "kind": "organization"}]
+    assert index.suggest("  ") == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_autocomplete_endpoint_picks_up_new_jobs(client):
+    cache.clear()
+    url = reverse("autocomplete") + "?scope=jobs&q=rust"
+    assert client.get(url).json()["data"] == []
+
+    JobFactory(title="Rust Engineer")
+    response = client.get(url)
+
+    assert "public" in response["Cache-Control"]
+    assert response.json()["data"] == [{"label": "Rust Engineer", "kind": "title"}]
@@ -0,0 +1,55 @@
+import pytest
+from django.urls import reverse
+
+from accounts.models import User
+from application_tracking import broadcasts
+from application_tracking.models import Broadcast, Notification
+from application_tracking.tasks import send_broadcast
+from application_tracking.tests.factories import JobApplicationFactory, JobFactory
+from organization.forms import BroadcastForm
+from organization.models import Conversation, Message
+
+
+def test_render_fills_known_placeholders_only():
+    content = "Hi {{ first_name }}, about {{job_title}} {{ salary }}"
+
+    assert broadcasts.render(content, {"first_name": "Asha", "job_title": "QA"}) == "Hi Asha, about QA {{ salary }}"
+    assert broadcasts.unknown_variables(content) == ["salary"]
+
+
+@pytest.mark.django_db
+def test_broadcast_messages_each_applicant_once_and_updates_inboxes(client):
+    recruiter = User.objects.create(email="recruiter@example.com")
+    job = JobFactory(organization__admin_user=recruiter, title="Backend Engineer")
+    applicants = [User.objects.create(email=f"a{i}@example.com", first_name=f"Applicant{i}") for i in range(5)]
+    for applicant in applicants:
+        JobApplicationFactory(user=applicant, job=job, name=applicant.first_name, status="PENDING")
+    JobApplicationFactory(user=applicants[0], job=JobFactory(organization=job.organization))  # second application
+    Message.objects.create(sender=recruiter, receiver=applicants[0], content="Earlier chat")
+
+    client.force_login(recruiter)
+    client.post(reverse("org_broadcast"), {
+        "job": job.id, "application_status": "PENDING", "search_query": "",
+        "content": "Hi {{ first_name }}, next steps for {{ job_title }}.",
+    })
+
+    broadcast = Broadcast.objects.get()
+    assert (broadcast.status, broadcast.sent_count) == ("DONE", 5)
+    sent = Message.objects.filter(sender=recruiter, content__startswith="Hi ")
+    assert sorted(m.content for m in sent) == [f"Hi Applicant{i}, next steps for Backend Engineer." for i in range(5)]
+    assert Notification.objects.filter(user__in=applicants).count() == 5
+
+    inbox = Conversation.objects.get(user=applicants[0], peer=recruiter)
+    assert inbox.unread_count == 2
+    assert inbox.last_message_id == sent.get(receiver=applicants[0]).id
+    assert Conversation.objects.filter(user=recruiter).count() == 5
+
+    # Re-running a finished broadcast sends nothing
+    send_broadcast(broadcast.id)
+    assert Message.objects.filter(sender=recruiter).count() == 6
+
+
+def test_broadcast_form_accepts_the_candidate_page_status_filters():
+    for status in ("PENDING", "ACCEPTED", "INTERVIEWING", ""):
+        form = BroadcastForm({"job": "", "application_status": status, "search_query": "", "content": "Hello"})
+        assert form.is_valid(), form.errors
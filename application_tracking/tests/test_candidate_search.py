@@ -0,0 +1,29 @@
+import pytest
+from django.core.files.base import ContentFile
+
+from application_tracking.candidate_search import parse_skills, search_candidates
+from application_tracking.models import JobApplication
+from application_tracking.tests.factories import JobApplicationFactory, JobFactory
+
+
+def test_parse_skills_respects_word_boundaries():
+    vocabulary = ["Java", "JavaScript", "C++", "Node.js", "Django"]
+    text = "Built APIs in django and node.js; some JavaScript, a little C++."
+
+    assert parse_skills(text, vocabulary) == ["C++", "Django", "JavaScript", "Node.js"]
+    assert parse_skills("", vocabulary) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_candidates_are_searchable_by_cv_content():
+    job = JobFactory()
+    match = JobApplicationFactory(job=job, name="Ada Lovelace", email="ada@example.com")
+    match.cv.save("ada.txt", ContentFile(b"Senior engineer: Django, Postgres and Celery."))
+    other = JobApplicationFactory(job=job, name="Alan Turing", email="alan@example.com")
+    other.cv.save("alan.txt", ContentFile(b"Django with MySQL."))
+
+    candidates = JobApplication.objects.filter(job__organization=job.organization)
+
+    assert list(search_candidates(candidates, "django AND postgres")) == [match]
+    assert set(search_candidates(candidates, "django")) == {match, other}
+    assert list(search_candidates(candidates, "lovel")) == [match]
@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from application_tracking.models import ActivityLog
+from application_tracking.tests.factories import JobApplicationFactory, JobFactory, OrganizationFactory
+from organization.models import Organization
+
+
+def loaded_organization(**values):
+    fields = [f.attname for f in Organization._meta.concrete_fields if f.attname in values]
+    return Organization.from_db("default", fields, [values[name] for name in fields])
+
+
+def test_changes_are_compared_with_the_loaded_values():
+    org = loaded_organization(id="5d0f9c52-4bd4-4c5e-a1a4-07a6b1e8d1d6", name="Kite", status="PENDING")
+
+    assert not org.has_changed("status")
+    org.status = "VERIFIED"
+    assert org.has_changed("status")
+    assert org.previous("status") == "PENDING"
+    assert org.changed_fields() >= {"status", "website"}  # website was deferred: unknown counts as changed
+    assert Organization(name="New").has_changed("name")
+
+
+@pytest.mark.django_db
+def test_saving_an_organization_does_not_refetch_it():
+    org = Organization.objects.get(id=OrganizationFactory(status="PENDING").id)
+    org.status = "VERIFIED"
+
+    with CaptureQueriesContext(connection) as queries:
+        org.save()
+
+    assert not [q for q in queries if q["sql"].startswith('SELECT') and 'FROM "organization_organization"' in q["sql"]]
+    assert not org.has_changed("status")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_status_log_only_on_real_transitions(user_instance):
+    application = JobApplicationFactory(user=user_instance, job=JobFactory(organization__admin_user=user_instance))
+    ActivityLog.objects.all().delete()
+
+    application.save()
+    application.status = "ACCEPTED"
+    application.save()
+    application.save()
+
+    assert list(ActivityLog.objects.values_list("action_type", flat=True)) == ["APP_STATUS"]
@@ -0,0 +1,36 @@
+import pytest
+from django.urls import reverse
+
+from accounts.models import User
+from application_tracking import chat_history
+from application_tracking.tests.factories import JobApplicationFactory, JobFactory
+from organization.models import Message
+
+
+@pytest.mark.django_db
+def test_history_pages_newest_first_and_endpoint_fetches_older(client, user_instance):
+    recruiter = User.objects.create(email="recruiter@example.com")
+    JobApplicationFactory(user=user_instance, job=JobFactory(organization__admin_user=recruiter))
+    sent = [
+        Message.objects.create(sender=recruiter, receiver=user_instance, content=f"Message {i}")
+        for i in range(7)
+    ]
+
+    first = chat_history.message_page(user_instance, recruiter, per_page=5)
+    assert [m.id for m in first.items] == [m.id for m in sent[2:]]
+
+    client.force_login(user_instance)
+    response = client.get(reverse("chat_history_api", args=[recruiter.id]), {"cursor": first.older_cursor})
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [m.id for m in sent[:2]]
+    assert data["older_cursor"] == ""
+
+
+@pytest.mark.django_db
+def test_history_endpoint_rejects_strangers(client, user_instance):
+    stranger = User.objects.create(email="stranger@example.com")
+    client.force_login(user_instance)
+
+    response = client.get(reverse("chat_history_api", args=[stranger.id]))
+
+    assert response.status_code == 403
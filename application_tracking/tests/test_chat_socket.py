@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.testing import ApplicationCommunicator
+
+from accounts.models import User
+from application_tracking.chat_socket import CLOSE_FORBIDDEN, CLOSE_UNAUTHORIZED, chat_websocket
+from application_tracking.realtime import chat_channel
+from application_tracking.tests.factories import JobApplicationFactory, JobFactory
+from common.middleware import session_cookie_name
+from organization.models import Message
+
+PEER_ID = "8f14e45f-ceea-467f-a9c5-6e3f1b2a4c7d"
+
+
+def socket_scope(peer_id, session_key=None, origin="http://testserver"):
+    headers = [(b"host", b"testserver"), (b"origin", origin.encode())]
+    if session_key:
+        headers.append((b"cookie", f"{session_cookie_name('testserver')}={session_key}".encode()))
+    return {"type": "websocket", "path": f"/ws/chat/{peer_id}/", "headers": headers}
+
+
+def test_chat_channel_is_shared_by_both_participants():
+    assert chat_channel("b", "a") == chat_channel("a", "b") == "chat:a:b"
+
+
+def test_anonymous_socket_is_rejected():
+    async def run():
+        communicator = ApplicationCommunicator(chat_websocket, socket_scope(PEER_ID))
+        await communicator.send_input({"type": "websocket.connect"})
+        return await communicator.receive_output(timeout=5)
+
+    assert asyncio.run(run()) == {"type": "websocket.close", "code": CLOSE_UNAUTHORIZED}
+
+
+def test_cross_site_handshake_is_rejected():
+    async def run():
+        scope = socket_scope(PEER_ID, "any-session", origin="https://evil.example.com")
+        communicator = ApplicationCommunicator(chat_websocket, scope)
+        await communicator.send_input({"type": "websocket.connect"})
+        return await communicator.receive_output(timeout=5)
+
+    assert asyncio.run(run()) == {"type": "websocket.close", "code": CLOSE_FORBIDDEN}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_message_is_saved_and_pushed_to_the_conversation(authenticate_user_client):
+    client, candidate = authenticate_user_client
+    recruiter = User.objects.create(email="recruiter@example.com")
+    job = JobFactory(organization__admin_user=recruiter)
+    JobApplicationFactory(user=candidate, job=job)
+    session_key = client.session.session_key
+
+    async def run():
+        communicator = ApplicationCommunicator(chat_websocket, socket_scope(recruiter.id, session_key))
+        await communicator.send_input({"type": "websocket.connect"})
+        accepted = await communicator.receive_output(timeout=5)
+        await communicator.send_input({"type": "websocket.receive", "text": json.dumps({"type": "message", "content": " Hi! "})})
+        pushed = json.loads((await communicator.receive_output(timeout=5))["text"])
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait(timeout=5)
+        return accepted, pushed
+
+    accepted, pushed = asyncio.run(run())
+    assert accepted == {"type": "websocket.accept"}
+    assert pushed["type"] == "message"
+    assert pushed["content"] == "Hi!"
+    assert pushed["sender_id"] == str(candidate.id)
+    assert Message.objects.filter(sender=candidate, receiver=recruiter, content="Hi!").exists()
@@ -0,0 +1,43 @@
+import pytest
+from django.urls import reverse
+
+from accounts.models import User
+from application_tracking.chat_socket import mark_read
+from application_tracking.tests.factories import OrganizationFactory
+from organization.models import Conversation, Message
+
+
+@pytest.mark.django_db(transaction=True)
+def test_conversation_rows_follow_send_and_read(user_instance):
+    recruiter = User.objects.create(email="recruiter@example.com")
+
+    Message.objects.create(sender=recruiter, receiver=user_instance, content="Hello")
+    latest = Message.objects.create(sender=recruiter, receiver=user_instance, content="Are you free?")
+
+    candidate_side = Conversation.objects.get(user=user_instance, peer=recruiter)
+    recruiter_side = Conversation.objects.get(user=recruiter, peer=user_instance)
+    assert candidate_side.last_message_id == recruiter_side.last_message_id == latest.id
+    assert (candidate_side.unread_count, recruiter_side.unread_count) == (2, 0)
+
+    reply = Message.objects.create(sender=user_instance, receiver=recruiter, content="Yes")
+    mark_read(user_instance.id, recruiter.id)
+
+    candidate_side.refresh_from_db()
+    recruiter_side.refresh_from_db()
+    assert candidate_side.last_message_id == reply.id
+    assert (candidate_side.unread_count, recruiter_side.unread_count) == (0, 1)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_org_inbox_lists_conversations_newest_first(client):
+    recruiter = User.objects.create(email="recruiter@example.com")
+    OrganizationFactory(admin_user=recruiter)
+    older = User.objects.create(email="older@example.com", first_name="Older")
+    newer = User.objects.create(email="newer@example.com", first_name="Newer")
+    Message.objects.create(sender=older, receiver=recruiter, content="First")
+    Message.objects.create(sender=newer, receiver=recruiter, content="Second")
+
+    client.force_login(recruiter)
+    response = client.get(reverse("org_inbox"))
+
+    assert [c.peer for c in response.context["conversations"]] == [newer, older]
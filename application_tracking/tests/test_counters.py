@@ -0,0 +1,41 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from application_tracking import counters
+from application_tracking.models import Notification
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_counter_follows_create_and_read_paths(client, user_instance):
+    client.force_login(user_instance)
+    first = Notification.objects.create(user=user_instance, title="A", message="m")
+
+    # Cold: one COUNT, then served from cache
+    assert counters.get_unread_counts(user_instance.id)[counters.NOTIFICATIONS] == 1
+    Notification.objects.create(user=user_instance, title="B", message="m")
+    assert counters.get_unread_counts(user_instance.id)[counters.NOTIFICATIONS] == 2
+
+    client.post(reverse("mark_notification_read", args=[first.id]))
+    client.post(reverse("mark_notification_read", args=[first.id]))
+    assert counters.get_unread_counts(user_instance.id)[counters.NOTIFICATIONS] == 1
+
+    client.get(reverse("mark_all_read"))
+    assert counters.get_unread_counts(user_instance.id)[counters.NOTIFICATIONS] == 0
+
+
+@pytest.mark.django_db
+def test_reconcile_overwrites_drifted_counter(user_instance):
+    Notification.objects.create(user=user_instance, title="A", message="m")
+    cache.set(f"unread:{counters.NOTIFICATIONS}:{user_instance.id}", 7)
+
+    counters.reconcile(counters.NOTIFICATIONS, [user_instance.id])
+
+    assert counters.get_unread_counts(user_instance.id)[counters.NOTIFICATIONS] == 1
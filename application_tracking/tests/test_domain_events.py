@@ -0,0 +1,107 @@
+import pytest
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from application_tracking import events
+from application_tracking.models import DomainEvent, Notification
+from application_tracking.tests.factories import JobApplicationFactory, JobFactory
+from organization.models import Message
+
+
+@pytest.mark.django_db
+def test_dispatch_batches_by_type_and_retries_only_failed_handlers(monkeypatch):
+    seen = []
+
+    def record(batch):
+        seen.append([event.task_id for _, event in batch])
+
+    def flaky(batch):
+        if any(event.task_id == 2 for _, event in batch):
+            raise RuntimeError("boom")
+
+    monkeypatch.setitem(events._handlers, events.TaskSubmitted, [(record, None), (flaky, None)])
+    for task_id in (1, 2, 3):
+        events.publish(events.TaskSubmitted(task_id=task_id))
+
+    assert events.dispatch() == 3
+    assert seen == [[1, 2, 3]]  # one call for the whole batch
+    rows = {row.payload['task_id']: row for row in DomainEvent.objects.all()}
+    assert [rows[1].status, rows[2].status, rows[3].status] == ['DONE', 'PENDING', 'DONE']
+    assert rows[2].attempts == 1 and "boom" in rows[2].error
+    assert rows[2].handled == [events.handler_name(record)]
+
+    # Due again: only the failed handler runs
+    DomainEvent.objects.filter(id=rows[2].id).update(available_at=rows[2].created_at)
+    monkeypatch.setitem(events._handlers, events.TaskSubmitted, [(record, None), (lambda batch: None, None)])
+    assert events.dispatch() == 1
+    assert seen == [[1, 2, 3]]
+    assert DomainEvent.objects.get(id=rows[2].id).status == 'DONE'
+
+
+@pytest.mark.django_db
+def test_dispatch_leaves_events_another_dispatcher_took_over(monkeypatch):
+    later = []
+
+    def slow(batch):
+        # Meanwhile the lease on task 2 ran out and another dispatcher claimed it
+        DomainEvent.objects.filter(payload__task_id=2).update(available_at=timezone.now() + events.LEASE * 2)
+
+    def record(batch):
+        later.extend(event.task_id for _, event in batch)
+
+    monkeypatch.setitem(events._handlers, events.TaskSubmitted, [(slow, 1), (record, None)])
+    for task_id in (1, 2):
+        events.publish(events.TaskSubmitted(task_id=task_id))
+
+    events.dispatch()
+    assert later == [1]
+    rows = {row.payload['task_id']: row for row in DomainEvent.objects.all()}
+    assert rows[1].status == 'DONE'
+    assert rows[2].status == 'PENDING' and rows[2].handled == []
+
+
+@pytest.mark.django_db
+def test_event_is_dropped_with_a_rolled_back_transaction():
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            events.publish(events.TaskSubmitted(task_id=1))
+            raise RuntimeError
+
+    assert not DomainEvent.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recruiter_decision_messages_candidate_after_commit_once(client):
+    recruiter = User.objects.create(email="recruiter@example.com")
+    applicant = User.objects.create(email="applicant@example.com")
+    job = JobFactory(organization__admin_user=recruiter, title="QA Lead")
+    application = JobApplicationFactory(job=job, user=applicant, email=applicant.email, name="Asha")
+
+    client.force_login(recruiter)
+    client.get(reverse("org_make_decision", kwargs={"application_id": application.id, "decision": "hire"}))
+
+    event = DomainEvent.objects.get(name="DecisionMade")
+    assert event.status == 'DONE'
+    assert Message.objects.get(sender=recruiter, receiver=applicant).content.startswith("🎉 **CONGRATULATIONS!**")
+    assert Notification.objects.filter(user=applicant, title="You're Hired! 🎉").count() == 1
+
+    # Redelivered from scratch: neither the message nor the notification is repeated
+    DomainEvent.objects.filter(id=event.id).update(status='PENDING', handled=[], available_at=event.created_at)
+    events.dispatch()
+    assert Notification.objects.filter(user=applicant, title="You're Hired! 🎉").count() == 1
+    assert Message.objects.filter(sender=recruiter, receiver=applicant).count() == 1
+
+
+@pytest.mark.django_db
+def test_recruiter_stage_move_records_the_previous_stage(client):
+    recruiter = User.objects.create(email="recruiter@example.com")
+    job = JobFactory(organization__admin_user=recruiter)
+    application = JobApplicationFactory(job=job, interview_stage="HR_ROUND")
+
+    client.force_login(recruiter)
+    client.get(reverse("org_trigger_interview", kwargs={"application_id": application.id, "round_name": "TECH"}))
+
+    payload = DomainEvent.objects.get(name="StageAdvanced").payload
+    assert (payload["from_stage"], payload["to_stage"]) == ("HR_ROUND", "TECH_ROUND")
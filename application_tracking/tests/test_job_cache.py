@@ -0,0 +1,49 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from application_tracking import job_cache
+from application_tracking.tests.factories import JobFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_invalidation_changes_only_affected_keys():
+    search_key = job_cache.versioned_key("job-search", [job_cache.get_version(job_cache.ALL_JOBS)], {"keyword": "python"})
+    job_one_key = job_cache.versioned_key("job-detail", [job_cache.get_version("job", 1)], 1)
+    job_two_key = job_cache.versioned_key("job-detail", [job_cache.get_version("job", 2)], 2)
+
+    job_cache.invalidate_job(1, "org-a")
+
+    assert job_cache.versioned_key("job-search", [job_cache.get_version(job_cache.ALL_JOBS)], {"keyword": "python"}) != search_key
+    assert job_cache.versioned_key("job-detail", [job_cache.get_version("job", 1)], 1) != job_one_key
+    assert job_cache.versioned_key("job-detail", [job_cache.get_version("job", 2)], 2) == job_two_key
+
+
+def test_get_or_compute_records_hits_and_misses():
+    calls = []
+    compute = lambda: calls.append(1) or "value"
+
+    assert job_cache.get_or_compute("job-search", [1], {"q": "a"}, compute) == "value"
+    assert job_cache.get_or_compute("job-search", [1], {"q": "a"}, compute) == "value"
+
+    assert len(calls) == 1
+    assert job_cache.hit_rates()["job-search"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_saving_a_job_refreshes_cached_search(client):
+    job = JobFactory(title="Python Developer")
+    url = reverse("jobs_apply") + "?keyword=python"
+    assert "Python Developer" in client.get(url).content.decode()
+
+    job.title = "Go Developer"
+    job.save()
+
+    content = client.get(url).content.decode()
+    assert "Python Developer" not in content
@@ -0,0 +1,103 @@
+import pytest
+from django.test.client import Client
+from django.urls import reverse
+
+from application_tracking.search import (
+    facet_filters, get_job_page, job_facet_counts, normalize_search_params, search_jobs,
+)
+from organization.models import Job
+
+from .factories import JobFactory, OrganizationFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_search_matches_substring():
+    job = JobFactory(title="Backend Engineer", location="Kathmandu, Nepal")
+    JobFactory(title="Designer", location="Pokhara")
+
+    results = Job.objects.search("engineer", "kathmandu")
+    assert list(results) == [job]
+
+
+def test_fuzzy_search_tolerates_typos_and_ranks():
+    exact = JobFactory(title="Django Developer", location="Kathmandu, Nepal")
+    close = JobFactory(title="Djangoo Developer", location="Kathmandu")
+    JobFactory(title="Accountant", location="Pokhara")
+
+    results = list(Job.objects.fuzzy_search("django", "kathmandoo"))
+    assert set(results) == {exact, close}
+    assert results[0].search_rank >= results[1].search_rank
+
+
+def test_fuzzy_pages_cross_equal_ranks_without_gaps():
+    jobs = [JobFactory(title="Django Developer") for _ in range(5)]
+    Job.objects.update(posted_at=jobs[0].posted_at)
+    search = normalize_search_params({"keyword": "djang", "match": "fuzzy"})
+
+    seen, cursor = [], None
+    while True:
+        page = get_job_page(search, cursor, per_page=2)
+        seen += [job.id for job in page]
+        if not page.has_next():
+            break
+        cursor = page.next_cursor
+
+    assert sorted(seen) == sorted(job.id for job in jobs)
+
+
+def test_fuzzy_search_skips_inactive_jobs():
+    JobFactory(title="Django Developer", is_active=False)
+    assert not Job.objects.fuzzy_search("django", None).exists()
+
+
+def test_jobs_apply_fuzzy_mode(client: Client):
+    job = JobFactory(title="Python Developer", location="Lalitpur")
+    url = reverse("jobs_apply")
+    response = client.get(url, {"keyword": "pyhton developer", "match": "fuzzy"})
+    assert response.status_code == 200
+    assert response.context["fuzzy"] is True
+    assert job in response.context["job_adverts"].object_list
+
+
+def test_facet_counts_in_one_query(django_assert_num_queries):
+    org = OrganizationFactory(name="Kite Labs")
+    JobFactory.create_batch(2, organization=org, job_type="FULL_TIME", location="Kathmandu")
+    JobFactory(job_type="CONTRACT", location="Pokhara")
+
+    with django_assert_num_queries(1):
+        facets = job_facet_counts(Job.objects.active())
+
+    assert {f["value"]: f["count"] for f in facets["job_type"]} == {"FULL_TIME": 2, "CONTRACT": 1}
+    assert {f["value"]: f["count"] for f in facets["location"]} == {"Kathmandu": 2, "Pokhara": 1}
+    assert facets["organization"][0] == {"value": str(org.id), "label": "Kite Labs", "count": 2}
+
+
+def test_jobs_apply_facet_filter(client: Client):
+    remote = JobFactory(job_type="CONTRACT")
+    JobFactory(job_type="FULL_TIME")
+    response = client.get(reverse("jobs_apply"), {"job_type": "CONTRACT"})
+    assert list(response.context["job_adverts"]) == [remote]
+    selected = [f for f in response.context["facets"]["job_type"] if f["selected"]]
+    assert selected[0]["value"] == "CONTRACT"
+
+
+def test_normalize_search_params_drops_noise():
+    search = normalize_search_params({"keyword": "  Python   Dev ", "job_type": "BOGUS", "org": "not-a-uuid"})
+    assert search["keyword"] == "python dev"
+    assert search["job_type"] == ""
+    assert search["org"] == ""
+
+
+def test_facet_counts_ignore_their_own_selection():
+    org = OrganizationFactory(name="Kite Labs")
+    JobFactory.create_batch(2, organization=org, job_type="FULL_TIME", location="Kathmandu")
+    JobFactory(organization=org, job_type="CONTRACT", location="Pokhara")
+    search = normalize_search_params({"job_type": "CONTRACT"})
+
+    facets = job_facet_counts(search_jobs(search, facets=False)[0], facet_filters(search))
+
+    # Other job types stay selectable; the other facets count contract jobs only
+    assert {f["value"]: f["count"] for f in facets["job_type"]} == {"FULL_TIME": 2, "CONTRACT": 1}
+    assert {f["value"]: f["count"] for f in facets["location"]} == {"Pokhara": 1}
+    assert facets["organization"][0]["count"] == 1
@@ -0,0 +1,37 @@
+import pytest
+from django.urls import reverse
+
+from accounts.models import User
+from application_tracking import message_search
+from application_tracking.tests.factories import OrganizationFactory
+from organization.models import Message
+
+
+def test_highlight_escapes_message_text_and_marks_matches():
+    headline = f"<b>salary</b> is {message_search.HIGHLIGHT_START}negotiable{message_search.HIGHLIGHT_STOP}"
+
+    assert message_search.highlight(headline) == "&lt;b&gt;salary&lt;/b&gt; is <mark>negotiable</mark>"
+
+
+@pytest.mark.django_db
+def test_search_is_ranked_filtered_and_scoped_to_the_user(client):
+    recruiter = User.objects.create(email="recruiter@example.com")
+    OrganizationFactory(admin_user=recruiter)
+    alice = User.objects.create(email="alice@example.com", first_name="Alice")
+    bob = User.objects.create(email="bob@example.com", first_name="Bob")
+    Message.objects.create(sender=recruiter, receiver=alice, content="Your technical interview is on Monday")
+    Message.objects.create(sender=bob, receiver=recruiter, content="Could we move the interview? Interview prep is taking longer")
+    Message.objects.create(sender=alice, receiver=bob, content="Good luck with the interview")  # not the recruiter's
+    Message.objects.create(sender=recruiter, receiver=alice, content="Welcome aboard")
+
+    results = list(message_search.search_messages(recruiter, "interview"))
+    assert [m.sender_id for m in results] == [bob.id, recruiter.id]
+    assert message_search.HIGHLIGHT_START in results[0].headline
+
+    assert [m.receiver_id for m in message_search.search_messages(recruiter, "interview", peer_id=alice.id)] == [alice.id]
+
+    client.force_login(recruiter)
+    response = client.get(reverse("org_message_search"), {"q": "interview", "applicant": alice.id})
+    assert response.status_code == 200
+    assert [m.peer for m in response.context["results"]] == [alice]
+    assert "<mark>interview</mark>" in response.content.decode()
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from application_tracking.models import Notification, NotificationPreference
+from application_tracking.notifications import notify
+from application_tracking.tasks import send_notification_digests
+
+EMAIL = ("Outcome", "emails/job_application_update.html", {"applicant_name": "A", "job_title": "Dev", "company_name": "Kite"})
+
+
+@pytest.mark.django_db
+def test_notify_emails_immediately_by_default(user_instance):
+    notify(user_instance, "Update", "Rejected", email=EMAIL)
+
+    assert Notification.objects.filter(user=user_instance).count() == 1
+    assert [m.to for m in mail.outbox] == [[user_instance.email]]
+
+
+@pytest.mark.django_db
+def test_digest_users_get_one_email_per_window(user_instance):
+    NotificationPreference.objects.create(user=user_instance, email_mode=NotificationPreference.DIGEST,
+                                          digest_window='HOURLY')
+    for i in range(3):
+        notify(user_instance, f"Update {i}", "Status changed", link="/adverts/my-applications/", email=EMAIL)
+    assert mail.outbox == []
+
+    assert send_notification_digests() == 1
+    assert len(mail.outbox) == 1
+    assert "3 new notifications" in mail.outbox[0].subject
+    assert "Update 2" in mail.outbox[0].body
+
+    # Still inside the window: nothing more goes out
+    notify(user_instance, "Later", "Status changed")
+    assert send_notification_digests() == 0
+
+    # An hour later: the digest covers what arrived since the last one
+    NotificationPreference.objects.filter(user=user_instance).update(
+        last_digest_at=timezone.now() - timedelta(hours=1, minutes=1)
+    )
+    Notification.objects.filter(user=user_instance).exclude(title="Later").update(
+        created_at=timezone.now() - timedelta(hours=2)
+    )
+    assert send_notification_digests() == 1
+    assert "1 new notification" in mail.outbox[-1].subject
+
+
+@pytest.mark.django_db
+def test_off_mode_sends_nothing(user_instance):
+    NotificationPreference.objects.create(user=user_instance, email_mode=NotificationPreference.OFF)
+    notify(user_instance, "Update", "Rejected", email=EMAIL)
+
+    assert send_notification_digests() == 0
+    assert mail.outbox == []
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from application_tracking.models import Notification, NotificationArchive
+from application_tracking.tasks import archive_read_notifications
+
+
+@pytest.mark.django_db
+def test_archive_moves_only_old_read_notifications(user_instance, settings):
+    settings.NOTIFICATION_RETENTION_DAYS = 30
+    old = timezone.now() - timedelta(days=31)
+    old_read = Notification.objects.create(user=user_instance, title="Old", message="m", is_read=True)
+    old_unread = Notification.objects.create(user=user_instance, title="Old unread", message="m")
+    recent_read = Notification.objects.create(user=user_instance, title="New", message="m", is_read=True)
+    Notification.objects.filter(id__in=[old_read.id, old_unread.id]).update(created_at=old)
+
+    assert archive_read_notifications(batch_size=1) == 1
+
+    assert set(Notification.objects.values_list("id", flat=True)) == {old_unread.id, recent_read.id}
+    assert NotificationArchive.objects.get(id=old_read.id).title == "Old"
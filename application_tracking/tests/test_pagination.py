@@ -0,0 +1,51 @@
+import pytest
+from django.urls import reverse
+
+from application_tracking.models import Notification
+from common.pagination import KeysetPaginator
+
+
+def test_garbled_cursor_is_ignored():
+    paginator = KeysetPaginator(Notification.objects.all(), 10, ordering=('-created_at', '-id'))
+    assert paginator.decode_cursor("not-a-cursor") == (None, None)
+    assert paginator.decode_cursor(None) == (None, None)
+
+
+@pytest.mark.django_db
+def test_walk_forward_and_back(user_instance):
+    Notification.objects.bulk_create(
+        [Notification(user=user_instance, title=f"N{i}", message="m") for i in range(25)]
+    )
+    paginator = KeysetPaginator(
+        Notification.objects.filter(user=user_instance), 10, ordering=('-created_at', '-id'), with_count=True
+    )
+
+    first = paginator.get_page()
+    assert len(first) == 10
+    assert first.has_next() and not first.has_previous()
+
+    second = paginator.get_page(first.next_cursor)
+    third = paginator.get_page(second.next_cursor)
+    assert len(third) == 5
+    assert not third.has_next()
+
+    seen = [n.id for page in (first, second, third) for n in page]
+    assert len(set(seen)) == 25
+
+    back = paginator.get_page(third.previous_cursor)
+    assert [n.id for n in back] == [n.id for n in second]
+    assert paginator.count == 25
+
+
+@pytest.mark.django_db
+def test_notifications_view_uses_cursor(authenticate_user_client):
+    client, user = authenticate_user_client
+    Notification.objects.bulk_create(
+        [Notification(user=user, title=f"N{i}", message="m") for i in range(12)]
+    )
+    response = client.get(reverse("notifications"))
+    page = response.context["notifications"]
+    assert len(page.object_list) == 10
+
+    response = client.get(reverse("notifications"), {"cursor": page.next_cursor})
+    assert len(response.context["notifications"].object_list) == 2
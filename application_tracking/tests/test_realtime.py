@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from application_tracking.models import Notification
+from application_tracking.stream_views import _event_stream, format_event
+from common.pubsub import InMemoryBroker
+
+
+def test_format_event():
+    assert format_event({"a": 1}, "unread") == 'event: unread\ndata: {"a": 1}\n\n'
+    assert format_event({"id": 7}, "notification", 7).startswith("id: 7\nevent: notification\n")
+
+
+def test_in_memory_broker_delivers_per_channel():
+    broker = InMemoryBroker()
+
+    async def run():
+        async with broker.subscribe("user:1") as subscription:
+            broker.publish("user:2", {"type": "unread"})
+            broker.publish("user:1", {"type": "unread", "notifications": 2})
+            return await subscription.get(timeout=1), await subscription.get(timeout=0.05)
+
+    assert asyncio.run(run()) == ({"type": "unread", "notifications": 2}, None)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stream_replays_after_last_event_id(user_instance):
+    seen = Notification.objects.create(user=user_instance, title="Seen", message="m")
+    missed = Notification.objects.create(user=user_instance, title="Missed", message="m")
+
+    async def first_events():
+        stream = _event_stream(user_instance.id, seen.id)
+        events = [await stream.__anext__() for _ in range(3)]
+        await stream.aclose()
+        return events
+
+    retry, replayed, snapshot = asyncio.run(first_events())
+    assert retry.startswith("retry:")
+    assert replayed.startswith(f"id: {missed.id}\nevent: notification")
+    assert '"notifications": 2' in snapshot
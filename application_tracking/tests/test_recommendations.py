@@ -0,0 +1,52 @@
+from collections import Counter
+
+import pytest
+
+from accounts.models import User
+from application_tracking import recommendations
+from application_tracking.models import Experience, JobApplication, JobRecommendation, Skill
+from application_tracking.tests.factories import JobFactory
+
+
+def test_top_k_ranks_by_cosine_and_skips_excluded_jobs():
+    jobs = recommendations.vectorize([
+        Counter({"python": 2, "django": 1}),
+        Counter({"java": 2, "spring": 1}),
+        Counter({"python": 1, "pandas": 1}),
+    ])
+    idf = recommendations.inverse_document_frequency(jobs)
+    jobs = recommendations.tfidf(jobs, idf)
+    candidates = recommendations.tfidf(recommendations.vectorize([
+        Counter({"python": 1, "django": 1}),
+        Counter({"java": 1, "python": 1}),
+    ]), idf)
+
+    [(start, columns, scores)] = recommendations.top_k(candidates, jobs, k=2, exclude={1: [1]})
+
+    assert start == 0
+    assert list(columns[0]) == [0, 2]
+    assert scores[0][0] > scores[0][1] > 0
+    assert 1 not in columns[1][scores[1] > 0]
+
+
+@pytest.mark.django_db
+def test_recompute_stores_top_matches_per_candidate():
+    python_job = JobFactory(title="Python Developer", requirements="Python, Django")
+    JobFactory(title="Java Engineer", requirements="Java, Spring")
+    applied_job = JobFactory(title="Django Engineer", requirements="Python, Django")
+
+    candidate = User.objects.create(email="candidate@example.com")
+    Skill.objects.create(user=candidate, name="Python")
+    Skill.objects.create(user=candidate, name="Django")
+    Experience.objects.create(user=candidate, job_title="Python Developer", company_name="Acme", start_date="2020-01-01")
+    JobApplication.objects.create(user=candidate, job=applied_job, name="C", email=candidate.email)
+    stale = User.objects.create(email="stale@example.com")
+    JobRecommendation.objects.create(user=stale, job=python_job, score=1, rank=1, computed_at="2020-01-01T00:00Z")
+
+    recommendations.recompute(k=2)
+
+    recommended = list(JobRecommendation.objects.filter(user=candidate).values_list("job_id", flat=True))
+    assert recommended[0] == python_job.id
+    assert applied_job.id not in recommended
+    assert not JobRecommendation.objects.filter(user=stale).exists()
+    assert recommendations.recommended_jobs(candidate)[0] == python_job
@@ -0,0 +1,34 @@
+import pytest
+
+from application_tracking import resume_match
+from application_tracking.tests.factories import JobFactory
+
+RESUME = "Backend developer with five years of Python and Django, building REST APIs on PostgreSQL."
+
+
+@pytest.mark.django_db
+def test_resume_is_ranked_locally_and_only_the_top_jobs_reach_the_llm(monkeypatch):
+    python_job = JobFactory(title="Python Developer", requirements="Python, Django, Docker")
+    django_job = JobFactory(title="Django Engineer", requirements="Django, PostgreSQL")
+    JobFactory(title="Java Engineer", requirements="Java, Spring")
+    JobFactory(title="Accountant", requirements="Excel", description="Bookkeeping")
+
+    prompted = []
+
+    def fake_match_score(resume_text, job_text):
+        prompted.append(job_text)
+        return {"score": 90 if "Django Engineer" in job_text else 60, "missing_skills": [], "reason": "ok"}
+
+    monkeypatch.setattr(resume_match, "get_match_score", fake_match_score)
+
+    results = resume_match.score_resume(RESUME, ai_top_k=2)
+
+    assert len(prompted) == 2
+    assert [r["job_id"] for r in results[:2]] == [django_job.id, python_job.id]
+    assert results[0]["ai_score"] == 90
+    assert "Docker" in results[1]["missing_skills"]
+    assert all(r["ai_score"] is None for r in results[2:])
+
+    # Same resume, same jobs: served from cache without new LLM calls
+    resume_match.score_resume(RESUME, ai_top_k=2)
+    assert len(prompted) == 2
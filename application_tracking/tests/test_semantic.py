@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from application_tracking import semantic
+from application_tracking.tests.factories import JobFactory
+
+DOCUMENTS = [
+    ("Python Developer", "Python, Django, PostgreSQL", "Build REST APIs with Django"),
+    ("Backend Engineer", "Django, Celery, Redis", "Python services and background jobs"),
+    ("Data Scientist", "Pandas, NumPy, statistics", "Train machine learning models"),
+    ("ML Engineer", "PyTorch, NumPy", "Deploy machine learning models"),
+    ("Accountant", "Excel, bookkeeping", "Prepare financial statements and audits"),
+    ("Finance Analyst", "Excel, forecasting", "Financial reporting and budgeting"),
+]
+
+
+def test_embeddings_place_related_texts_together():
+    embedder = semantic.Embedder.fit([semantic.job_features(*doc) for doc in DOCUMENTS], dim=4)
+    vectors = embedder.embed([semantic.job_features(*doc) for doc in DOCUMENTS])
+
+    assert vectors.shape == (len(DOCUMENTS), 4)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1, atol=1e-5)
+    similarity = vectors @ vectors.T
+    assert similarity[0, 1] > similarity[0, 4]
+    assert similarity[4, 5] > similarity[4, 2]
+
+
+def test_application_labels_are_stable_int64():
+    label = semantic.application_label("12345678-1234-5678-1234-567812345678")
+    assert label == semantic.application_label("12345678-1234-5678-1234-567812345678")
+    assert 0 <= label < 2 ** 63
+
+
+@pytest.mark.django_db
+def test_rebuild_and_incremental_add_answer_similar_jobs(settings, tmp_path):
+    pytest.importorskip("faiss")
+    settings.SEMANTIC_INDEX_DIR = str(tmp_path)
+    semantic._loaded.clear()
+    jobs = [JobFactory(title=title, requirements=requirements, description=description)
+            for title, requirements, description in DOCUMENTS]
+
+    assert semantic.rebuild() == (len(jobs), 0)
+    assert semantic.similar_jobs(jobs[4], k=1) == [jobs[5].id]
+
+    added = JobFactory(title="Senior Accountant", requirements="Excel, audits", description="Financial statements")
+    assert semantic.add_job(added.id)
+    semantic._loaded.clear()
+    assert added.id not in semantic.similar_jobs(jobs[4], k=2)  # queued, not merged yet
+
+    assert semantic.merge_pending() == {semantic.JOBS: 1, semantic.CANDIDATES: 0}
+    semantic._loaded.clear()
+    assert added.id in semantic.similar_jobs(jobs[4], k=2)
@@ -0,0 +1,59 @@
+import pytest
+
+from accounts.models import User
+from application_tracking.models import CanonicalSkill, Notification, Skill, SkillSynonym, normalize_skill
+from application_tracking.tests.factories import JobAdvertFactory
+from application_tracking.tasks import notify_relevant_users
+
+
+def test_normalize_skill():
+    assert normalize_skill("  Node   JS, ") == "node js"
+    assert normalize_skill("PYTHON") == normalize_skill("python")
+
+
+@pytest.mark.django_db
+def test_skills_resolve_through_synonyms_and_case():
+    javascript = CanonicalSkill.objects.get(key="javascript")
+    user = User.objects.create(email="dev@example.com")
+
+    assert Skill.objects.create(user=user, name="JS").canonical == javascript
+    assert Skill.objects.create(user=user, name="javaSCRIPT").canonical == javascript
+    assert SkillSynonym.objects.filter(alias="js", canonical=javascript).exists()
+
+    new_skill = Skill.objects.create(user=user, name="Elixir ")
+    assert new_skill.canonical.name == "Elixir"
+    assert CanonicalSkill.objects.lookup(["elixir", "unknown"]) == {"elixir": new_skill.canonical_id}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_new_advert_notifies_candidates_with_synonymous_skills(user_instance):
+    candidate = User.objects.create(email="candidate@example.com")
+    Skill.objects.create(user=candidate, name="Postgres")
+    Skill.objects.create(user=candidate, name="k8s")
+    Skill.objects.create(user=User.objects.create(email="other@example.com"), name="PHP")
+
+    advert = JobAdvertFactory(created_by=user_instance, skills="PostgreSQL, Kubernetes")
+    notify_relevant_users(advert)
+
+    assert list(Notification.objects.values_list("user_id", flat=True)) == [candidate.id]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_fan_out_resumes_without_duplicates(user_instance):
+    from application_tracking.tasks import fan_out_job_match
+
+    candidates = [User.objects.create(email=f"c{i}@example.com") for i in range(5)]
+    for candidate in candidates:
+        Skill.objects.create(user=candidate, name="Python")
+    advert = JobAdvertFactory(created_by=user_instance, skills="python")
+
+    fanout = notify_relevant_users(advert)
+    fanout.refresh_from_db()
+    assert (fanout.status, fanout.matched_users) == ("DONE", 5)
+
+    # A re-run of the same posting (e.g. a retried worker) notifies no one twice
+    fanout.status = "RUNNING"
+    fanout.last_user_id = None
+    fanout.save()
+    fan_out_job_match(fanout.id, chunk_size=2)
+    assert Notification.objects.count() == 5
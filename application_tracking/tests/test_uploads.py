@@ -0,0 +1,49 @@
+import pytest
+from django.urls import reverse
+
+from application_tracking.models import StoredFile
+
+CONTENT = b"def solve():\n    return 42\n" * 10
+
+
+@pytest.fixture
+def upload_dirs(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.UPLOAD_TMP_DIR = str(tmp_path / "tmp")
+    settings.UPLOAD_CHUNK_SIZE = 100
+
+
+def upload(client, data, filename="solution.py"):
+    start = client.post(reverse("upload_start"), {"filename": filename, "size": len(data)}).json()
+    url = reverse("upload_chunk", args=[start["upload_id"]])
+    state = start
+    while not state["complete"]:
+        chunk = data[state["offset"]:state["offset"] + state["chunk_size"]]
+        state = client.put(f"{url}?offset={state['offset']}", chunk, content_type="application/octet-stream").json()
+    return state
+
+
+@pytest.mark.django_db
+def test_chunked_upload_resumes_and_deduplicates(upload_dirs, authenticate_user_client):
+    client, _user = authenticate_user_client
+
+    start = client.post(reverse("upload_start"), {"filename": "solution.py", "size": len(CONTENT)}).json()
+    url = reverse("upload_chunk", args=[start["upload_id"]])
+    client.put(f"{url}?offset=0", CONTENT[:100], content_type="application/octet-stream")
+
+    # A retried chunk at a stale offset is refused with the offset to resume from
+    stale = client.put(f"{url}?offset=0", CONTENT[:100], content_type="application/octet-stream")
+    assert stale.status_code == 409
+    assert stale.json()["offset"] == 100
+    assert client.get(url).json()["offset"] == 100
+
+    for offset in range(100, len(CONTENT), 100):
+        state = client.put(f"{url}?offset={offset}", CONTENT[offset:offset + 100],
+                           content_type="application/octet-stream").json()
+    assert state["complete"]
+
+    # Same bytes under another name: no second copy
+    assert upload(client, CONTENT, filename="copy.py")["complete"]
+    stored = StoredFile.objects.get()
+    assert stored.size == len(CONTENT)
+    assert stored.file.read() == CONTENT
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .models import StoredFile, UploadSession
+
+# Chunked, resumable attachment uploads with content deduplication.
+#
+#   start()        POST api/uploads/                 -> upload id, offset 0
+#   get_session()  GET  api/uploads/<id>/            -> bytes received so far
+#   write_chunk()  PUT  api/uploads/<id>/?offset=n   -> next offset; the last
+#                  chunk hashes the file and links a StoredFile
+#
+# Partial files live in UPLOAD_TMP_DIR. Finished content is stored once per
+# SHA-256 (computed here, never trusted from the client) and forms reference
+# it with a hidden "<field>_upload" input; attach() copies the stored name
+# onto the model's FileField, so no bytes are duplicated.
+
+READ_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def tmp_path(upload):
+    return os.path.join(settings.UPLOAD_TMP_DIR, f"{upload.id}.part")
+
+
+# =================================================
+# 1. SESSIONS & CHUNKS
+# =================================================
+def start(user, filename, size):
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("Invalid file size.")
+    if size <= 0:
+        raise UploadError("The file is empty.")
+    if size > settings.UPLOAD_MAX_SIZE:
+        raise UploadError(f"Files can be at most {settings.UPLOAD_MAX_SIZE // (1024 * 1024)} MB.", status=413)
+    filename = get_valid_filename(os.path.basename(filename or ""))[:150] or "upload"
+    return UploadSession.objects.create(user=user, filename=filename, size=size)
+
+
+def get_session(user, upload_id):
+    return UploadSession.objects.filter(id=upload_id, user=user).select_related('stored_file').first()
+
+
+def write_chunk(user, upload_id, offset, stream, length):
+    """
+    Writes `length` bytes from `stream` at `offset`. Chunks must arrive in
+    order; a mismatched offset raises with the offset to resume from.
+    """
+    if length <= 0 or length > settings.UPLOAD_CHUNK_SIZE:
+        raise UploadError(f"Chunks must be 1-{settings.UPLOAD_CHUNK_SIZE} bytes.")
+
+    with transaction.atomic():
+        # The row lock serializes retries racing the original request
+        upload = UploadSession.objects.select_for_update().filter(id=upload_id, user=user).first()
+        if upload is None:
+            raise UploadError("Upload not found.", status=404)
+        if upload.is_complete:
+            return upload
+        if offset != upload.received:
+            raise UploadError("Unexpected offset.", status=409, offset=upload.received)
+        if offset + length > upload.size:
+            raise UploadError("Chunk runs past the declared size.")
+
+        os.makedirs(settings.UPLOAD_TMP_DIR, exist_ok=True)
+        path = tmp_path(upload)
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.seek(offset)
+            remaining = length
+            while remaining:
+                data = stream.read(min(READ_SIZE, remaining))
+                if not data:
+                    raise UploadError("Chunk ended early.", offset=upload.received)
+                f.write(data)
+                remaining -= len(data)
+            f.truncate()  # drop bytes left by a failed earlier attempt
+
+        upload.received = offset + length
+        if upload.received == upload.size:
+            upload.stored_file = store(path, upload.filename, upload.size)
+        upload.save(update_fields=['received', 'stored_file', 'updated_at'])
+
+    if upload.is_complete:
+        os.remove(path)
+    return upload
+
+
+# =================================================
+# 2. CONTENT-ADDRESSED STORAGE
+# =================================================
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(READ_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def store(path, filename, size):
+    """The StoredFile for the file at `path`, saving it only if the content is new."""
+    sha256 = file_sha256(path)
+    existing = StoredFile.objects.filter(sha256=sha256).first()
+    if existing:
+        return existing
+
+    stored = StoredFile(sha256=sha256, size=size)
+    with open(path, "rb") as f:
+        stored.file.save(filename, File(f), save=False)
+    try:
+        with transaction.atomic():
+            stored.save()
+    except IntegrityError:
+        # Someone finished the same content first
+        stored.file.delete(save=False)
+        return StoredFile.objects.get(sha256=sha256)
+    return stored
+
+
+# =================================================
+# 3. USING A FINISHED UPLOAD
+# =================================================
+def attach(request, instance, field_name):
+    """
+    Points `instance.<field_name>` at the finished upload named by the
+    "<field_name>_upload" POST value. Returns True when one was attached.
+    """
+    upload_id = request.POST.get(f"{field_name}_upload")
+    if not upload_id:
+        return False
+    try:
+        upload_id = uuid.UUID(upload_id)
+    except ValueError:
+        return False
+    upload = get_session(request.user, upload_id)
+    if upload is None or not upload.is_complete:
+        return False
+    setattr(instance, field_name, upload.stored_file.file.name)
+    return True
+
+
+def purge_stale(now=None):
+    """
+    Deletes sessions older than UPLOAD_SESSION_TTL_HOURS and the partial files
+    of unfinished ones. StoredFiles stay; rows that used them keep working.
+    """
+    cutoff = (now or timezone.now()) - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+    stale = UploadSession.objects.filter(created_at__lt=cutoff)
+    for upload in stale.filter(stored_file__isnull=True).iterator():
+        try:
+            os.remove(tmp_path(upload))
+        except FileNotFoundError:
+            pass
+    deleted, _ = stale.delete()
+    return deleted
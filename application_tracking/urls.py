@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views, ai_views
+from . import views, ai_views, stream_views
 
 urlpatterns = [
     # ====================================================
@@ -7,6 +7,7 @@ urlpatterns = [
     # ====================================================
     path('interview-ai/start/<uuid:application_id>/', ai_views.start_ai_interview, name='start_ai_interview'),
     path('api/interview-ai/<uuid:application_id>/chat/', ai_views.ai_chat_api, name='ai_chat_api'),
+    path('api/interview-ai/<uuid:application_id>/history/', views.ai_interview_history_api, name='ai_interview_history_api'),
     path('interview-ai/end/<uuid:application_id>/', ai_views.end_ai_interview, name='end_ai_interview'),
     path('interview/task/<uuid:application_id>/', ai_views.user_task_view, name='user_task_view'),
 
@@ -23,6 +24,7 @@ urlpatterns = [
     path('notifications/', views.notifications_view, name='notifications'),
     path('notifications/mark-read/<int:notification_id>/', views.mark_notification_read, name='mark_notification_read'),
     path('notifications/mark-all-read/', views.mark_all_read, name='mark_all_read'),
+    path('notifications/stream/', stream_views.notification_stream, name='notification_stream'),
 
     # Dashboard & Profile
     path("dashboard/", views.dashboard, name="dashboard"),
@@ -39,6 +41,12 @@ urlpatterns = [
     path("create/", views.create_advert, name="create_advert"),
     path("search/", views.search, name="search"),
     path('apply/', views.jobs_apply, name='jobs_apply'),
+    path('api/autocomplete/', views.autocomplete, name='autocomplete'),
+    path('api/job-cache-stats/', views.job_cache_stats, name='job_cache_stats'),
+    path('api/score-all-jobs/', views.score_all_jobs, name='score_all_jobs'),
+    path('api/chat/<uuid:peer_id>/history/', views.chat_history_api, name='chat_history_api'),
+    path('api/uploads/', views.upload_start, name='upload_start'),
+    path('api/uploads/<uuid:upload_id>/', views.upload_chunk, name='upload_chunk'),
 
     # ====================================================
     # 2. INTEGER ID PATHS (New System)
@@ -1,17 +1,21 @@
 import json
 import uuid  
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.http import HttpRequest, HttpResponseForbidden, JsonResponse
+from django.db import transaction
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpRequest, HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
-from django.db.models import Q
+from django.views.decorators.cache import cache_control
 from django.views.decorators.http import require_POST
 from django.urls import reverse
 
 from accounts.models import User
 from application_tracking.enums import ApplicationStatus
+from common.pagination import KeysetPaginator
 from common.tasks import send_email
 
 # Import Job & Organization Models
@@ -26,6 +30,7 @@ from .forms import (
     ExperienceForm, 
     EducationForm, 
     SkillForm,
+    NotificationPreferenceForm,
     TaskSubmissionForm,
     CandidateMessageForm
 )
@@ -37,9 +42,23 @@ from .models import (
     Experience, 
     Education, 
     Skill,
-    Notification
+    Notification,
+    NotificationArchive,
+    NotificationPreference
 )
 
+from . import autocomplete as autocomplete_index
+from . import chat_history
+from . import counters
+from . import job_cache
+from . import semantic
+from . import uploads
+from .chat_socket import can_chat, mark_read
+from .notifications import notify
+from .recommendations import recommended_jobs
+from .resume_match import score_resume
+from .search import facet_links, get_job_facets, get_job_page, normalize_search_params
+from .tasks import notify_relevant_users
 from .utils import (
     extract_text_from_file, 
     get_match_score, 
@@ -47,54 +66,47 @@ from .utils import (
     get_learning_resources
 )
 
-# --- HELPER: NOTIFICATIONS ---
-def notify_relevant_users(job_instance):
-    # Safe check for skills attribute
-    if not hasattr(job_instance, 'skills') or not job_instance.skills:
-        return
-
-    job_skills = [s.strip() for s in job_instance.skills.split(',') if s.strip()]
-    if not job_skills: return
-
-    if hasattr(job_instance, 'organization'):
-        creator_id = job_instance.organization.admin_user.id
-    elif hasattr(job_instance, 'created_by'):
-        creator_id = job_instance.created_by.id
-    else:
-        creator_id = None
-
-    matched_candidates = User.objects.filter(
-        user_skills__name__in=job_skills
-    ).exclude(id=creator_id).distinct()
-
-    notifications_to_create = []
-    for user in matched_candidates:
-        notifications_to_create.append(
-            Notification(
-                user=user,
-                title=f"New Job Match: {job_instance.title}",
-                message=f"A new opening matches your skill set.",
-                link=f"/job/{job_instance.id}/"
-            )
-        )
-    if notifications_to_create:
-        Notification.objects.bulk_create(notifications_to_create)
-
-
 # ---------------------------------------------------
 # 1. HOME PAGE
 # ---------------------------------------------------
 def home(request: HttpRequest):
-    active_jobs = Job.objects.filter(is_active=True).order_by('-posted_at')[:6]
-    return render(request, "home.html", {"jobs": active_jobs})
+    # Served from the versioned job cache; any Job save/delete refreshes it
+    active_jobs = job_cache.get_or_compute(
+        "home-jobs", [job_cache.get_version(job_cache.ALL_JOBS)], None,
+        lambda: list(Job.objects.active().select_related('organization').order_by('-posted_at', '-id')[:6])
+    )
+    # Precomputed nightly by tasks.recompute_recommendations; this is an index read
+    recommended = recommended_jobs(request.user) if request.user.is_authenticated else []
+    return render(request, "home.html", {"jobs": active_jobs, "recommended_jobs": recommended})
 
 
 # ---------------------------------------------------
 # 2. JOB DETAIL & APPLICATION
 # ---------------------------------------------------
 def job_detail(request, job_id):
-    job = get_object_or_404(Job, id=job_id, is_active=True)
-    return render(request, 'job_detail.html', {'job': job})
+    job = job_cache.get_or_compute(
+        "job-detail", [job_cache.get_version("job", job_id)], job_id,
+        lambda: Job.objects.active().select_related('organization').filter(id=job_id).first()
+    )
+    if job is None:
+        raise Http404("No Job matches the given query.")
+    similar = semantic.similar_jobs(job)
+    similar_jobs = sorted(Job.objects.active().select_related('organization').filter(id__in=similar),
+                          key=lambda j: similar.index(j.id))
+    return render(request, 'job_detail.html', {'job': job, 'similar_jobs': similar_jobs})
+
+
+@cache_control(public=True, max_age=300)
+def autocomplete(request):
+    """Typeahead for the job search box (?scope=jobs) and the skill input (?scope=skills)."""
+    suggestions = autocomplete_index.suggest(request.GET.get('scope', 'jobs'), request.GET.get('q', ''))
+    return JsonResponse({'status': 'success', 'data': suggestions})
+
+
+@staff_member_required
+def job_cache_stats(request):
+    """Hit/miss counters for the public job caches."""
+    return JsonResponse({'status': 'success', 'data': job_cache.hit_rates()})
 
 def apply_job(request, job_id):
     job = get_object_or_404(Job, id=job_id, is_active=True)
@@ -111,15 +123,10 @@ def apply_job(request, job_id):
             application.job = job 
             if request.user.is_authenticated:
                 application.user = request.user
-            application.save()
-
-            if request.user.is_authenticated:
-                Notification.objects.create(
-                    user=request.user,
-                    title=f"Applied: {job.title}",
-                    message=f"Success! You applied to {job.organization.name}.",
-                    link=reverse('my_applications')
-                )
+            # Saved with its ApplicationSubmitted event; the "Applied"
+            # notification follows from that (event_handlers.py)
+            with transaction.atomic():
+                application.save()
 
             messages.success(request, "Application submitted successfully!")
             return redirect("job_detail", job_id=job.id)
@@ -156,10 +163,12 @@ def user_interview_room(request, application_id):
             task_form = TaskSubmissionForm(request.POST, request.FILES, instance=application)
             if task_form.is_valid():
                 app = task_form.save(commit=False)
+                uploads.attach(request, app, 'task_submission')
                 app.task_submitted_at = timezone.now()
                 app.save()
                 
                 if org_user:
+                    # Points at the same stored file; nothing is copied
                     Message.objects.create(
                         sender=request.user,
                         receiver=org_user,
@@ -174,25 +183,29 @@ def user_interview_room(request, application_id):
             chat_form = CandidateMessageForm(request.POST, request.FILES)
             if chat_form.is_valid():
                 msg = chat_form.save(commit=False)
+                uploads.attach(request, msg, 'attachment')
                 msg.sender = request.user
                 msg.receiver = org_user
                 msg.save()
                 return redirect('user_interview_room', application_id=application.id)
 
+    history = chat_history.message_page(request.user, org_user) if org_user else None
     if org_user:
-        chat_history = Message.objects.filter(
-            Q(sender=request.user, receiver=org_user) | 
-            Q(sender=org_user, receiver=request.user)
-        ).order_by('timestamp')
-        Message.objects.filter(sender=org_user, receiver=request.user, is_read=False).update(is_read=True)
-    else:
-        chat_history = []
+        mark_read(request.user.id, org_user.id)
+
+    ai_session = application.get_active_interview_session()
+    ai_history = chat_history.ai_log_page(ai_session) if ai_session else None
 
     context = {
         'application': application,
-        'chat_history': chat_history,
+        'chat_history': history.items if history else [],
+        'older_cursor': history.older_cursor if history else "",
+        'ai_session': ai_session,
+        'ai_logs': ai_history.items if ai_history else [],
+        'ai_older_cursor': ai_history.older_cursor if ai_history else "",
         'task_form': task_form,
-        'chat_form': chat_form
+        'chat_form': chat_form,
+        'org_user': org_user
     }
     return render(request, 'user_interview_room.html', context)
 
@@ -221,10 +234,9 @@ def advert_applications(request: HttpRequest, advert_id):
             job = Job.objects.get(pk=advert_id)
             if job.organization.admin_user != request.user:
                 return HttpResponseForbidden("Permission denied.")
-            applications = job.applications.all().order_by('-created_at')
-            paginator = Paginator(applications, 10)
+            paginator = KeysetPaginator(job.applications.all(), 10, ordering=('-created_at', '-id'))
             return render(request, "advert_applications.html", {
-                "applications": paginator.get_page(request.GET.get("page")), 
+                "applications": paginator.get_page(request.GET.get("cursor")), 
                 "advert": job 
             })
     except Job.DoesNotExist:
@@ -236,10 +248,9 @@ def advert_applications(request: HttpRequest, advert_id):
         advert = get_object_or_404(JobAdvert, pk=uuid_obj)
         if request.user != advert.created_by: 
             return HttpResponseForbidden()
-        applications = advert.applications.all()
-        paginator = Paginator(applications, 10)
+        paginator = KeysetPaginator(advert.applications.all(), 10, ordering=('-created_at', '-id'))
         return render(request, "advert_applications.html", {
-            "applications": paginator.get_page(request.GET.get("page")), 
+            "applications": paginator.get_page(request.GET.get("cursor")), 
             "advert": advert
         })
     except ValueError:
@@ -334,6 +345,17 @@ def decide(request: HttpRequest, job_application_id):
         applicant_user = User.objects.filter(email=job_application.email).first()
         title = job_application.job.title if job_application.job else job_application.job_advert.title
         
+        email = None
+        if status == ApplicationStatus.REJECTED:
+            company = job_application.job.organization.name if job_application.job else job_application.job_advert.company_name
+            
+            context = {
+                "applicant_name": job_application.name,
+                "job_title": title,
+                "company_name": company,
+            }
+            email = (f"Application Outcome for {title}", "emails/job_application_update.html", context)
+
         if applicant_user:
             msg = f"Your application for {title} was updated to: {status}."
             if status == ApplicationStatus.ACCEPTED:
@@ -341,30 +363,14 @@ def decide(request: HttpRequest, job_application_id):
             elif status == ApplicationStatus.REJECTED:
                 msg = f"Update: Your application for {title} was not successful."
 
-            Notification.objects.create(
-                user=applicant_user,
-                title="Application Status Update",
-                message=msg,
-                link=reverse('my_applications')
-            )
+            # Emails follow the applicant's preference (immediate, digest or off)
+            notify(applicant_user, "Application Status Update", msg, reverse('my_applications'), email=email)
+        elif email:
+            # No account, so no preference: email the address on the application
+            subject, html_template, context = email
+            send_email.delay(subject, [job_application.email], html_template, context)
 
         messages.success(request, f"Application status updated to {status}")
-
-        if status == ApplicationStatus.REJECTED:
-            job_title = job_application.job.title if job_application.job else job_application.job_advert.title
-            company = job_application.job.organization.name if job_application.job else job_application.job_advert.company_name
-            
-            context = {
-                "applicant_name": job_application.name,
-                "job_title": job_title,
-                "company_name": company,
-            }
-            send_email.delay(
-                f"Application Outcome for {job_title}",
-                [job_application.email],
-                "emails/job_application_update.html",
-                context
-            )
         return redirect(request.META.get('HTTP_REFERER', 'dashboard'))
 
 @login_required
@@ -385,26 +391,21 @@ def create_advert(request: HttpRequest):
 # ✅ APPLY PAGE
 # ---------------------------------------------------
 def jobs_apply(request: HttpRequest):
-    jobs = Job.objects.filter(is_active=True).order_by('-posted_at')
-    
-    keyword = request.GET.get("keyword")
-    location = request.GET.get("location")
-    
-    if keyword:
-        jobs = jobs.filter(
-            Q(title__icontains=keyword) | 
-            Q(organization__name__icontains=keyword)
-        )
-    if location:
-        jobs = jobs.filter(location__icontains=location)
-        
-    paginator = Paginator(jobs, 9)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    search = normalize_search_params(request.GET)
+    page_obj = get_job_page(search, request.GET.get("cursor"))
+
+    # Querystring without the cursor, for pagination links
+    query = request.GET.copy()
+    query.pop("cursor", None)
     
     return render(request, "jobs_apply.html", {
         "job_adverts": page_obj, 
-        "keyword": keyword,
-        "location": location
+        "keyword": request.GET.get("keyword"),
+        "location": request.GET.get("location"),
+        # "fuzzy" = pg_trgm similarity match, ranked by closeness (tolerates typos)
+        "fuzzy": search["fuzzy"],
+        "facets": facet_links(request, get_job_facets(search)),
+        "query_string": query.urlencode(),
     })
 
 def search(request: HttpRequest):
@@ -524,26 +525,115 @@ def analyze_resume(request, advert_id):
             
     return JsonResponse({'status': 'error', 'message': 'Invalid request'})
 
+
+@login_required
+@require_POST
+def score_all_jobs(request):
+    """Scores one resume against every open job (local ranking, LLM on the top few only)."""
+    uploaded_file = request.FILES.get('resume')
+    if not uploaded_file:
+        return JsonResponse({'status': 'error', 'message': 'Please upload a resume.'})
+
+    resume_text = extract_text_from_file(uploaded_file)
+    if not resume_text or len(resume_text) < 50:
+        return JsonResponse({'status': 'error', 'message': 'Could not extract text. Please upload a clear PDF or DOCX.'})
+
+    results = score_resume(resume_text)
+    for result in results:
+        result['url'] = reverse('job_detail', kwargs={'job_id': result['job_id']})
+    return JsonResponse({'status': 'success', 'data': results})
+
+
+@login_required
+def chat_history_api(request, peer_id):
+    """Older chat messages for infinite scroll: ?cursor= from the page or the previous call."""
+    peer = get_object_or_404(User, id=peer_id)
+    if not can_chat(request.user.id, peer.id):
+        return JsonResponse({'status': 'error', 'message': 'Not allowed'}, status=403)
+    page = chat_history.message_page(request.user, peer, request.GET.get('cursor'))
+    return JsonResponse({'status': 'success', **chat_history.as_json(page)})
+
+
+@login_required
+def ai_interview_history_api(request, application_id):
+    application = get_object_or_404(JobApplication, id=application_id, user=request.user)
+    session = application.get_active_interview_session()
+    if not session:
+        return JsonResponse({'status': 'error', 'message': 'No active interview'}, status=404)
+    page = chat_history.ai_log_page(session, request.GET.get('cursor'))
+    return JsonResponse({'status': 'success', **chat_history.as_json(page, chat_history.ai_log_payload)})
+
+# ---------------------------------------------------
+# CHUNKED UPLOADS (see uploads.py)
+# ---------------------------------------------------
+def _upload_json(upload):
+    return JsonResponse({
+        'status': 'success',
+        'upload_id': str(upload.id),
+        'offset': upload.received,
+        'complete': upload.is_complete,
+        'chunk_size': settings.UPLOAD_CHUNK_SIZE,
+    })
+
+
+@login_required
+@require_POST
+def upload_start(request):
+    try:
+        upload = uploads.start(request.user, request.POST.get('filename'), request.POST.get('size'))
+    except uploads.UploadError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=e.status)
+    return _upload_json(upload)
+
+
+@login_required
+def upload_chunk(request, upload_id):
+    """GET: how much has arrived (to resume). PUT ?offset=n: the next chunk as the raw body."""
+    if request.method == 'GET':
+        upload = uploads.get_session(request.user, upload_id)
+        if upload is None:
+            return JsonResponse({'status': 'error', 'message': 'Upload not found.'}, status=404)
+        return _upload_json(upload)
+    if request.method != 'PUT':
+        return JsonResponse({'status': 'error', 'message': 'Method not allowed.'}, status=405)
+
+    try:
+        offset = int(request.GET.get('offset', ''))
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid offset.'}, status=400)
+    try:
+        upload = uploads.write_chunk(request.user, upload_id, offset, request, length)
+    except uploads.UploadError as e:
+        return JsonResponse({'status': 'error', 'message': str(e), 'offset': e.offset}, status=e.status)
+    return _upload_json(upload)
+
+
 @login_required
 def notifications_view(request):
-    all_notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
-    paginator = Paginator(all_notifications, 10)
-    return render(request, "notifications.html", {"notifications": paginator.get_page(request.GET.get('page'))})
+    # Read notifications past the retention window live in the archive table
+    archived = request.GET.get('archived') == '1'
+    model = NotificationArchive if archived else Notification
+    paginator = KeysetPaginator(model.objects.filter(user=request.user), 10, ordering=('-created_at', '-id'))
+    return render(request, "notifications.html", {
+        "notifications": paginator.get_page(request.GET.get('cursor')),
+        "archived": archived,
+    })
 
 @login_required
 @require_POST
 def mark_notification_read(request, notification_id):
-    try:
-        notification = Notification.objects.get(id=notification_id, user=request.user)
-        notification.is_read = True
-        notification.save()
-        return JsonResponse({'status': 'success'})
-    except Notification.DoesNotExist:
+    notifications = Notification.objects.filter(id=notification_id, user=request.user)
+    if not notifications.exists():
         return JsonResponse({'status': 'error', 'message': 'Not found'}, status=404)
+    marked = notifications.filter(is_read=False).update(is_read=True)
+    counters.adjust(counters.NOTIFICATIONS, request.user.id, -marked)
+    return JsonResponse({'status': 'success'})
 
 @login_required
 def mark_all_read(request):
-    Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+    marked = Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+    counters.adjust(counters.NOTIFICATIONS, request.user.id, -marked)
     messages.success(request, "All notifications marked as read.")
     return redirect('notifications')
 
@@ -561,9 +651,9 @@ def apply(request: HttpRequest, advert_id):
 
 @login_required
 def my_applications(request: HttpRequest):
-    applications = JobApplication.objects.filter(user=request.user).order_by('-created_at')
-    paginator = Paginator(applications, 10)
-    return render(request, "my_applications.html", {"my_applications": paginator.get_page(request.GET.get("page"))})
+    applications = JobApplication.objects.filter(user=request.user)
+    paginator = KeysetPaginator(applications, 10, ordering=('-created_at', '-id'))
+    return render(request, "my_applications.html", {"my_applications": paginator.get_page(request.GET.get("cursor"))})
 
 
 # ---------------------------------------------------
@@ -598,6 +688,8 @@ def org_setup_prompt(request):
 def profile_view(request):
     user = request.user
     profile, created = UserProfile.objects.get_or_create(user=user)
+    preference = (NotificationPreference.objects.filter(user=user).first()
+                  or NotificationPreference(user=user, email_mode=settings.NOTIFICATION_DEFAULT_EMAIL_MODE))
     if request.method == 'POST':
         if 'edit_profile' in request.POST:
             profile_form = UserProfileForm(request.POST, request.FILES, instance=profile)
@@ -620,6 +712,9 @@ def profile_view(request):
                 skill = skill_form.save(commit=False)
                 skill.user = user
                 skill.save()
+        elif 'update_notification_prefs' in request.POST:
+            pref_form = NotificationPreferenceForm(request.POST, instance=preference)
+            if pref_form.is_valid(): pref_form.save()
         return redirect('user_profile')
 
     context = {
@@ -632,5 +727,6 @@ def profile_view(request):
         'exp_form': ExperienceForm(),
         'edu_form': EducationForm(),
         'skill_form': SkillForm(),
+        'pref_form': NotificationPreferenceForm(instance=preference),
     }
     return render(request, "profile.html", context)
\ No newline at end of file
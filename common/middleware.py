@@ -3,6 +3,21 @@ from django.conf import settings
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.utils.cache import patch_vary_headers
 
+def session_cookie_name(host):
+    """Session cookie name for a Host header value (also used by the chat websocket)."""
+    default_name = settings.SESSION_COOKIE_NAME
+    host = host.split(':')[0]
+    
+    # Create a unique suffix safe for cookie names
+    suffix = host.replace('.', '_').replace(':', '')
+    
+    # Only modify for local dev environments to avoid production weirdness
+    if host in ['localhost', '127.0.0.1', 'testserver']:
+        return f"{default_name}_{suffix}"
+        
+    return default_name
+
+
 class HostIsolatedSessionMiddleware(SessionMiddleware):
     """
     Extends SessionMiddleware to use different cookie names based on the Host header.
@@ -10,17 +25,7 @@ class HostIsolatedSessionMiddleware(SessionMiddleware):
     """
     
     def _get_cookie_name(self, request):
-        default_name = settings.SESSION_COOKIE_NAME
-        host = request.get_host().split(':')[0]
-        
-        # Create a unique suffix safe for cookie names
-        suffix = host.replace('.', '_').replace(':', '')
-        
-        # Only modify for local dev environments to avoid production weirdness
-        if host in ['localhost', '127.0.0.1', 'testserver']:
-            return f"{default_name}_{suffix}"
-            
-        return default_name
+        return session_cookie_name(request.get_host())
 
     def process_request(self, request):
         # Override to use dynamic cookie name
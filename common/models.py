@@ -1,9 +1,76 @@
+import copy
 import uuid
 
 from django.db import models
+from django.db.models import DEFERRED
+from django.db.models.fields.files import FieldFile
 
 
-class BaseModel(models.Model):
+class ChangeTrackingMixin:
+    """
+    Remembers the field values a row was loaded (or last saved) with, so
+    signal handlers can ask `has_changed("status")` / `previous("status")`
+    instead of re-fetching the row in pre_save.
+
+    The snapshot is taken in from_db() and refreshed after save(), so
+    post_save handlers still compare against the pre-save values. Unsaved
+    rows and fields that were deferred when loading count as changed.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot(field_names)
+        return instance
+
+    def _snapshot(self, attnames):
+        loaded = self.__dict__.setdefault('_loaded_values', {})
+        for attname in attnames:
+            value = self.__dict__.get(attname, DEFERRED)
+            if value is DEFERRED:
+                continue
+            # Copy mutable values (JSON, files) so in-place edits still show up
+            if isinstance(value, FieldFile):
+                value = value.name
+            elif isinstance(value, (dict, list)):
+                value = copy.deepcopy(value)
+            loaded[attname] = value
+
+    def _attname(self, field):
+        return self._meta.get_field(field).attname
+
+    def previous(self, field):
+        """The value `field` was loaded with; None for unsaved rows."""
+        return self.__dict__.get('_loaded_values', {}).get(self._attname(field))
+
+    def has_changed(self, field):
+        attname = self._attname(field)
+        loaded = self.__dict__.get('_loaded_values', {})
+        if attname not in loaded:
+            return True
+        return getattr(self, attname) != loaded[attname]
+
+    def changed_fields(self):
+        """Names of the concrete fields whose value differs from the snapshot (auto_now fields aside)."""
+        return {f.name for f in self._meta.concrete_fields
+                if not getattr(f, 'auto_now', False) and self.has_changed(f.name)}
+
+    def _concrete_attnames(self, names=None):
+        fields = self._meta.concrete_fields
+        if names is not None:
+            fields = [f for f in fields if f.name in names or f.attname in names]
+        return [f.attname for f in fields]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot(self._concrete_attnames(kwargs.get('update_fields')))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot(self._concrete_attnames(fields))
+
+
+class BaseModel(ChangeTrackingMixin, models.Model):
     id = models.UUIDField(primary_key=True, editable=False, default=uuid.uuid4)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,167 @@
+import base64
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class KeysetPaginator:
+    """
+    Cursor (keyset) pagination: pages are fetched with
+    `WHERE (posted_at, id) < (last_seen) ORDER BY ... LIMIT n` instead of
+    `OFFSET`, so page 500 costs the same as page 1 and no COUNT(*) is needed.
+
+    `ordering` must end in a unique field (usually "-id") so every row has a
+    distinct position. Cursors are opaque url-safe tokens; templates render
+    `page.next_cursor` / `page.previous_cursor` as `?cursor=...`.
+
+    Exact totals are opt-in (`with_count=True`) and cached for `count_timeout`
+    seconds per distinct query. Pass `count_version` to tie the cached total
+    to a data version so it is recomputed as soon as the data changes.
+    """
+
+    def __init__(self, queryset, per_page, ordering=("-created_at", "-id"),
+                 with_count=False, count_timeout=60, count_version=None):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.with_count = with_count
+        self.count_timeout = count_timeout
+        self.count_version = count_version
+
+    # ------------------------------------------------------------------
+    # Cursor encoding
+    # ------------------------------------------------------------------
+    def _field_names(self):
+        return [name.lstrip("-") for name in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        values = []
+        for name in self._field_names():
+            value = getattr(obj, name)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            elif not isinstance(value, (int, float)):
+                value = str(value)
+            values.append(value)
+        payload = json.dumps({"v": values, "d": direction}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """Returns (values, direction) or (None, None) for a missing/garbled cursor."""
+        if not cursor:
+            return None, None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values, direction = payload["v"], payload["d"]
+            if direction not in ("n", "p") or len(values) != len(self.ordering):
+                return None, None
+            return [self._to_python(name, value) for name, value in zip(self._field_names(), values)], direction
+        except (ValueError, KeyError, TypeError, ValidationError):
+            return None, None
+
+    def _to_python(self, name, value):
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations (e.g. a search rank) are compared as-is
+            return value
+        return field.to_python(value)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+    def _seek(self, values, forward):
+        """
+        Builds the row-value comparison "comes after `values`" (or before, when
+        `forward` is False) honouring the direction of each ordering field.
+        """
+        condition = Q()
+        equal_so_far = Q()
+        for name, value in zip(self.ordering, values):
+            field = name.lstrip("-")
+            descending = name.startswith("-")
+            lookup = "lt" if descending == forward else "gt"
+            condition |= equal_so_far & Q(**{f"{field}__{lookup}": value})
+            equal_so_far &= Q(**{field: value})
+        return condition
+
+    def _reversed_ordering(self):
+        return [name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering]
+
+    def get_page(self, cursor=None):
+        values, direction = self.decode_cursor(cursor)
+
+        if values is None:
+            rows = list(self.queryset.order_by(*self.ordering)[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            return KeysetPage(rows[:self.per_page], self, has_next=has_more, has_previous=False)
+
+        if direction == "n":
+            rows = list(self.queryset.filter(self._seek(values, forward=True))
+                        .order_by(*self.ordering)[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            return KeysetPage(rows[:self.per_page], self, has_next=has_more, has_previous=True)
+
+        rows = list(self.queryset.filter(self._seek(values, forward=False))
+                    .order_by(*self._reversed_ordering())[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return KeysetPage(rows, self, has_next=True, has_previous=has_more)
+
+    @cached_property
+    def count(self):
+        """Exact total (cached), or None when the paginator was built without counts."""
+        if not self.with_count:
+            return None
+        query_hash = hashlib.md5(str(self.queryset.query).encode()).hexdigest()
+        key = f"keyset-count:{self.count_version}:{query_hash}" if self.count_version else f"keyset-count:{query_hash}"
+        return cache.get_or_set(key, self.queryset.count, self.count_timeout)
+
+
+class KeysetPage:
+    """A single page; mirrors the parts of Django's Page the templates use."""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<KeysetPage ({len(self.object_list)} items)>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @cached_property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], "n")
+
+    @cached_property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], "p")
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+
+# Tiny publish/subscribe layer for pushing events to connected browsers.
+# publish() is synchronous and safe to call from views, signals and celery
+# tasks; subscribe() is an async context manager used by streaming views.
+#
+# With PUBSUB_REDIS_URL set, messages go through Redis PUBLISH/SUBSCRIBE so
+# every web process (and the celery workers) share one bus. Without it an
+# in-process broker is used, which only reaches subscribers in the same
+# process - fine for runserver and tests, not for multi-process deployments.
+
+
+class Subscription:
+    def __init__(self, queue):
+        self._queue = queue
+
+    async def get(self, timeout=None):
+        """Next message (a dict), or None if nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InMemoryBroker:
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers[channel])
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    def publish_many(self, messages):
+        for channel, message in messages:
+            self.publish(channel, message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers[channel].add(entry)
+        try:
+            yield Subscription(entry[1])
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(entry)
+
+
+class RedisSubscription:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    async def get(self, timeout=None):
+        message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+
+class RedisBroker:
+    def __init__(self, url):
+        import redis
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        import redis
+        try:
+            self._client.publish(channel, json.dumps(message, default=str))
+        except redis.RedisError as e:
+            # Real-time delivery is best effort; clients catch up via Last-Event-ID
+            print(f"Pub/sub publish to {channel} failed: {e}")
+
+    def publish_many(self, messages):
+        """[(channel, message)] in one round trip."""
+        import redis
+        pipeline = self._client.pipeline(transaction=False)
+        for channel, message in messages:
+            pipeline.publish(channel, json.dumps(message, default=str))
+        try:
+            pipeline.execute()
+        except redis.RedisError as e:
+            print(f"Pub/sub publish of {len(messages)} messages failed: {e}")
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        import redis.asyncio
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            yield RedisSubscription(pubsub)
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                url = getattr(settings, "PUBSUB_REDIS_URL", "")
+                _broker = RedisBroker(url) if url else InMemoryBroker()
+    return _broker
+
+
+def publish(channel, message):
+    get_broker().publish(channel, message)
+
+
+def publish_many(messages):
+    """Publishes [(channel, message)] pairs; one round trip on Redis."""
+    if messages:
+        get_broker().publish_many(messages)
+
+
+def subscribe(channel):
+    return get_broker().subscribe(channel)
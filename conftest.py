@@ -5,6 +5,12 @@ from django.test.client import Client
 from accounts.models import User
 
 
+@pytest.fixture(autouse=True)
+def sync_activity_log(settings):
+    """Audit entries are written on commit, not by the background writer thread"""
+    settings.ACTIVITY_LOG_ASYNC = False
+
+
 @pytest.fixture
 def client():
     return Client()
@@ -1,9 +1,11 @@
 from django import forms
 from django.contrib.auth import get_user_model
-from .models import Organization, Message, Job 
+from django.urls import reverse_lazy
+from .models import Conversation, Organization, Message, Job 
 
 # ✅ Import these for the Manual Candidate Form
-from application_tracking.models import JobApplication, JobAdvert
+from application_tracking import broadcasts
+from application_tracking.models import Broadcast, JobApplication, JobAdvert
 
 User = get_user_model()
 
@@ -80,6 +82,7 @@ class MessageForm(forms.ModelForm):
             }),
             'attachment': forms.FileInput(attrs={
                 'class': 'w-full text-sm text-gray-500 file:mr-4 file:py-2 file:px-4 file:rounded-full file:border-0 file:text-sm file:font-semibold file:bg-blue-50 file:text-blue-700 hover:file:bg-blue-100',
+                'data-chunked-upload': reverse_lazy('upload_start'),
             })
         }
 
@@ -89,7 +92,8 @@ class MessageForm(forms.ModelForm):
         content = cleaned_data.get("content")
         attachment = cleaned_data.get("attachment")
 
-        if not content and not attachment:
+        # A chunked upload arrives as "attachment_upload" instead of a file
+        if not content and not attachment and not self.data.get("attachment_upload"):
             raise forms.ValidationError("You must write a message or attach a file.")
         
         return cleaned_data
@@ -138,4 +142,60 @@ class ManualCandidateForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         if org:
             # Only show jobs created by the organization's admin
-            self.fields['job_advert'].queryset = JobAdvert.objects.filter(created_by=org.admin_user)
\ No newline at end of file
+            self.fields['job_advert'].queryset = JobAdvert.objects.filter(created_by=org.admin_user)
+
+# ---------------------------------------------------
+# 6. MESSAGE SEARCH FORM
+# ---------------------------------------------------
+class MessageSearchForm(forms.Form):
+    INPUT_CLASS = 'px-4 py-2 bg-white border border-gray-200 rounded-lg text-sm focus:outline-none focus:border-blue-500 focus:ring-1 focus:ring-blue-500'
+
+    q = forms.CharField(max_length=200, widget=forms.TextInput(attrs={'class': INPUT_CLASS + ' w-full', 'placeholder': 'Search messages...'}))
+    applicant = forms.ModelChoiceField(queryset=User.objects.none(), required=False, empty_label="All applicants",
+                                       widget=forms.Select(attrs={'class': INPUT_CLASS}))
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date', 'class': INPUT_CLASS}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date', 'class': INPUT_CLASS}))
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only people this user has a conversation with
+        self.fields['applicant'].queryset = User.objects.filter(
+            id__in=Conversation.objects.filter(user=user).values('peer_id')
+        ).order_by('first_name', 'last_name')
+        self.fields['applicant'].label_from_instance = (
+            lambda u: f"{u.first_name} {u.last_name}".strip() or u.email
+        )
+
+# ---------------------------------------------------
+# 7. BROADCAST MESSAGE FORM
+# ---------------------------------------------------
+class BroadcastForm(forms.ModelForm):
+    class Meta:
+        model = Broadcast
+        fields = ['job', 'application_status', 'search_query', 'content']
+        widgets = {
+            'job': forms.HiddenInput(),
+            'application_status': forms.HiddenInput(),
+            'search_query': forms.HiddenInput(),
+            'content': forms.Textarea(attrs={
+                'class': 'w-full px-4 py-3 rounded-lg border border-gray-300 focus:ring-2 focus:ring-blue-500 outline-none text-sm',
+                'rows': 5,
+                'placeholder': 'Hi {{ first_name }}, thanks for applying to {{ job_title }}...',
+            }),
+        }
+
+    def __init__(self, *args, **kwargs):
+        org = kwargs.pop('org', None)
+        super().__init__(*args, **kwargs)
+        self.fields['job'].queryset = Job.objects.filter(organization=org)
+
+    def clean_content(self):
+        content = self.cleaned_data['content'].strip()
+        unknown = broadcasts.unknown_variables(content)
+        if unknown:
+            raise forms.ValidationError(
+                "Unknown placeholder(s): %s. Available: %s." % (
+                    ", ".join(unknown), ", ".join("{{ %s }}" % name for name in broadcasts.VARIABLES)
+                )
+            )
+        return content
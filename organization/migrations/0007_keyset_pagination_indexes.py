@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-19 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0006_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-posted_at', '-id'], name='job_active_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['organization', '-posted_at', '-id'], name='job_org_recent_idx'),
+        ),
+    ]
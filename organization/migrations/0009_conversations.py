@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-19 10:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_conversations(apps, schema_editor):
+    Message = apps.get_model('organization', 'Message')
+    Conversation = apps.get_model('organization', 'Conversation')
+
+    latest, unread = {}, {}
+    messages = Message.objects.order_by('timestamp', 'id').values_list('id', 'sender_id', 'receiver_id', 'timestamp', 'is_read')
+    for message_id, sender_id, receiver_id, timestamp, is_read in messages.iterator(chunk_size=5000):
+        latest[(sender_id, receiver_id)] = latest[(receiver_id, sender_id)] = (message_id, timestamp)
+        if not is_read:
+            unread[(receiver_id, sender_id)] = unread.get((receiver_id, sender_id), 0) + 1
+
+    Conversation.objects.bulk_create(
+        [Conversation(user_id=user_id, peer_id=peer_id, last_message_id=message_id, last_message_at=timestamp,
+                      unread_count=unread.get((user_id, peer_id), 0))
+         for (user_id, peer_id), (message_id, timestamp) in latest.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0008_unread_message_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_at', models.DateTimeField()),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='organization.message')),
+                ('peer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-last_message_at', '-id'], name='conv_user_recent_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'peer'), name='conv_user_peer_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 10:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0009_conversations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['sender', 'receiver', '-timestamp', '-id'], name='msg_pair_recent_idx'),
+        ),
+    ]
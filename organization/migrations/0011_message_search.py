@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-19 10:59
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# Keeps Message.search_vector in sync inside Postgres, so every insert path
+# (ORM save, bulk_create, raw SQL) is indexed without an extra UPDATE.
+CREATE_TRIGGER = """
+CREATE FUNCTION organization_message_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('english', coalesce(NEW.content, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER organization_message_search_vector_trg
+    BEFORE INSERT OR UPDATE OF content ON organization_message
+    FOR EACH ROW EXECUTE FUNCTION organization_message_search_vector();
+
+UPDATE organization_message SET search_vector = to_tsvector('english', coalesce(content, ''));
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS organization_message_search_vector_trg ON organization_message;
+DROP FUNCTION IF EXISTS organization_message_search_vector();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0010_chat_history_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # Backfill before building the index
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name='message',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='msg_search_vector_idx'),
+        ),
+    ]
@@ -1,12 +1,19 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField, TrigramWordSimilarity
+from django.db.models import FloatField, Q
+from django.db.models.functions import Cast, Greatest, Upper
 from django.utils.text import slugify
 import uuid
 
+from common.models import ChangeTrackingMixin
+
 # ---------------------------------------------------
 # 1. ORGANIZATION MODEL
 # ---------------------------------------------------
-class Organization(models.Model):
+class Organization(ChangeTrackingMixin, models.Model):
     # Workflow Stages
     STATUS_CHOICES = [
         ('PENDING', 'Pending Verification'), # 1. Registered, waiting for Admin
@@ -45,6 +52,12 @@ class Organization(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Serves both `name__icontains` (UPPER(name) LIKE ...) and trigram similarity
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='org_name_trgm_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         # Auto-generate subdomain from name if not provided
         if not self.subdomain:
@@ -57,7 +70,7 @@ class Organization(models.Model):
 # ---------------------------------------------------
 # 2. PAYMENT MODEL
 # ---------------------------------------------------
-class Payment(models.Model):
+class Payment(ChangeTrackingMixin, models.Model):
     PAYMENT_GATEWAY_CHOICES = [('KHALTI', 'Khalti')]
     STATUS_CHOICES = [('INITIATED', 'Initiated'), ('SUCCESS', 'Success'), ('FAILED', 'Failed')]
 
@@ -78,6 +91,16 @@ class Payment(models.Model):
 # ---------------------------------------------------
 # 3. MESSAGE MODEL
 # ---------------------------------------------------
+class MessageQuerySet(models.QuerySet):
+
+    def between(self, user_a, user_b):
+        """Both directions of one chat; each side is served by msg_pair_recent_idx."""
+        return self.filter(Q(sender=user_a, receiver=user_b) | Q(sender=user_b, receiver=user_a))
+
+    def involving(self, user):
+        return self.filter(Q(sender=user) | Q(receiver=user))
+
+
 class Message(models.Model):
     sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='sent_messages')
     receiver = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='received_messages')
@@ -91,8 +114,28 @@ class Message(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    # Full-text search; set by a database trigger on insert/update of content
+    # (migration 0011), so bulk_create and raw inserts are covered too
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Set for system messages sent by event handlers, so a redelivered event
+    # can't message anyone twice
+    dedupe_key = models.CharField(max_length=100, null=True, blank=True)
+
+    objects = MessageQuerySet.as_manager()
+
     class Meta:
         ordering = ['timestamp'] # Oldest messages first (Chat log style)
+        indexes = [
+            # Chat history pages, newest first, keyset on (timestamp, id)
+            models.Index(fields=['sender', 'receiver', '-timestamp', '-id'], name='msg_pair_recent_idx'),
+            # Unread counter recomputes
+            models.Index(fields=['receiver'], condition=Q(is_read=False), name='msg_receiver_unread_idx'),
+            GinIndex(fields=['search_vector'], name='msg_search_vector_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['receiver', 'dedupe_key'], condition=Q(dedupe_key__isnull=False),
+                                    name='msg_receiver_dedupe_uniq'),
+        ]
 
     def __str__(self):
         return f"Msg from {self.sender} to {self.receiver}"
@@ -100,7 +143,70 @@ class Message(models.Model):
 # ---------------------------------------------------
 # 4. JOB MODEL (✅ New Addition for Job Posting)
 # ---------------------------------------------------
-class Job(models.Model):
+class JobQuerySet(models.QuerySet):
+
+    def active(self):
+        return self.filter(is_active=True)
+
+    def search(self, keyword, location):
+        """
+        Plain substring search. Postgres answers these `icontains` lookups from
+        the UPPER(...) gin_trgm_ops indexes declared on Job and Organization.
+        """
+        query = Q()
+
+        if keyword:
+            query &= Q(title__icontains=keyword) | Q(organization__name__icontains=keyword)
+
+        if location:
+            query &= Q(location__icontains=location)
+
+        return self.active().filter(query)
+
+    def fuzzy_search(self, keyword, location):
+        """
+        Trigram (pg_trgm) search that tolerates typos and partial names,
+        e.g. "Kathmandu" matches "Kathmandu, Nepal" and "Kathmadu".
+
+        Matching uses the `%>` word-similarity operator so it is served by the
+        same trigram indexes as `search()`. The cut-off is the
+        `pg_trgm.word_similarity_threshold` set on each connection from
+        settings.JOB_SEARCH_SIMILARITY_THRESHOLD. Results carry a `search_rank`
+        (0-1, keyword and location averaged) and are ordered best match first.
+        """
+        jobs = self.active().alias(
+            title_upper=Upper('title'),
+            org_name_upper=Upper('organization__name'),
+            location_upper=Upper('location'),
+        )
+        ranks = []
+
+        if keyword:
+            keyword = keyword.upper()
+            jobs = jobs.filter(
+                Q(title_upper__trigram_word_similar=keyword)
+                | Q(org_name_upper__trigram_word_similar=keyword)
+            )
+            ranks.append(Greatest(
+                TrigramWordSimilarity(keyword, 'title_upper'),
+                TrigramWordSimilarity(keyword, 'org_name_upper'),
+            ))
+
+        if location:
+            location = location.upper()
+            jobs = jobs.filter(location_upper__trigram_word_similar=location)
+            ranks.append(TrigramWordSimilarity(location, 'location_upper'))
+
+        if not ranks:
+            return jobs.order_by('-posted_at', '-id')
+
+        rank = ranks[0] if len(ranks) == 1 else (ranks[0] + ranks[1]) / 2
+        # Similarity is float4; as double precision the keyset cursor value
+        # survives the JSON round trip and compares equal to its own row
+        return jobs.annotate(search_rank=Cast(rank, FloatField())).order_by('-search_rank', '-posted_at', '-id')
+
+
+class Job(ChangeTrackingMixin, models.Model):
     JOB_TYPES = [
         ('FULL_TIME', 'Full Time'),
         ('PART_TIME', 'Part Time'),
@@ -122,8 +228,105 @@ class Job(models.Model):
     deadline = models.DateField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
 
+    objects = JobQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.title} at {self.organization.name}"
 
     class Meta:
-        ordering = ['-posted_at']
\ No newline at end of file
+        ordering = ['-posted_at']
+        indexes = [
+            # Keyset pagination on (posted_at, id)
+            models.Index(fields=['-posted_at', '-id'], condition=Q(is_active=True), name='job_active_recent_idx'),
+            models.Index(fields=['organization', '-posted_at', '-id'], name='job_org_recent_idx'),
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='job_title_trgm_idx'),
+            GinIndex(OpClass(Upper('location'), name='gin_trgm_ops'), name='job_location_trgm_idx'),
+        ]
+
+
+# ---------------------------------------------------
+# 5. CONVERSATION MODEL (inbox rows, one per participant)
+# ---------------------------------------------------
+class ConversationQuerySet(models.QuerySet):
+
+    def for_user(self, user):
+        """A user's inbox, newest conversation first (served by conv_user_recent_idx)."""
+        return self.filter(user=user).select_related('peer', 'last_message').order_by('-last_message_at', '-id')
+
+    def record_message(self, message):
+        """
+        Points both participants' rows at `message` and bumps the receiver's
+        unread count (called from the Message post_save signal).
+        """
+        sender_id, receiver_id = message.sender_id, message.receiver_id
+        pair = Q(user_id=sender_id, peer_id=receiver_id) | Q(user_id=receiver_id, peer_id=sender_id)
+        with transaction.atomic():
+            self.bulk_create(
+                [Conversation(user_id=user_id, peer_id=peer_id, last_message=message,
+                              last_message_at=message.timestamp)
+                 for user_id, peer_id in ((sender_id, receiver_id), (receiver_id, sender_id))],
+                ignore_conflicts=True,
+            )
+            # Messages can commit out of order; the pointer only moves forward
+            self.filter(pair, last_message_at__lte=message.timestamp).update(
+                last_message=message, last_message_at=message.timestamp,
+            )
+            if not message.is_read:
+                self.filter(user_id=receiver_id, peer_id=sender_id).update(unread_count=F('unread_count') + 1)
+
+    def record_broadcast(self, sender_id, messages):
+        """
+        record_message() for many unread messages from one sender, each to a
+        different receiver, in a fixed number of queries. bulk_create sends
+        no post_save, so broadcasts call this themselves.
+        """
+        receiver_ids = [message.receiver_id for message in messages]
+        pairs = Q(user_id=sender_id, peer_id__in=receiver_ids) | Q(user_id__in=receiver_ids, peer_id=sender_id)
+        latest = Message.objects.filter(
+            Q(sender_id=OuterRef('user_id'), receiver_id=OuterRef('peer_id'))
+            | Q(sender_id=OuterRef('peer_id'), receiver_id=OuterRef('user_id'))
+        ).order_by('-timestamp', '-id')
+        with transaction.atomic():
+            self.bulk_create(
+                [Conversation(user_id=user_id, peer_id=peer_id, last_message=message,
+                              last_message_at=message.timestamp)
+                 for message in messages
+                 for user_id, peer_id in ((sender_id, message.receiver_id), (message.receiver_id, sender_id))],
+                ignore_conflicts=True,
+            )
+            # Re-point every row at its pair's newest message (ours, unless a
+            # reply raced in)
+            self.filter(pairs).update(
+                last_message=Subquery(latest.values('id')[:1]),
+                last_message_at=Subquery(latest.values('timestamp')[:1]),
+            )
+            self.filter(user_id__in=receiver_ids, peer_id=sender_id).update(unread_count=F('unread_count') + 1)
+
+    def mark_read(self, user_id, peer_id):
+        return self.filter(user_id=user_id, peer_id=peer_id).exclude(unread_count=0).update(unread_count=0)
+
+
+class Conversation(models.Model):
+    """
+    Denormalized inbox entry: `user`'s side of the chat with `peer`. Each
+    pair has two rows so every inbox is a single indexed range scan.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='conversations')
+    peer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    last_message = models.ForeignKey(Message, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_at = models.DateTimeField()
+    unread_count = models.PositiveIntegerField(default=0)
+
+    objects = ConversationQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'peer'], name='conv_user_peer_uniq'),
+        ]
+        indexes = [
+            # Keyset pagination of the inbox on (last_message_at, id)
+            models.Index(fields=['user', '-last_message_at', '-id'], name='conv_user_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} <-> {self.peer}"
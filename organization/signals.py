@@ -1,31 +1,32 @@
-from django.db.models.signals import pre_save, post_save
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.core.mail import send_mail
 from django.conf import settings
 from .models import Organization
 
-@receiver(pre_save, sender=Organization)
-def check_status_change(sender, instance, **kwargs):
+@receiver(connection_created)
+def set_trigram_threshold(sender, connection, **kwargs):
     """
-    Checks if the status is changing from 'PENDING' to 'VERIFIED'.
-    This runs BEFORE the save to capture the old status.
+    Applies JOB_SEARCH_SIMILARITY_THRESHOLD to the `%>` operator used by
+    Job.objects.fuzzy_search(), so the cut-off is evaluated inside the index scan.
     """
-    if instance.pk:
-        try:
-            old_instance = Organization.objects.get(pk=instance.pk)
-            instance._old_status = old_instance.status
-        except Organization.DoesNotExist:
-            instance._old_status = None
-    else:
-        instance._old_status = None
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('pg_trgm.word_similarity_threshold', %s, false)",
+            [str(settings.JOB_SEARCH_SIMILARITY_THRESHOLD)],
+        )
 
 @receiver(post_save, sender=Organization)
 def send_verification_email(sender, instance, created, **kwargs):
     """
     Sends email if status changed to 'VERIFIED'.
     """
-    # Check if the status has actually changed to VERIFIED
-    if hasattr(instance, '_old_status') and instance._old_status != 'VERIFIED' and instance.status == 'VERIFIED':
+    # Check if the status has actually changed to VERIFIED (compared with the
+    # value the row was loaded with; no re-fetch needed)
+    if instance.status == 'VERIFIED' and instance.has_changed('status'):
         
         # ✅ FIX 1: Use contact_email instead of admin_user
         # The User account (admin_user) is usually created AFTER payment, so it might be None here.
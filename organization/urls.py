@@ -12,6 +12,7 @@ urlpatterns = [
 
     # --- Messaging System ---
     path('inbox/', views.org_inbox, name='org_inbox'),
+    path('inbox/search/', views.org_message_search, name='org_message_search'),
     # ✅ FIX: Supports User UUIDs
     path('chat/<uuid:applicant_id>/', views.org_chat, name='org_chat'),
 
@@ -25,6 +26,7 @@ urlpatterns = [
     path('candidates/', views.org_candidates, name='org_candidates'),
     path('candidates/export/', views.org_export_candidates, name='org_export_candidates'),
     path('candidates/add/', views.org_add_candidate, name='org_add_candidate'),
+    path('candidates/broadcast/', views.org_broadcast, name='org_broadcast'),
     
     # --- Interview & Decision Management ---
     path('interviews/', views.org_interviews, name='org_interviews'),
@@ -12,14 +12,26 @@ from django.utils.crypto import get_random_string
 from django.utils.html import format_html  # ✅ Added for Professional Alerts
 from django.core.mail import send_mail
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q, Count, Sum
-from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count, Sum
 from django.http import HttpResponse
+from django.utils.http import urlencode
 
-from .models import Organization, Payment, Message, Job 
-from .forms import OrganizationRegistrationForm, ForcePasswordChangeForm, MessageForm, JobPostForm, ManualCandidateForm
+from common.pagination import KeysetPaginator
 
-from application_tracking.models import JobApplication, Notification
+from .models import Conversation, Organization, Payment, Job
+from .forms import OrganizationRegistrationForm, ForcePasswordChangeForm, MessageForm, JobPostForm, ManualCandidateForm, MessageSearchForm, BroadcastForm
+
+from application_tracking import broadcasts
+from application_tracking import chat_history
+from application_tracking import events
+from application_tracking import message_search
+from application_tracking import semantic
+from application_tracking import uploads
+from application_tracking.candidate_search import search_candidates
+from application_tracking.chat_socket import mark_read
+from application_tracking.models import Broadcast, JobApplication
+from application_tracking.tasks import notify_relevant_users, send_broadcast
 
 User = get_user_model()
 
@@ -265,15 +277,8 @@ def org_inbox(request):
     except Organization.DoesNotExist:
         return redirect('home')
 
-    messages_list = Message.objects.filter(
-        Q(sender=request.user) | Q(receiver=request.user)
-    ).select_related('sender', 'receiver').order_by('-timestamp')
-
-    conversations = {}
-    for msg in messages_list:
-        other_user = msg.receiver if msg.sender == request.user else msg.sender
-        if other_user not in conversations:
-            conversations[other_user] = msg
+    paginator = KeysetPaginator(Conversation.objects.for_user(request.user), 20, ordering=('-last_message_at', '-id'))
+    conversations = paginator.get_page(request.GET.get('cursor'))
 
     return render(request, 'organization/inbox.html', {'org': org, 'conversations': conversations})
 
@@ -299,6 +304,7 @@ def org_chat(request, applicant_id):
         form = MessageForm(request.POST, request.FILES)
         if form.is_valid():
             msg = form.save(commit=False)
+            uploads.attach(request, msg, 'attachment')
             msg.sender = request.user
             msg.receiver = applicant_user
             msg.save()
@@ -306,17 +312,15 @@ def org_chat(request, applicant_id):
     else:
         form = MessageForm()
 
-    chat_history = Message.objects.filter(
-        Q(sender=request.user, receiver=applicant_user) | 
-        Q(sender=applicant_user, receiver=request.user)
-    ).order_by('timestamp')
+    history = chat_history.message_page(request.user, applicant_user)
 
-    Message.objects.filter(sender=applicant_user, receiver=request.user, is_read=False).update(is_read=True)
+    mark_read(request.user.id, applicant_user.id)
 
     return render(request, 'organization/chat.html', {
         'org': org, 
         'applicant': applicant_user, 
-        'chat_history': chat_history, 
+        'chat_history': history.items,
+        'older_cursor': history.older_cursor,
         'form': form,
         'application_id': active_application.id if active_application else None,
         'application_status': active_application.status if active_application else None
@@ -338,6 +342,7 @@ def org_post_job(request):
             job = form.save(commit=False)
             job.organization = org 
             job.save()
+            notify_relevant_users(job)
             messages.success(request, "Job posted successfully!")
             return redirect('org_dashboard')
     else:
@@ -355,16 +360,16 @@ def org_my_jobs(request):
     except Organization.DoesNotExist:
         return redirect('home')
 
-    all_jobs = Job.objects.filter(organization=org).annotate(
-        applicant_count=Count('applications')
-    ).order_by('-posted_at')
+    all_jobs = Job.objects.filter(organization=org)
 
     active_jobs_count = all_jobs.filter(is_active=True).count()
     total_applicants = JobApplication.objects.filter(job__organization=org).count()
     
-    paginator = Paginator(all_jobs, 10) 
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = KeysetPaginator(
+        all_jobs.annotate(applicant_count=Count('applications')), 10,
+        ordering=('-posted_at', '-id'), with_count=True
+    )
+    page_obj = paginator.get_page(request.GET.get('cursor'))
 
     context = {
         'org': org,
@@ -439,14 +444,32 @@ def org_candidates(request):
     if job_id: candidates = candidates.filter(job_id=job_id)
     if status: candidates = candidates.filter(status=status)
     if search_query:
-        candidates = candidates.filter(
-            Q(name__icontains=search_query) | 
-            Q(email__icontains=search_query)
-        )
+        candidates = search_candidates(candidates, search_query)
+
+    # "Similar candidates": rank the filtered list by CV similarity to one applicant
+    similar_to = None
+    try:
+        similar_to = candidates.filter(id=uuid.UUID(request.GET['similar_to'])).first()
+    except (KeyError, ValueError):
+        pass
+    if similar_to:
+        ranked = semantic.similar_candidates(similar_to, list(candidates.values_list('id', flat=True)))
+        candidates = sorted(candidates.filter(id__in=ranked), key=lambda app: ranked.index(app.id))
+
+    # "Message all": same filters, one message per applicant account
+    broadcast_form = None
+    if not similar_to:
+        broadcast_form = BroadcastForm(org=org, initial={'job': job_id, 'application_status': status, 'search_query': search_query})
+        broadcast_filter = Broadcast(organization=org, sender=request.user, job_id=job_id or None,
+                                     application_status=status or '', search_query=search_query or '')
+        broadcast_form.recipient_count = broadcasts.recipients(broadcast_filter).count()
 
     context = {
         'org': org,
         'candidates': candidates,
+        'broadcast_form': broadcast_form,
+        'broadcast_variables': broadcasts.VARIABLES,
+        'similar_to': similar_to,
         'jobs': jobs,
         'current_job': int(job_id) if job_id else None,
         'current_status': status,
@@ -473,7 +496,7 @@ def org_export_candidates(request):
     if job_id: candidates = candidates.filter(job_id=job_id)
     if status: candidates = candidates.filter(status=status)
     if search_query:
-        candidates = candidates.filter(Q(name__icontains=search_query) | Q(email__icontains=search_query))
+        candidates = search_candidates(candidates, search_query)
 
     response = HttpResponse(content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="candidates_export.csv"'
@@ -550,44 +573,25 @@ def org_trigger_interview(request, application_id, round_name):
         return redirect('home')
 
     application = get_object_or_404(JobApplication, id=application_id)
+    from_stage = application.interview_stage
     
     if round_name == 'HR': application.interview_stage = 'HR_ROUND'
     elif round_name == 'TECH': application.interview_stage = 'TECH_ROUND'
     elif round_name == 'FINAL': application.interview_stage = 'FINAL_ROUND'
     
     application.status = 'INTERVIEWING'
-    application.save()
+    # The candidate's chat message and notification follow from the event
+    # (application_tracking/event_handlers.py)
+    with transaction.atomic():
+        application.save()
+        events.publish(events.StageAdvanced(
+            application_id=application.id, from_stage=from_stage,
+            to_stage=application.interview_stage, actor_id=request.user.id,
+        ))
 
     candidate_user = application.get_user_account()
     
     if candidate_user:
-        job_title = "the position"
-        if application.job:
-            job_title = application.job.title
-        elif application.job_advert:
-            job_title = application.job_advert.title
-
-        formatted_message = (
-            f"**[INTERVIEW UPDATE - {round_name} ROUND]**\n\n"
-            f"Hello {application.name}, congratulations! You have been moved to the {round_name} Interview Round for {job_title}.\n\n"
-            f"The hiring manager will be sending you the interview questions or tasks shortly via this chat.\n"
-            f"Please stay online."
-        )
-
-        Message.objects.create(
-            sender=request.user, 
-            receiver=candidate_user, 
-            content=formatted_message, 
-            is_read=False
-        )
-
-        Notification.objects.create(
-            user=candidate_user,
-            title=f"Interview Update: {round_name}",
-            message=f"You have moved to the {round_name} round. Check your messages.",
-            link=reverse('user_interview_room', kwargs={'application_id': application.id})
-        )
-
         messages.success(request, f"{round_name} Round started! Redirecting to chat...")
         return redirect('org_chat', applicant_id=candidate_user.id)
 
@@ -617,36 +621,95 @@ def org_make_decision(request, application_id, decision):
 
     if decision == 'hire':
         application.status = 'ACCEPTED' 
-        message_content = f"🎉 **CONGRATULATIONS!**\n\nWe are pleased to inform you that you have been selected for the **{application.job.title}** position.\n\nHR will contact you shortly with the offer letter details."
-        notif_title = "You're Hired! 🎉"
         messages.success(request, f"Candidate {application.name} has been Hired!")
         
     elif decision == 'reject':
         application.status = 'REJECTED'
-        message_content = f"Thank you for your time and interest in the **{application.job.title}** position.\n\nAfter careful consideration, we have decided to move forward with other candidates at this time. We wish you the best in your future endeavors."
-        notif_title = "Application Update"
         messages.info(request, f"Candidate {application.name} has been rejected.")
         
     else:
         return redirect('org_chat', applicant_id=candidate_user.id)
 
-    application.save()
+    # The chat message and notification to the candidate follow from the
+    # event (application_tracking/event_handlers.py)
+    with transaction.atomic():
+        application.save()
+        events.publish(events.DecisionMade(
+            application_id=application.id, status=application.status,
+            decided_by=events.DecisionMade.RECRUITER, actor_id=request.user.id,
+        ))
 
-    # 1. Send System Message in Chat
-    if candidate_user:
-        Message.objects.create(
-            sender=request.user,
-            receiver=candidate_user,
-            content=message_content,
-            is_read=False
-        )
+    return redirect('org_chat', applicant_id=candidate_user.id)
 
-        # 2. Send Notification
-        Notification.objects.create(
-            user=candidate_user,
-            title=notif_title,
-            message=f"Status update for {application.job.title}: {application.status}",
-            link=reverse('user_interview_room', kwargs={'application_id': application.id})
+# ---------------------------------------------------
+# 19. MESSAGE SEARCH VIEW
+# ---------------------------------------------------
+@login_required
+def org_message_search(request):
+    try:
+        org = Organization.objects.get(admin_user=request.user)
+    except Organization.DoesNotExist:
+        return redirect('home')
+
+    form = MessageSearchForm(request.GET or None, user=request.user)
+    results = None
+    if form.is_valid():
+        data = form.cleaned_data
+        applicant = data['applicant']
+        matches = message_search.search_messages(
+            request.user, data['q'],
+            peer_id=applicant.id if applicant else None,
+            date_from=data['date_from'], date_to=data['date_to'],
         )
+        paginator = KeysetPaginator(matches, message_search.RESULTS_PER_PAGE, ordering=('-search_rank', '-id'))
+        results = paginator.get_page(request.GET.get('cursor'))
+        for msg in results:
+            msg.peer = msg.receiver if msg.sender_id == request.user.id else msg.sender
+            msg.snippet = message_search.highlight(msg.headline)
+
+    # Filters carried over to the Previous/Next links
+    params = request.GET.copy()
+    params.pop('cursor', None)
+
+    context = {
+        'org': org,
+        'form': form,
+        'results': results,
+        'query_string': params.urlencode(),
+    }
+    return render(request, 'organization/message_search.html', context)
+
+# ---------------------------------------------------
+# 20. BROADCAST MESSAGE TO FILTERED APPLICANTS
+# ---------------------------------------------------
+@login_required
+def org_broadcast(request):
+    try:
+        org = Organization.objects.get(admin_user=request.user)
+    except Organization.DoesNotExist:
+        return redirect('home')
 
-    return redirect('org_chat', applicant_id=candidate_user.id)
\ No newline at end of file
+    if request.method != 'POST':
+        return redirect('org_candidates')
+
+    form = BroadcastForm(request.POST, org=org)
+    if form.is_valid():
+        broadcast = form.save(commit=False)
+        broadcast.sender = request.user
+        broadcast.organization = org
+        broadcast.save()
+        # Rows are written in chunks by the worker; nothing is sent from here
+        send_broadcast.delay(broadcast.id)
+        messages.success(request, "Your message is being sent to the selected applicants.")
+    else:
+        for errors in form.errors.values():
+            messages.error(request, errors[0])
+
+    # Back to the same filtered list
+    params = {
+        'job_id': request.POST.get('job', ''),
+        'status': request.POST.get('application_status', ''),
+        'q': request.POST.get('search_query', ''),
+    }
+    query = urlencode({key: value for key, value in params.items() if value})
+    return redirect(reverse('org_candidates') + (f"?{query}" if query else ""))
@@ -0,0 +1,160 @@
+// Lazy history: containers with data-history-url / data-history-cursor only
+// hold the newest page; older pages are fetched (JSON, oldest first) when the
+// user scrolls near the top and prepended without moving the viewport.
+function loadOlderOnScroll(container, renderItem) {
+    const url = container.getAttribute('data-history-url');
+    if (!url) return;
+    let loading = false;
+
+    const loadOlder = async () => {
+        const cursor = container.getAttribute('data-history-cursor');
+        if (loading || !cursor) return;
+        loading = true;
+        try {
+            const response = await fetch(`${url}?cursor=${encodeURIComponent(cursor)}`, {
+                headers: { 'Accept': 'application/json' }
+            });
+            const data = await response.json();
+            if (data.status !== 'success') return;
+
+            const fragment = document.createDocumentFragment();
+            data.items.forEach((item) => {
+                const element = renderItem(item);
+                if (element) fragment.appendChild(element);
+            });
+            const previousHeight = container.scrollHeight;
+            container.prepend(fragment);
+            container.scrollTop += container.scrollHeight - previousHeight;
+            container.setAttribute('data-history-cursor', data.older_cursor || '');
+        } catch (err) {
+            console.error(err);
+        } finally {
+            loading = false;
+        }
+    };
+
+    container.addEventListener('scroll', () => {
+        if (container.scrollTop < 80) loadOlder();
+    });
+}
+
+// Real-time chat over a websocket (org chat & candidate interview room).
+// The page keeps working without it: the form still POSTs when the socket is
+// closed or a file is attached, and history is rendered server side.
+//
+// Markup: the message list carries data-chat-peer / data-chat-user, and two
+// <template data-chat-template="mine|theirs"> bubbles with data-slot="content",
+// "attachment", "time" and (mine only) "status" children.
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.querySelector('[data-chat-peer]');
+    if (!container || !window.WebSocket) return;
+
+    const peerId = container.getAttribute('data-chat-peer');
+    const userId = container.getAttribute('data-chat-user');
+    const form = document.querySelector('[data-chat-form]');
+    const textarea = form ? form.querySelector('textarea') : null;
+    const fileInput = form ? form.querySelector('input[type="file"]') : null;
+    const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const url = `${scheme}://${window.location.host}/ws/chat/${peerId}/`;
+
+    let socket = null;
+    let retryDelay = 1000;
+
+    const scrollToBottom = () => { container.scrollTop = container.scrollHeight; };
+
+    const markOwnRead = () => {
+        container.querySelectorAll('[data-slot="status"]').forEach((el) => { el.textContent = 'Read'; });
+    };
+
+    const buildBubble = (data) => {
+        if (container.querySelector(`[data-message-id="${data.id}"]`)) return null;
+        const mine = data.sender_id === userId;
+        const template = document.querySelector(`template[data-chat-template="${mine ? 'mine' : 'theirs'}"]`);
+        if (!template) return null;
+
+        const bubble = template.content.firstElementChild.cloneNode(true);
+        bubble.setAttribute('data-message-id', data.id);
+        const content = bubble.querySelector('[data-slot="content"]');
+        if (content) {
+            content.textContent = data.content;
+            content.classList.toggle('hidden', !data.content);
+        }
+        const attachment = bubble.querySelector('[data-slot="attachment"]');
+        if (attachment) {
+            attachment.classList.toggle('hidden', !data.attachment_url);
+            const link = attachment.querySelector('a');
+            if (link && data.attachment_url) link.href = data.attachment_url;
+        }
+        const time = bubble.querySelector('[data-slot="time"]');
+        if (time && data.timestamp) {
+            time.textContent = new Date(data.timestamp).toTimeString().slice(0, 5);
+        }
+        const status = bubble.querySelector('[data-slot="status"]');
+        if (status && data.is_read) status.textContent = 'Read';
+        return bubble;
+    };
+
+    const render = (data) => {
+        const bubble = buildBubble(data);
+        if (!bubble) return;
+        const empty = container.querySelector('[data-chat-empty]');
+        if (empty) empty.remove();
+        container.appendChild(bubble);
+        scrollToBottom();
+    };
+
+    const send = (payload) => {
+        if (!socket || socket.readyState !== WebSocket.OPEN) return false;
+        socket.send(JSON.stringify(payload));
+        return true;
+    };
+
+    const connect = () => {
+        socket = new WebSocket(url);
+        socket.addEventListener('open', () => {
+            retryDelay = 1000;
+            send({ type: 'read' });
+        });
+        socket.addEventListener('message', (e) => {
+            const data = JSON.parse(e.data);
+            if (data.type === 'message') {
+                render(data);
+                // We're looking at the conversation, so the peer's message is read
+                if (data.sender_id !== userId && !document.hidden) send({ type: 'read' });
+            } else if (data.type === 'read' && data.reader_id !== userId) {
+                markOwnRead();
+            } else if (data.type === 'error') {
+                console.warn('Chat:', data.message);
+            }
+        });
+        socket.addEventListener('close', (e) => {
+            socket = null;
+            // 44xx: not logged in / not allowed - retrying won't help
+            if (e.code >= 4400 && e.code < 4500) return;
+            setTimeout(connect, retryDelay);
+            retryDelay = Math.min(retryDelay * 2, 30000);
+        });
+    };
+
+    if (form && textarea) {
+        form.addEventListener('submit', (e) => {
+            const hasFile = fileInput && fileInput.files && fileInput.files.length > 0;
+            const content = textarea.value.trim();
+            if (hasFile || !content) return;  // regular POST
+            if (send({ type: 'message', content: content })) {
+                e.preventDefault();
+                textarea.value = '';
+                textarea.focus();
+            }
+        });
+    }
+
+    document.addEventListener('visibilitychange', () => {
+        if (!document.hidden) send({ type: 'read' });
+    });
+    window.addEventListener('beforeunload', () => { if (socket) socket.close(); });
+
+    scrollToBottom();
+    loadOlderOnScroll(container, buildBubble);
+    connect();
+});
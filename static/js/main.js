@@ -77,4 +77,88 @@ window.closeModal = function(id) {
             document.body.style.overflow = 'auto';
         }, 300);
     }
-};
\ No newline at end of file
+};
+// 5. TYPEAHEAD (inputs with data-autocomplete-url)
+// Suggestions fill a native <datalist>; requests are debounced and repeated
+// prefixes are answered from a small in-page cache.
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('input[data-autocomplete-url]').forEach((input, n) => {
+        const endpoint = input.getAttribute('data-autocomplete-url');
+        const list = document.createElement('datalist');
+        list.id = `autocomplete-list-${n}`;
+        input.after(list);
+        input.setAttribute('list', list.id);
+        input.setAttribute('autocomplete', 'off');
+
+        const seen = {};
+        let timer = null;
+
+        const render = (items) => {
+            list.innerHTML = '';
+            items.forEach(item => {
+                const option = document.createElement('option');
+                option.value = item.label;
+                list.appendChild(option);
+            });
+        };
+
+        input.addEventListener('input', () => {
+            clearTimeout(timer);
+            const q = input.value.trim().toLowerCase();
+            if (!q) return render([]);
+            if (seen[q]) return render(seen[q]);
+
+            timer = setTimeout(() => {
+                const sep = endpoint.includes('?') ? '&' : '?';
+                fetch(`${endpoint}${sep}q=${encodeURIComponent(q)}`)
+                    .then(res => res.json())
+                    .then(data => {
+                        seen[q] = data.data || [];
+                        if (input.value.trim().toLowerCase() === q) render(seen[q]);
+                    })
+                    .catch(err => console.error("Autocomplete failed:", err));
+            }, 150);
+        });
+    });
+});
+
+// 6. LIVE NOTIFICATIONS (server-sent events)
+// EventSource reconnects on its own and resends the last notification id
+// (Last-Event-ID), so missed notifications are replayed by the server.
+document.addEventListener('DOMContentLoaded', function() {
+    const bell = document.querySelector('[data-stream-url]');
+    if (!bell || !window.EventSource) return;
+
+    const setBadge = (kind, count) => {
+        const badge = document.querySelector(`[data-unread-badge="${kind}"]`);
+        if (!badge || count === undefined || count === null) return;
+        badge.textContent = count;
+        badge.classList.toggle('hidden', count <= 0);
+    };
+
+    const showToast = (data) => {
+        const container = document.getElementById('toast-container');
+        if (!container) return;
+        const toast = document.createElement('a');
+        toast.href = data.link || bell.getAttribute('href');
+        toast.className = 'toast-notification bg-white border-l-4 border-blue-500 px-6 py-4 rounded-lg shadow-xl flex flex-col min-w-[300px] animate-slide-in';
+        const title = document.createElement('p');
+        title.className = 'font-bold text-gray-800 text-sm';
+        title.textContent = data.title;
+        const body = document.createElement('p');
+        body.className = 'text-gray-500 text-xs';
+        body.textContent = data.message;
+        toast.append(title, body);
+        container.appendChild(toast);
+        setTimeout(() => toast.remove(), 6000);
+    };
+
+    const source = new EventSource(bell.getAttribute('data-stream-url'));
+    source.addEventListener('unread', (e) => {
+        const data = JSON.parse(e.data);
+        setBadge('notifications', data.notifications);
+        setBadge('messages', data.messages);
+    });
+    source.addEventListener('notification', (e) => showToast(JSON.parse(e.data)));
+    window.addEventListener('beforeunload', () => source.close());
+});
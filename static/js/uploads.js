@@ -0,0 +1,124 @@
+// Chunked, resumable uploads for <input type="file" data-chunked-upload="<start url>">.
+// On submit, selected files are sent in chunks (retrying, and resuming after a
+// reload from what the server already has), then the form is posted with a
+// hidden "<field>_upload" id instead of the file bytes. Without JS the input
+// still works as a plain multipart upload.
+document.addEventListener('DOMContentLoaded', function() {
+    const MAX_ATTEMPTS = 5;
+    const forms = new Set();
+    document.querySelectorAll('input[type="file"][data-chunked-upload]').forEach((input) => {
+        if (input.form) forms.add(input.form);
+    });
+
+    const csrfToken = (form) => {
+        const field = form.querySelector('[name=csrfmiddlewaretoken]');
+        return field ? field.value : '';
+    };
+
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+    const setProgress = (input, text) => {
+        let label = input.parentElement.querySelector('[data-upload-progress]');
+        if (!label) {
+            label = document.createElement('p');
+            label.setAttribute('data-upload-progress', '');
+            label.className = 'text-xs text-gray-500 mt-1';
+            input.insertAdjacentElement('afterend', label);
+        }
+        label.textContent = text;
+    };
+
+    // Resume: an unfinished upload of the same file is picked up where it stopped
+    const storageKey = (file) => `upload:${file.name}:${file.size}:${file.lastModified}`;
+
+    const startOrResume = async (form, input, file) => {
+        const known = localStorage.getItem(storageKey(file));
+        if (known) {
+            const response = await fetch(`${input.dataset.chunkedUpload}${known}/`);
+            if (response.ok) return response.json();
+            localStorage.removeItem(storageKey(file));
+        }
+        const body = new FormData();
+        body.append('filename', file.name);
+        body.append('size', file.size);
+        const response = await fetch(input.dataset.chunkedUpload, {
+            method: 'POST',
+            headers: { 'X-CSRFToken': csrfToken(form) },
+            body: body
+        });
+        const data = await response.json();
+        if (data.status !== 'success') throw new Error(data.message || 'Upload failed.');
+        localStorage.setItem(storageKey(file), data.upload_id);
+        return data;
+    };
+
+    const upload = async (form, input, file) => {
+        let state = await startOrResume(form, input, file);
+        let attempts = 0;
+        while (!state.complete) {
+            const chunk = file.slice(state.offset, state.offset + state.chunk_size);
+            setProgress(input, `Uploading ${file.name}… ${Math.floor(100 * state.offset / file.size)}%`);
+            try {
+                const response = await fetch(`${input.dataset.chunkedUpload}${state.upload_id}/?offset=${state.offset}`, {
+                    method: 'PUT',
+                    headers: { 'X-CSRFToken': csrfToken(form), 'Content-Type': 'application/octet-stream' },
+                    body: chunk
+                });
+                const data = await response.json();
+                if (response.status === 409 && data.offset !== null) {
+                    state.offset = data.offset;  // server is ahead/behind: continue from its offset
+                    continue;
+                }
+                if (data.status !== 'success') throw new Error(data.message || 'Upload failed.');
+                state = data;
+                attempts = 0;
+            } catch (err) {
+                attempts += 1;
+                if (attempts >= MAX_ATTEMPTS) throw err;
+                setProgress(input, `Connection problem, retrying (${attempts}/${MAX_ATTEMPTS - 1})…`);
+                await sleep(1000 * 2 ** attempts);
+            }
+        }
+        localStorage.removeItem(storageKey(file));
+        setProgress(input, `${file.name} uploaded.`);
+        return state.upload_id;
+    };
+
+    forms.forEach((form) => {
+        form.addEventListener('submit', async (e) => {
+            const inputs = [...form.querySelectorAll('input[type="file"][data-chunked-upload]')]
+                .filter((input) => input.files && input.files.length > 0);
+            if (!inputs.length) return;
+
+            e.preventDefault();
+            e.stopImmediatePropagation();
+            const buttons = form.querySelectorAll('button[type="submit"]');
+            buttons.forEach((button) => { button.disabled = true; });
+
+            try {
+                for (const input of inputs) {
+                    const uploadId = await upload(form, input, input.files[0]);
+                    const hidden = document.createElement('input');
+                    hidden.type = 'hidden';
+                    hidden.name = `${input.name}_upload`;
+                    hidden.value = uploadId;
+                    form.appendChild(hidden);
+                    input.value = '';
+                }
+                // form.submit() skips the clicked button; views check its name
+                if (e.submitter && e.submitter.name) {
+                    const submitter = document.createElement('input');
+                    submitter.type = 'hidden';
+                    submitter.name = e.submitter.name;
+                    submitter.value = e.submitter.value;
+                    form.appendChild(submitter);
+                }
+                form.submit();
+            } catch (err) {
+                console.error(err);
+                alert(err.message || 'Upload failed. Please try again.');
+                buttons.forEach((button) => { button.disabled = false; });
+            }
+        }, true);
+    });
+});
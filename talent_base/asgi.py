@@ -3,6 +3,10 @@ ASGI config for talent_base project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Long-lived streams (the notification SSE endpoint and the chat websocket at
+/ws/chat/<peer id>/) need this entry point, e.g.
+``uvicorn talent_base.asgi:application``.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -13,4 +17,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'talent_base.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after setup so the app registry is ready
+from application_tracking.chat_socket import chat_websocket  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        return await chat_websocket(scope, receive, send)
+    return await django_application(scope, receive, send)
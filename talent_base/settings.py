@@ -23,6 +23,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.humanize',
+    'django.contrib.postgres',  # ✅ Trigram search (pg_trgm)
     
     # Local apps
     'application_tracking',
@@ -131,6 +132,97 @@ CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 CELERY_BROKER_URL = "redis://localhost:6379/0"
 CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
+# Live notification push (SSE). Leave empty for the in-process broker (single
+# process only); set to a Redis URL when running several web/worker processes.
+PUBSUB_REDIS_URL = config('PUBSUB_REDIS_URL', default='')
+# Unread counters and job cache versions are shared by the web processes and
+# the celery workers, so a multi-process deployment needs a shared cache.
+# Defaults to the pub/sub Redis; left empty, each process gets its own
+# LocMemCache (runserver and tests only - `check --deploy` flags it).
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default=PUBSUB_REDIS_URL)
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-unread-counters": {
+        "task": "application_tracking.tasks.reconcile_unread_counters",
+        "schedule": 10 * 60,
+    },
+    "archive-read-notifications": {
+        "task": "application_tracking.tasks.archive_read_notifications",
+        "schedule": 24 * 60 * 60,
+    },
+    "send-notification-digests": {
+        "task": "application_tracking.tasks.send_notification_digests",
+        "schedule": 15 * 60,
+    },
+    "recompute-recommendations": {
+        "task": "application_tracking.tasks.recompute_recommendations",
+        "schedule": 24 * 60 * 60,
+    },
+    "merge-semantic-updates": {
+        "task": "application_tracking.tasks.merge_semantic_updates",
+        "schedule": 5 * 60,
+    },
+    "rebuild-semantic-index": {
+        "task": "application_tracking.tasks.rebuild_semantic_index",
+        "schedule": 24 * 60 * 60,
+    },
+    "purge-stale-uploads": {
+        "task": "application_tracking.tasks.purge_stale_uploads",
+        "schedule": 60 * 60,
+    },
+    "maintain-activity-partitions": {
+        "task": "application_tracking.tasks.maintain_activity_partitions",
+        "schedule": 24 * 60 * 60,
+    },
+    "rollup-activity": {
+        "task": "application_tracking.tasks.rollup_activity",
+        "schedule": 60 * 60,
+    },
+    "dispatch-domain-events": {
+        "task": "application_tracking.tasks.dispatch_domain_events",
+        "schedule": 60,
+    },
+}
+# Read notifications older than this move to NotificationArchive
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=90, cast=int)
+# Email delivery for users who haven't picked one: IMMEDIATE, DIGEST or OFF
+NOTIFICATION_DEFAULT_EMAIL_MODE = config('NOTIFICATION_DEFAULT_EMAIL_MODE', default='IMMEDIATE')
+# Digest emails sent per SMTP connection before it is recycled
+NOTIFICATION_DIGEST_BATCH_SIZE = config('NOTIFICATION_DIGEST_BATCH_SIZE', default=100, cast=int)
+# On-disk faiss indexes for "similar jobs" / "similar candidates". Must be
+# shared (or synced) by the web and celery hosts.
+SEMANTIC_INDEX_DIR = config('SEMANTIC_INDEX_DIR', default=os.path.join(BASE_DIR, 'var', 'semantic'))
+# Chunked attachment uploads: partial files live here until complete, then
+# move to media storage (deduplicated by content hash)
+UPLOAD_TMP_DIR = config('UPLOAD_TMP_DIR', default=os.path.join(BASE_DIR, 'var', 'uploads'))
+UPLOAD_CHUNK_SIZE = config('UPLOAD_CHUNK_SIZE', default=1024 * 1024, cast=int)
+UPLOAD_MAX_SIZE = config('UPLOAD_MAX_SIZE', default=50 * 1024 * 1024, cast=int)
+# Unfinished uploads older than this are deleted
+UPLOAD_SESSION_TTL_HOURS = config('UPLOAD_SESSION_TTL_HOURS', default=24, cast=int)
+# Audit log entries are queued in-process and written in batches by a
+# background thread (application_tracking.activity). When the queue is full
+# new entries are dropped and counted. ACTIVITY_LOG_ASYNC=False writes each
+# entry on commit instead (handy for tests and one-off scripts).
+ACTIVITY_LOG_ASYNC = config('ACTIVITY_LOG_ASYNC', default=True, cast=bool)
+ACTIVITY_LOG_QUEUE_SIZE = config('ACTIVITY_LOG_QUEUE_SIZE', default=10000, cast=int)
+ACTIVITY_LOG_BATCH_SIZE = config('ACTIVITY_LOG_BATCH_SIZE', default=500, cast=int)
+ACTIVITY_LOG_FLUSH_SECONDS = config('ACTIVITY_LOG_FLUSH_SECONDS', default=2.0, cast=float)
+# ActivityLog is range-partitioned by month; partitions are created this many
+# months ahead and dropped once older than the retention (daily rollups stay)
+ACTIVITY_LOG_PARTITIONS_AHEAD = config('ACTIVITY_LOG_PARTITIONS_AHEAD', default=3, cast=int)
+ACTIVITY_LOG_RETENTION_MONTHS = config('ACTIVITY_LOG_RETENTION_MONTHS', default=12, cast=int)
 
 # ✅ KHALTI PAYMENT CONFIGURATION (SANDBOX)
 KHALTI_SECRET_KEY = config("KHALTI_SECRET_KEY", default="")  # Sandbox Secret Key
@@ -143,6 +235,11 @@ KHALTI_RETURN_URL = "http://127.0.0.1:8000/org/payment/verify/"
 # Used in signals.py to generate the payment link
 SITE_URL = "http://127.0.0.1:8000"
 
+# ✅ JOB SEARCH
+# Minimum pg_trgm word similarity (0-1) for fuzzy title/location matches.
+# Lower = more forgiving of typos, but more noise.
+JOB_SEARCH_SIMILARITY_THRESHOLD = config("JOB_SEARCH_SIMILARITY_THRESHOLD", default=0.4, cast=float)
+
 # ✅ GOOGLE GEMINI AI CONFIGURATION
 GEMINI_API_KEY = config("GEMINI_API_KEY", default="")
 